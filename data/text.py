@@ -182,6 +182,11 @@ GATHER_DEPART = [
     "you go. the settlement waits.",
 ]
 
+# --- Saving -------------------------------------------------
+
+SAVE_FAILED = "the last save did not take. ({error})"
+HISTORY_FAILED = "the run history missed a save. ({error})"
+
 # --- Passives -----------------------------------------------
 
 PASSIVE_RAIN_CATCHER = "the rain catcher has collected something."
@@ -433,16 +438,16 @@ DECAY_MESSAGES = {
 
 # --- Garden -------------------------------------------------
 
-# Network state display names
-NETWORK_STATE_NAMES = {
-    "E": "empty substrate",
-    "H": "hypha",
-    "N": "network node",
-    "M": "mature",
-    "F": "fruiting",
-    "X": "decomposing",
-    "W": "competing growth",
-}
+# Network state display names, indexed by state code (E H N M F X W)
+NETWORK_STATE_NAMES = (
+    "empty substrate",
+    "hypha",
+    "network node",
+    "mature",
+    "fruiting",
+    "decomposing",
+    "competing growth",
+)
 
 # Garden messages
 GARDEN_INOCULATE_OK       = "you press the spore into the substrate. something begins."
@@ -469,6 +474,15 @@ GARDEN_COMPOST_ADD_OK     = "you add to the pile. it steams faintly. (compost: {
 GARDEN_COMPOST_ADD_NONE   = "nothing to add to the pile right now."
 GARDEN_ENTER              = "you step into the garden."
 GARDEN_LEAVE              = "you leave the garden."
+GARDEN_UNDO_OK            = "you think better of it. the garden is as it was."
+GARDEN_UNDO_NONE          = "nothing to take back."
+GARDEN_SELECT_INFO        = "{n} plots selected."
+GARDEN_SETTLING           = "the garden is still settling..."
+GARDEN_BATCH_OK           = "you work across the selection. plots tended: {done}."
+GARDEN_BATCH_SHORT        = "you tend {done} of {total} plots before running out."
+GARDEN_NETWORK_INFO       = "network: {size} plots, {mature} mature, {fruiting} fruiting"
+GARDEN_PREVIEW            = ("left alone, in a while: {connected} nodes, {fruiting} fruiting, "
+                             "{hypha} hypha, {competing} competing.")
 
 # Network fruiting flash messages
 NETWORK_FRUIT = [
@@ -0,0 +1,170 @@
+# engine/autosave.py
+# Write-behind autosave. The input thread hands over a detached snapshot;
+# a background thread does the disk I/O. Bursts of requests coalesce into
+# a single write: snapshots only carry the shards that changed, so newer ones
+# are merged over older unwritten ones.
+#
+# Screens that keep the player for a while (garden, flowers, exploring) call
+# checkpoint() on every action; it saves at most once per
+# CHECKPOINT_INTERVAL seconds. Set QUIETCURRENT_CHECKPOINT to change it.
+
+import os
+import threading
+import time
+from collections import deque
+
+from engine.state import GameState, snapshot_state, write_state
+
+CHECKPOINT_INTERVAL = float(os.environ.get("QUIETCURRENT_CHECKPOINT", 3.0))
+TIMINGS_KEPT = 100
+
+
+class AutoSaver:
+    """Background writer holding at most one pending snapshot."""
+
+    def __init__(self) -> None:
+        self._cond    = threading.Condition()
+        self._pending: dict | None = None
+        self._busy    = False
+        self._stopped = False
+        self._thread: threading.Thread | None = None
+        self.error: Exception | None = None   # last write failure, until taken
+        self.interval   = CHECKPOINT_INTERVAL
+        self._last_save = 0.0               # time.monotonic() of the last request
+        # Seconds spent per checkpoint on the input thread, and per write
+        # on the writer thread, most recent last
+        self.checkpoint_times: deque = deque(maxlen=TIMINGS_KEPT)
+        self.write_times:      deque = deque(maxlen=TIMINGS_KEPT)
+
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running():
+            return
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="autosave",
+                                        daemon=True)
+        self._thread.start()
+
+    def request(self, gs: GameState) -> None:
+        """Queue a save of gs. Never touches the disk on the caller's thread
+        while the writer is running; falls back to a direct write otherwise."""
+        self._last_save = time.monotonic()
+        snap = snapshot_state(gs)
+        if not self.running():
+            self._write(snap)
+            return
+        with self._cond:
+            if self._pending is None:
+                self._pending = snap
+            else:
+                self._pending.update(snap)   # newer fields win
+            self._cond.notify()
+
+    def checkpoint(self, gs: GameState, prepare=None) -> bool:
+        """Save gs if nothing was saved in the last interval seconds.
+        prepare, if given, is called first to copy screen-local state into
+        gs. Returns whether a save was queued."""
+        start = time.monotonic()
+        if start - self._last_save < self.interval:
+            return False
+        if prepare is not None:
+            prepare()
+        self.request(gs)
+        self.checkpoint_times.append(time.monotonic() - start)
+        return True
+
+    def take_error(self) -> Exception | None:
+        """The last write failure not yet reported, clearing it."""
+        with self._cond:
+            error, self.error = self.error, None
+        return error
+
+    def flush(self) -> None:
+        """Block until everything requested so far is on disk. Raises the
+        last write failure not yet reported, if any."""
+        with self._cond:
+            while self.running() and (self._pending is not None or self._busy):
+                self._cond.wait()
+        error = self.take_error()
+        if error is not None:
+            raise error
+
+    def stop(self) -> None:
+        """Flush, then shut the writer down. Raises as flush() does, once
+        the writer has stopped."""
+        try:
+            self.flush()
+        finally:
+            with self._cond:
+                self._stopped = True
+                self._cond.notify()
+            if self._thread is not None:
+                self._thread.join()
+                self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._pending is None and not self._stopped:
+                    self._cond.wait()
+                if self._pending is None:
+                    return
+                snap, self._pending = self._pending, None
+                self._busy = True
+            # Any failure is kept for take_error() or flush(); the writer
+            # carries on with the next snapshot
+            try:
+                self._write(snap)
+            except Exception as e:
+                self.error = e
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _write(self, snap: dict) -> None:
+        start = time.monotonic()
+        write_state(snap)
+        self.write_times.append(time.monotonic() - start)
+
+    def stats(self) -> dict:
+        """Count, mean and worst seconds of recent checkpoints and writes."""
+        out = {}
+        for name, times in (("checkpoint", self.checkpoint_times),
+                            ("write", self.write_times)):
+            out[name] = (len(times), sum(times) / len(times) if times else 0.0,
+                         max(times, default=0.0))
+        return out
+
+
+_SAVER = AutoSaver()
+
+
+def start() -> None:
+    _SAVER.start()
+
+
+def request(gs: GameState) -> None:
+    _SAVER.request(gs)
+
+
+def checkpoint(gs: GameState, prepare=None) -> bool:
+    return _SAVER.checkpoint(gs, prepare)
+
+
+def flush() -> None:
+    _SAVER.flush()
+
+
+def take_error() -> Exception | None:
+    return _SAVER.take_error()
+
+
+def stop() -> None:
+    _SAVER.stop()
+
+
+def stats() -> dict:
+    return _SAVER.stats()
@@ -0,0 +1,34 @@
+# engine/chance.py
+# Drawing many independent rolls at once, for rules that roll the same
+# chance for every plot in a large area.
+
+import math
+import random
+
+
+def hits(n: int, p: float, rng=random) -> list:
+    """Which of n trials at chance p succeed, in order. Skips ahead to each
+    hit, so costs the number of hits rather than n. Draws from rng, a
+    random.Random or the random module."""
+    if p <= 0:
+        return []
+    if p >= 1:
+        return list(range(n))
+    out = []
+    step = math.log1p(-p)
+    i = -1
+    while True:
+        i += 1 + int(math.log(1.0 - rng.random()) / step)
+        if i >= n:
+            return out
+        out.append(i)
+
+
+def binomial(n: int, p: float) -> int:
+    """How many of n trials at chance p succeed. Exact while few are
+    expected to; beyond that, a normal approximation."""
+    mean = n * p
+    if mean < 64:
+        return len(hits(n, p))
+    sd = math.sqrt(mean * (1 - p))
+    return min(n, max(0, round(random.gauss(mean, sd))))
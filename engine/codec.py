@@ -0,0 +1,317 @@
+# engine/codec.py
+# Compact binary save format. Bulk structures (garden, flowers, exploration)
+# are stored as packed little-endian arrays; everything else is compact JSON.
+#
+# Also a small tool for keeping saves inspectable:
+#   python -m engine.codec export [out.json]   current save → JSON
+#   python -m engine.codec import in.json      JSON → current save
+#   python -m engine.codec bench [scale]       compare against json.dump(indent=2)
+
+import json
+import struct
+import sys
+from array import array
+
+MAGIC          = b"QCSV"
+FORMAT_VERSION = 1
+
+_HEADER  = struct.Struct("<4sHH")    # magic, format version, section count
+_SECTION = struct.Struct("<4sI")     # tag, payload length
+_COUNT   = struct.Struct("<I")
+
+# Fields stored in their own packed section, keyed by section tag
+_BULK_TAGS = {
+    "garden":          b"GRDN",
+    "flowers":         b"FLWR",
+    "explore_map":     b"EMAP",
+    "explore_visited": b"EVIS",
+}
+
+
+class CodecError(ValueError):
+    pass
+
+
+# ── Packed arrays ─────────────────────────────────────────────
+
+def _le(a: array) -> bytes:
+    if sys.byteorder == "big":
+        a = array(a.typecode, a)
+        a.byteswap()
+    return a.tobytes()
+
+
+def _from_le(typecode: str, data: bytes) -> array:
+    a = array(typecode)
+    a.frombytes(data)
+    if sys.byteorder == "big":
+        a.byteswap()
+    return a
+
+
+def _is_int(v) -> bool:
+    return type(v) is int
+
+
+# ── Garden ────────────────────────────────────────────────────
+# count, then one column per field: state (1 byte ASCII), soil (u8),
+# moisture (u8), fruit_age (u16), age (u32).
+
+_PLOT_KEYS = {"state", "soil", "moisture", "age", "fruit_age"}
+
+
+def _pack_garden(plots: list) -> bytes | None:
+    for p in plots:
+        if (not isinstance(p, dict) or p.keys() != _PLOT_KEYS
+                or not isinstance(p["state"], str) or len(p["state"]) != 1
+                or not p["state"].isascii()
+                or not all(_is_int(p[k]) for k in ("soil", "moisture", "age", "fruit_age"))):
+            return None
+    try:
+        state = "".join(p["state"] for p in plots).encode("ascii")
+        soil  = bytes(p["soil"] for p in plots)
+        moist = bytes(p["moisture"] for p in plots)
+        fruit = _le(array("H", [p["fruit_age"] for p in plots]))
+        age   = _le(array("I", [p["age"] for p in plots]))
+    except (ValueError, OverflowError):
+        return None   # out of range for a packed column — keep as JSON
+    return _COUNT.pack(len(plots)) + state + soil + moist + fruit + age
+
+
+def _unpack_garden(data: bytes) -> list:
+    (n,) = _COUNT.unpack_from(data)
+    off = _COUNT.size
+    state = data[off:off + n].decode("ascii");  off += n
+    soil  = data[off:off + n];                  off += n
+    moist = data[off:off + n];                  off += n
+    fruit = _from_le("H", data[off:off + 2 * n]); off += 2 * n
+    age   = _from_le("I", data[off:off + 4 * n])
+    return [
+        {"state": s, "soil": so, "moisture": m, "age": a, "fruit_age": f}
+        for s, so, m, a, f in zip(state, soil, moist, age, fruit)
+    ]
+
+
+# ── Flowers ───────────────────────────────────────────────────
+# name table (JSON list), count, then columns: state (1 byte ASCII),
+# flower (u8 index into the name table), age is float (u8 flag), age (f64).
+
+_SLOT_KEYS = {"state", "flower", "age"}
+
+
+def _pack_flowers(slots: list) -> bytes | None:
+    names: list[str] = []
+    for s in slots:
+        if (not isinstance(s, dict) or s.keys() != _SLOT_KEYS
+                or not isinstance(s["state"], str) or len(s["state"]) != 1
+                or not s["state"].isascii()
+                or type(s["age"]) not in (int, float)
+                or not isinstance(s["flower"], str)):
+            return None
+        if s["flower"] not in names:
+            names.append(s["flower"])
+    if len(names) > 255:
+        return None
+    table = json.dumps(names, separators=(",", ":")).encode("utf-8")
+    state = "".join(s["state"] for s in slots).encode("ascii")
+    kind  = bytes(names.index(s["flower"]) for s in slots)
+    flt   = bytes(type(s["age"]) is float for s in slots)
+    age   = _le(array("d", [s["age"] for s in slots]))
+    if any(type(s["age"]) is int and float(s["age"]) != s["age"] for s in slots):
+        return None
+    return (_COUNT.pack(len(table)) + table + _COUNT.pack(len(slots))
+            + state + kind + flt + age)
+
+
+def _unpack_flowers(data: bytes) -> list:
+    (tlen,) = _COUNT.unpack_from(data)
+    off = _COUNT.size
+    names = json.loads(data[off:off + tlen].decode("utf-8")); off += tlen
+    (n,) = _COUNT.unpack_from(data, off); off += _COUNT.size
+    state = data[off:off + n].decode("ascii"); off += n
+    kind  = data[off:off + n];                 off += n
+    flt   = data[off:off + n];                 off += n
+    age   = _from_le("d", data[off:off + 8 * n])
+    return [
+        {"state": s, "flower": names[k], "age": a if f else int(a)}
+        for s, k, f, a in zip(state, kind, flt, age)
+    ]
+
+
+# ── Exploration ───────────────────────────────────────────────
+
+def _pack_map(cells: list) -> bytes | None:
+    if not all(isinstance(c, str) and len(c) == 1 and c.isascii() for c in cells):
+        return None
+    return "".join(cells).encode("ascii")
+
+
+def _unpack_map(data: bytes) -> list:
+    return list(data.decode("ascii"))
+
+
+def _pack_visited(pairs: list) -> bytes | None:
+    flat = []
+    for v in pairs:
+        if not (isinstance(v, list) and len(v) == 2 and _is_int(v[0]) and _is_int(v[1])):
+            return None
+        flat.extend(v)
+    try:
+        return _le(array("H", flat))
+    except OverflowError:
+        return None
+
+
+def _unpack_visited(data: bytes) -> list:
+    flat = _from_le("H", data)
+    return [[flat[i], flat[i + 1]] for i in range(0, len(flat), 2)]
+
+
+_PACKERS = {
+    b"GRDN": (_pack_garden,  _unpack_garden),
+    b"FLWR": (_pack_flowers, _unpack_flowers),
+    b"EMAP": (_pack_map,     _unpack_map),
+    b"EVIS": (_pack_visited, _unpack_visited),
+}
+
+
+# ── Whole state ───────────────────────────────────────────────
+
+def encode_state(d: dict) -> bytes:
+    """Encode a saved-state dict. Any bulk field that can't be packed
+    losslessly stays in the JSON core section instead."""
+    core = {}
+    sections = []
+    for k, v in d.items():
+        tag = _BULK_TAGS.get(k)
+        packed = _PACKERS[tag][0](v) if tag and isinstance(v, list) else None
+        if packed is None:
+            core[k] = v
+        else:
+            sections.append((tag, packed))
+    sections.insert(0, (b"CORE", json.dumps(core, separators=(",", ":")).encode("utf-8")))
+
+    out = [_HEADER.pack(MAGIC, FORMAT_VERSION, len(sections))]
+    for tag, payload in sections:
+        out.append(_SECTION.pack(tag, len(payload)))
+        out.append(payload)
+    return b"".join(out)
+
+
+def decode_state(data: bytes) -> dict:
+    try:
+        magic, version, count = _HEADER.unpack_from(data)
+    except struct.error:
+        raise CodecError("truncated save header")
+    if magic != MAGIC:
+        raise CodecError("not a quietcurrent save")
+    if version > FORMAT_VERSION:
+        raise CodecError(f"save format {version} is newer than this game")
+
+    fields = {tag: name for name, tag in _BULK_TAGS.items()}
+    d: dict = {}
+    off = _HEADER.size
+    try:
+        for _ in range(count):
+            tag, length = _SECTION.unpack_from(data, off)
+            off += _SECTION.size
+            payload = data[off:off + length]
+            off += length
+            if len(payload) != length:
+                raise CodecError("truncated save section")
+            if tag == b"CORE":
+                d.update(json.loads(payload.decode("utf-8")))
+            elif tag in _PACKERS:
+                d[fields[tag]] = _PACKERS[tag][1](payload)
+            # unknown sections from newer minor revisions are skipped
+    except CodecError:
+        raise
+    except (struct.error, ValueError, IndexError) as e:
+        # ValueError covers bad JSON and text, unknown codes and arrays
+        # whose length does not fit their type
+        raise CodecError(f"corrupt save: {e}")
+    return d
+
+
+# ── Tool ──────────────────────────────────────────────────────
+
+def _export(args: list) -> None:
+    from engine.journal import JOURNAL
+    d = JOURNAL.load()
+    if d is None:
+        sys.exit("no save found.")
+    text = json.dumps(d, indent=2)
+    if args:
+        with open(args[0], "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+def _import(args: list) -> None:
+    from engine.journal import JOURNAL
+    if not args:
+        sys.exit("usage: python -m engine.codec import in.json")
+    with open(args[0]) as f:
+        d = json.load(f)
+    JOURNAL.load()          # pick up the current sequence number
+    JOURNAL.compact(d)
+
+
+def _bench_state(scale: int) -> dict:
+    import random
+    from engine.state import GameState, Resident, GARDEN_SIZE, _state_to_dict, init_garden
+    from engine.codes import PLOT_CODES, BLOOM_CODES
+    rng = random.Random(7)
+    gs = GameState(settlement_name="bench")
+    gs.garden_initialized = True
+    gs.garden = init_garden(GARDEN_SIZE * scale)
+    for p in gs.garden:
+        p["state"]    = PLOT_CODES[rng.choice("EEEHNMFXW")]
+        p["moisture"] = rng.randint(0, 5)
+        p["age"]      = rng.randint(0, 400)
+    gs.flowers = [{"state": BLOOM_CODES[rng.choice("EBFW")], "flower": rng.choice(["none", "marigold", "clover"]),
+                   "age": rng.choice([0, 3, 1.2 * rng.randint(1, 80)])} for _ in range(13)]
+    gs.explore_map = [rng.choice(".#~^*") for _ in range(36 * 14 * scale)]
+    gs.explore_visited = [[rng.randrange(36), rng.randrange(14)] for _ in range(200 * scale)]
+    gs.residents = [Resident(n, 2, 40) for n in ("Weft", "Tuck", "Fen")]
+    return _state_to_dict(gs)
+
+
+def _bench(args: list) -> None:
+    import timeit
+    scale = int(args[0]) if args else 1
+    d = _bench_state(scale)
+
+    as_json = json.dumps(d, indent=2)
+    as_bin  = encode_state(d)
+    assert decode_state(as_bin) == json.loads(as_json)
+
+    def per_call(fn) -> float:
+        n, t = timeit.Timer(fn).autorange()
+        return t / n * 1e6
+
+    rows = [
+        ("json indent=2", len(as_json.encode()),
+         per_call(lambda: json.dumps(d, indent=2)),
+         per_call(lambda: json.loads(as_json))),
+        ("binary",        len(as_bin),
+         per_call(lambda: encode_state(d)),
+         per_call(lambda: decode_state(as_bin))),
+    ]
+    print(f"{len(d['garden'])} plots, {len(d['explore_map'])} map cells, "
+          f"{len(d['explore_visited'])} visited")
+    print(f"{'format':<14} {'bytes':>8} {'encode µs':>10} {'decode µs':>10}")
+    for name, size, enc, dec in rows:
+        print(f"{name:<14} {size:>8} {enc:>10.1f} {dec:>10.1f}")
+
+
+def main(argv: list) -> None:
+    commands = {"export": _export, "import": _import, "bench": _bench}
+    if not argv or argv[0] not in commands:
+        sys.exit("usage: python -m engine.codec export|import|bench [args]")
+    commands[argv[0]](argv[1:])
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
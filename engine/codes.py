@@ -0,0 +1,48 @@
+# engine/codes.py
+# Integer codes for garden plot and flower slot states. The engine and UI
+# work with these; saves keep the one-letter names, translated at the save
+# boundary (engine/state.py _to_saved / _from_saved).
+#
+# Codes run 0..n-1 so a code can index a table directly.
+
+from enum import IntEnum
+
+
+class Plot(IntEnum):
+    EMPTY     = 0   # E
+    HYPHA     = 1   # H
+    NETWORK   = 2   # N
+    MATURE    = 3   # M
+    FRUITING  = 4   # F
+    DECOMP    = 5   # X
+    COMPETING = 6   # W
+
+
+class Bloom(IntEnum):
+    EMPTY     = 0   # E
+    BUDDING   = 1   # B
+    FLOWERING = 2   # F
+    WILTING   = 3   # W
+
+
+# Saved letter of each code, indexed by code
+PLOT_LETTERS  = "EHNMFXW"
+BLOOM_LETTERS = "EBFW"
+
+# Members indexed by code, for turning a stored int back into its member
+PLOTS  = tuple(Plot)
+BLOOMS = tuple(Bloom)
+
+# Saved letter → code. Plot letters include those of saves from before
+# 0.3.0; growth and crop from those saves are dropped by Garden.from_dicts.
+PLOT_CODES = {
+    **{letter: PLOTS[i] for i, letter in enumerate(PLOT_LETTERS)},
+    "D": Plot.EMPTY, "P": Plot.EMPTY, "G": Plot.HYPHA, "R": Plot.MATURE,
+}
+BLOOM_CODES = {letter: BLOOMS[i] for i, letter in enumerate(BLOOM_LETTERS)}
+
+
+def lookup(enum, members) -> tuple:
+    """A table of bools indexed by code: True for the members of enum in
+    members. Cheaper than a tuple or set membership test in hot loops."""
+    return tuple(m in members for m in enum)
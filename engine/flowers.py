@@ -2,7 +2,9 @@
 # Flower garden engine. No UI imports — pure state mutation.
 
 import random
-from engine.state import GameState
+from engine.codes import Bloom
+from engine.state import GameState, is_loaded, mark_dirty, state_counts
+from engine.topology import lattice
 from data import text as txt
 
 
@@ -23,29 +25,14 @@ FLOWER_SLOTS = [
 ]
 FLOWER_SLOT_COUNT = len(FLOWER_SLOTS)
 
-# Lookup tables built at module load
-_SLOT_POS = {i: (ro, co) for i, (_, ro, co) in enumerate(FLOWER_SLOTS)}
-_POS_IDX  = {(ro, co): i for i, (_, ro, co) in enumerate(FLOWER_SLOTS)}
-
 # Adjacency offsets in (row_delta, col_delta) space — col steps are 2
 _NEIGHBOR_OFFSETS = [(-1, 0), (1, 0), (0, -2), (0, 2),
                      (-1, -2), (-1, 2), (1, -2), (1, 2)]
 
 
-def _build_neighbors() -> dict:
-    result = {}
-    for i in range(FLOWER_SLOT_COUNT):
-        ro, co = _SLOT_POS[i]
-        nbrs = []
-        for dr, dc in _NEIGHBOR_OFFSETS:
-            pos = (ro + dr, co + dc)
-            if pos in _POS_IDX:
-                nbrs.append(_POS_IDX[pos])
-        result[i] = nbrs
-    return result
-
-
-SLOT_NEIGHBORS = _build_neighbors()
+# SLOT_NEIGHBORS[i]: the slots next to slot i (see engine/topology.py)
+SLOT_NEIGHBORS = lattice([(ro, co) for _, ro, co in FLOWER_SLOTS],
+                         _NEIGHBOR_OFFSETS)
 
 
 # --- Flower varieties ---
@@ -97,16 +84,24 @@ FLOWERS = {
 }
 
 
+# --- Slot states (see engine/codes.py) ---
+EMPTY     = Bloom.EMPTY
+BUDDING   = Bloom.BUDDING
+FLOWERING = Bloom.FLOWERING
+WILTING   = Bloom.WILTING
+
+
 # --- Garden initialisation ---
 
 def init_flowers() -> list:
-    return [{"state": "E", "flower": "none", "age": 0}
+    return [{"state": EMPTY, "flower": "none", "age": 0}
             for _ in range(FLOWER_SLOT_COUNT)]
 
 
 def ensure_flower_garden(gs: GameState) -> None:
     if len(gs.flowers) < FLOWER_SLOT_COUNT:
         gs.flowers = init_flowers()
+        mark_dirty(gs, "flowers")
 
 
 # --- Actions ---
@@ -114,13 +109,14 @@ def ensure_flower_garden(gs: GameState) -> None:
 def action_plant_flower(gs: GameState, idx: int, flower_key: str) -> str:
     """Plant a flower in an empty slot. No resource cost."""
     slot = gs.flowers[idx]
-    if slot["state"] != "E":
+    if slot["state"] != EMPTY:
         return txt.FLOWER_PLANT_OCCUPIED
     if flower_key not in FLOWERS:
         return "unknown flower."
-    slot["state"]  = "B"
+    slot["state"]  = BUDDING
     slot["flower"] = flower_key
     slot["age"]    = 0
+    mark_dirty(gs, "flowers")
     return txt.FLOWER_PLANTED.format(flower=FLOWERS[flower_key]["label"])
 
 
@@ -129,44 +125,45 @@ def action_plant_flower(gs: GameState, idx: int, flower_key: str) -> str:
 def flower_tick(gs: GameState) -> None:
     """Advance all flower slots. Call after each player action in the view."""
     seeds_to_plant = []   # (target_idx, flower_key) — applied after iteration
+    mark_dirty(gs, "flowers")
 
     for i, slot in enumerate(gs.flowers):
         state  = slot["state"]
         flower = slot["flower"]
         spec   = FLOWERS.get(flower, {})
 
-        if state == "B":
+        if state == BUDDING:
             # Budding → grow toward flowering
             slot["age"] += spec.get("speed", 1.0)
             if slot["age"] >= 100:
-                slot["state"] = "F"
+                slot["state"] = FLOWERING
                 slot["age"]   = 0
 
-        elif state == "F":
+        elif state == FLOWERING:
             # Flowering — count bloom ticks, attempt self-seeding
             slot["age"] += 1
             if random.random() < spec.get("seed_chance", 0.03):
                 empty_nbrs = [n for n in SLOT_NEIGHBORS[i]
-                              if gs.flowers[n]["state"] == "E"]
+                              if gs.flowers[n]["state"] == EMPTY]
                 if empty_nbrs:
                     seeds_to_plant.append((random.choice(empty_nbrs), flower))
             if slot["age"] >= spec.get("bloom_life", 180):
-                slot["state"] = "W"
+                slot["state"] = WILTING
                 slot["age"]   = 0
 
-        elif state == "W":
+        elif state == WILTING:
             # Wilting → return to empty ground
             slot["age"] += 2
             if slot["age"] >= 100:
-                slot["state"]  = "E"
+                slot["state"]  = EMPTY
                 slot["flower"] = "none"
                 slot["age"]    = 0
 
     # Apply self-seeded arrivals (first seed wins per target slot)
     seeded: set[int] = set()
     for target, flower_key in seeds_to_plant:
-        if target not in seeded and gs.flowers[target]["state"] == "E":
-            gs.flowers[target]["state"]  = "B"
+        if target not in seeded and gs.flowers[target]["state"] == EMPTY:
+            gs.flowers[target]["state"]  = BUDDING
             gs.flowers[target]["flower"] = flower_key
             gs.flowers[target]["age"]    = 0
             seeded.add(target)
@@ -175,10 +172,11 @@ def flower_tick(gs: GameState) -> None:
 # --- Summary ---
 
 def flower_summary(gs: GameState) -> dict:
-    budding   = sum(1 for s in gs.flowers if s["state"] == "B")
-    flowering = sum(1 for s in gs.flowers if s["state"] == "F")
-    wilting   = sum(1 for s in gs.flowers if s["state"] == "W")
-    empty     = sum(1 for s in gs.flowers if s["state"] == "E")
+    counts = state_counts(gs, "flowers")
+    budding   = counts[BUDDING]
+    flowering = counts[FLOWERING]
+    wilting   = counts[WILTING]
+    empty     = FLOWER_SLOT_COUNT - budding - flowering - wilting
     return {
         "total":     FLOWER_SLOT_COUNT - empty,
         "budding":   budding,
@@ -186,3 +184,10 @@ def flower_summary(gs: GameState) -> dict:
         "wilting":   wilting,
         "empty":     empty,
     }
+
+
+def blooming_flowers(gs: GameState) -> list:
+    """Variety keys of the slots in flower, in slot order."""
+    if not is_loaded(gs, "flowers") and "blooming" in gs.summaries:
+        return gs.summaries["blooming"]
+    return [s["flower"] for s in gs.flowers if s["state"] == FLOWERING]
@@ -0,0 +1,185 @@
+# engine/fork.py
+# Copy-on-write GameState forks. A fork shares the garden and flowers with
+# its parent. The garden, dense or sparse, copies a column the first time
+# either side writes it (see engine/plotgrid.py and engine/sparsegrid.py);
+# the flowers copy a slot the first time it is read through the list, since
+# engine code updates slot dicts in place.
+# Forking costs the same however big the garden is.
+#
+# Used by the garden view for undo and for "what happens next" previews.
+
+import random
+from collections.abc import MutableSequence
+from dataclasses import replace
+
+from engine.plotgrid import CHECKED, PLOT_FIELDS
+from engine.state import GameState, SHARDS, loaded_items, mark_dirty
+
+# Layers a CowList may stack before they are squashed into one
+MAX_DEPTH = 8
+
+# Ticks run by preview()
+PREVIEW_TICKS = 50
+
+
+class CowList(MutableSequence):
+    """A list of dicts sharing its elements with other forks.
+
+    Reading element i through the list copies it into this list's own layer
+    first, so in-place updates never reach the shared base. The base is a
+    plain list or a frozen CowList layer; neither is written again."""
+
+    __slots__ = ("_base", "_own", "_depth")
+
+    def __init__(self, base, own: dict | None = None, depth: int = 0) -> None:
+        self._base  = base
+        self._own   = own if own is not None else {}
+        self._depth = depth
+
+    def _peek(self, i: int):
+        """Element i without copying. Never write through the result."""
+        layer = self
+        while isinstance(layer, CowList):
+            if i in layer._own:
+                return layer._own[i]
+            layer = layer._base
+        return layer[i]
+
+    def fork(self) -> "CowList":
+        """Freeze the current contents as a shared layer; return a sibling
+        list over it. This list keeps writing into a fresh layer above."""
+        frozen = CowList(self._base, self._own, self._depth + 1)
+        if frozen._depth > MAX_DEPTH:
+            frozen = frozen._squash()
+        self._base, self._own, self._depth = frozen, {}, frozen._depth
+        return CowList(frozen, {}, frozen._depth)
+
+    def _squash(self) -> "CowList":
+        """One layer equal to this stack of layers. Costs the number of
+        elements written since the plain list at the bottom, not its size."""
+        owns = []
+        layer = self
+        while isinstance(layer, CowList):
+            owns.append(layer._own)
+            layer = layer._base
+        merged: dict = {}
+        for own in reversed(owns):
+            merged.update(own)
+        return CowList(layer, merged, 1)
+
+    # ── Sequence protocol ──
+
+    def __len__(self) -> int:
+        return len(self._base)
+
+    def _index(self, i: int) -> int:
+        n = len(self._base)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("CowList index out of range")
+        return i
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        i = self._index(i)
+        if i in self._own:
+            return self._own[i]
+        v = self._peek(i)
+        if isinstance(v, dict):
+            v = dict(v)
+        self._own[i] = v
+        return v
+
+    def __setitem__(self, i, v) -> None:
+        if isinstance(i, slice):
+            self._flatten()
+            self._base[i] = v
+            return
+        self._own[self._index(i)] = v
+
+    def __delitem__(self, i) -> None:
+        self._flatten()
+        del self._base[i]
+
+    def insert(self, i: int, v) -> None:
+        self._flatten()
+        self._base.insert(i, v)
+
+    def _flatten(self) -> None:
+        # Length changes need a private plain list
+        self._base  = [self[i] for i in range(len(self))]
+        self._own   = {}
+        self._depth = 0
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (list, CowList)) or len(self) != len(other):
+            return False
+        peek = other._peek if isinstance(other, CowList) else other.__getitem__
+        return all(self._peek(i) == peek(i) for i in range(len(self)))
+
+    def __repr__(self) -> str:
+        return repr([self._peek(i) for i in range(len(self))])
+
+
+# Fields whose elements are updated in place, shared through CowList
+_COW_FIELDS = ("flowers",)
+
+
+def fork(gs: GameState) -> GameState:
+    """A copy of gs sharing structure with it. Writes to either stay private."""
+    child = GameState.__new__(GameState)
+    for k, v in loaded_items(gs):
+        if k in _COW_FIELDS:
+            if not isinstance(v, CowList):
+                v = CowList(v)
+                setattr(gs, k, v)
+            v = v.fork()
+        elif hasattr(v, "fork"):
+            v = v.fork()                    # the garden, dense or sparse
+        elif k == "residents":
+            v = [replace(r) for r in v]     # at most RESIDENT_MAX
+        elif isinstance(v, (list, dict, set)) and k not in ("explore_map", "explore_visited"):
+            v = type(v)(v)                  # small: frame_rules, summaries, dirty, lazy
+        # Scalars and the exploration fields, which are only ever replaced
+        # wholesale, are shared as they are
+        setattr(child, k, v)
+    return child
+
+
+def restore(gs: GameState, snap: GameState) -> None:
+    """Roll gs back to a fork taken from it earlier. snap is used up."""
+    pending = set(gs.lazy)
+    for k, v in loaded_items(snap):
+        setattr(gs, k, v)
+    gs.lazy = {k: f for k, f in snap.lazy.items() if k in pending}
+    mark_dirty(gs, *SHARDS)
+
+
+def preview(gs: GameState, ticks: int = PREVIEW_TICKS) -> GameState:
+    """Run the garden forward on a fork of gs and return the fork. The random
+    state is put back afterwards, so gs's own future is left as it was."""
+    from engine.garden import garden_tick
+    state = random.getstate()
+    before = _columns(gs.garden) if CHECKED else None
+    ahead = fork(gs)
+    try:
+        for _ in range(ticks):
+            garden_tick(ahead)
+    finally:
+        random.setstate(state)
+    if CHECKED and _columns(gs.garden) != before:
+        raise AssertionError("preview changed the garden it was forked from")
+    return ahead
+
+
+def _columns(garden) -> list:
+    # Every saved column of a Garden, or of each chunk of a SparseGarden
+    parts = [garden.chunks[key] for key in sorted(garden.chunks)] \
+        if hasattr(garden, "chunks") else [garden]
+    return [bytes(getattr(p, name)) for p in parts for name in PLOT_FIELDS]
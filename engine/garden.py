@@ -1,34 +1,59 @@
 # engine/garden.py
 # Garden grid engine — mycorrhizal network model. No UI here.
 
+import os
 import random
-from engine.state import GameState, GARDEN_W, GARDEN_H, GARDEN_SIZE, init_garden, plot_idx
+import sys
+import time
+from array import array
+from functools import lru_cache
+from heapq import heappop, heappush
+from itertools import compress
+from engine import gardenbuf, gardennp, rules
+from engine import moisture as moisture_field
+from engine.chance import hits
+from engine.codes import Plot, lookup
+from engine.sparsegrid import SparseGarden
+from engine.state import (GameState, GARDEN_SIZE, init_garden, is_loaded,
+                          mark_dirty, state_counts)
 from data import text as txt
 
 
-# Plot state constants
-EMPTY     = "E"
-HYPHA     = "H"
-NETWORK   = "N"
-MATURE    = "M"
-FRUITING  = "F"
-DECOMP    = "X"
-COMPETING = "W"
+# Plot state constants (see engine/codes.py)
+EMPTY     = Plot.EMPTY
+HYPHA     = Plot.HYPHA
+NETWORK   = Plot.NETWORK
+MATURE    = Plot.MATURE
+FRUITING  = Plot.FRUITING
+DECOMP    = Plot.DECOMP
+COMPETING = Plot.COMPETING
 
 ACTIVE_STATES    = (NETWORK, MATURE, FRUITING)
 LIVING_STATES    = (HYPHA, NETWORK, MATURE, FRUITING)
 WATERABLE_STATES = (HYPHA, NETWORK, MATURE, FRUITING)
 
+# Membership tables indexed by state code: IS_LIVING[state]
+IS_ACTIVE     = lookup(Plot, ACTIVE_STATES)
+IS_LIVING     = lookup(Plot, LIVING_STATES)
+IS_WATERABLE  = lookup(Plot, WATERABLE_STATES)
+IS_ENRICHABLE = lookup(Plot, (HYPHA, NETWORK, MATURE))   # by decomposing plots
+
 
 # ── Plot access ───────────────────────────────────────────────
 
+# By the garden's own width, so actions work on gardens of any size
+def _idx(gs: GameState, x: int, y: int) -> int:
+    return y * gs.garden.width + x
+
+
 def get_plot(gs: GameState, x: int, y: int) -> dict:
-    return gs.garden[plot_idx(x, y)]
+    return gs.garden[_idx(gs, x, y)]
 
 
 def set_plot(gs: GameState, x: int, y: int, **kwargs) -> None:
-    p = gs.garden[plot_idx(x, y)]
+    p = gs.garden[_idx(gs, x, y)]
     p.update(kwargs)
+    mark_dirty(gs, "garden")
 
 
 # ── Garden init ───────────────────────────────────────────────
@@ -37,6 +62,7 @@ def ensure_garden(gs: GameState) -> None:
     if not gs.garden_initialized or len(gs.garden) < GARDEN_SIZE:
         gs.garden = init_garden()
         gs.garden_initialized = True
+        mark_dirty(gs, "garden")
 
 
 # ── Actions ───────────────────────────────────────────────────
@@ -54,7 +80,7 @@ def action_inoculate(gs: GameState, x: int, y: int) -> str:
 
 def action_water(gs: GameState, x: int, y: int) -> str:
     p = get_plot(gs, x, y)
-    if p["state"] not in WATERABLE_STATES:
+    if not IS_WATERABLE[p["state"]]:
         return txt.GARDEN_WATER_NONE
     if gs.water < 1:
         return txt.GARDEN_WATER_DRY
@@ -88,7 +114,7 @@ def action_enrich(gs: GameState, x: int, y: int) -> str:
 
 def action_feed(gs: GameState, x: int, y: int) -> str:
     p = get_plot(gs, x, y)
-    if p["state"] not in ACTIVE_STATES:
+    if not IS_ACTIVE[p["state"]]:
         return txt.GARDEN_FEED_WRONG
     if gs.mycelium < 1:
         return txt.GARDEN_MYCELIUM_NONE
@@ -130,113 +156,405 @@ def action_add_compost(gs: GameState) -> str:
     return txt.GARDEN_COMPOST_ADD_OK.format(level=gs.compost_level)
 
 
+# ── Batch actions ─────────────────────────────────────────────
+
+# The plot actions above over a selection of plots: batch_action checks
+# what the player holds once, tends every plot the action suits in one
+# pass, and leaves the caller one garden_tick for the lot.
+#   action → (suits it, by state; GameState field spent; cost per plot;
+#             message when nothing suits; message when the field is spent)
+_BATCH = {
+    "inoculate": (lookup(Plot, (EMPTY,)), "spores", 1,
+                  txt.GARDEN_INOCULATE_OCCUPIED, txt.GARDEN_INOCULATE_NONE),
+    "water":     (IS_WATERABLE, "water", 1,
+                  txt.GARDEN_WATER_NONE, txt.GARDEN_WATER_DRY),
+    "clear":     (lookup(Plot, (COMPETING,)), None, 0,
+                  txt.GARDEN_CLEAR_NONE, None),
+    "enrich":    (lookup(Plot, (EMPTY,)), "compost_level", 1,
+                  txt.GARDEN_ENRICH_NOT_EMPTY, txt.GARDEN_ENRICH_NONE),
+    "feed":      (IS_ACTIVE, "mycelium", 1,
+                  txt.GARDEN_FEED_WRONG, txt.GARDEN_MYCELIUM_NONE),
+    "extend":    (lookup(Plot, (EMPTY,)), "mycelium", 2,
+                  txt.GARDEN_EXTEND_WRONG, txt.GARDEN_EXTEND_LOW),
+    "suppress":  (lookup(Plot, (COMPETING,)), "mycelium", 1,
+                  txt.GARDEN_SUPPRESS_WRONG, txt.GARDEN_MYCELIUM_NONE),
+}
+
+BATCH_ACTIONS = tuple(_BATCH)
+
+
+def region_rect(gs: GameState, x0: int, y0: int, x1: int, y1: int) -> list:
+    """Plots in the rectangle with corners (x0, y0) and (x1, y1), row by
+    row."""
+    w = gs.garden.width
+    xs = range(min(x0, x1), max(x0, x1) + 1)
+    return [y * w + x for y in range(min(y0, y1), max(y0, y1) + 1) for x in xs]
+
+
+def region_flood(gs: GameState, x: int, y: int) -> list:
+    """Plots joined to (x, y) through neighbours in the same state as it,
+    in plot order."""
+    g = gs.garden
+    start = _idx(gs, x, y)
+    state = g.state[start]
+    seen, todo = {start}, [start]
+    while todo:
+        for n in g.neighbours(todo.pop()):
+            if n not in seen and g.state[n] == state:
+                seen.add(n)
+                todo.append(n)
+    return sorted(seen)
+
+
+def batch_action(gs: GameState, action: str, plots) -> str:
+    """action (one of BATCH_ACTIONS) on every plot of plots it suits. If
+    what it spends runs short, the plots first in plot order are tended.
+    Returns a message; the caller ticks the garden once afterwards."""
+    suits, field, cost, none_msg, short_msg = _BATCH[action]
+    if action == "enrich" and not gs.has_compost_pile:
+        return txt.GARDEN_COMPOST_NEED
+    g = gs.garden
+    states = g.state
+    targets = sorted(i for i in set(plots) if suits[states[i]])
+    if not targets:
+        return none_msg
+    total = len(targets)
+    if cost:
+        held = getattr(gs, field)
+        targets = targets[:held // cost]
+        if not targets:
+            return short_msg
+        setattr(gs, field, held - cost * len(targets))
+
+    if action in ("inoculate", "extend", "suppress"):
+        ages, fruit = g.writable("age"), g.writable("fruit_age")
+        for i in targets:
+            g.set_state(i, HYPHA)
+            ages[i] = fruit[i] = 0
+    elif action == "clear":
+        for i in targets:
+            g.set_state(i, EMPTY)
+    elif action == "water":
+        moisture = g.writable("moisture")
+        for i in targets:
+            moisture[i] = min(5, moisture[i] + 2)
+    else:
+        soils = g.writable("soil")
+        gain = 2 if action == "enrich" else 1
+        for i in targets:
+            soils[i] = min(5, soils[i] + gain)
+    mark_dirty(gs, "garden")
+
+    if len(targets) < total:
+        return txt.GARDEN_BATCH_SHORT.format(done=len(targets), total=total)
+    return txt.GARDEN_BATCH_OK.format(done=len(targets))
+
+
 # ── Garden tick ───────────────────────────────────────────────
 
+# Which engine garden_tick runs: "python", "numpy", "buffered", or "auto" for
+# numpy on gardens of NUMPY_MIN_PLOTS or more when it is installed. The
+# numpy engine (engine/gardennp.py) and the buffered one
+# (engine/gardenbuf.py) update every plot from the tick's starting states,
+# so their random outcomes differ from the python engine's. Sparse gardens
+# (engine/sparsegrid.py) always tick on the buffered engine, and gardens on
+# any topology but a bounded grid (engine/topology.py) never on numpy.
+ENGINE = os.environ.get("QUIETCURRENT_ENGINE", "auto")
+
+# "auto" keeps smaller gardens, the game's own among them, on the python
+# engine, whose plot-by-plot update is the reference behaviour
+NUMPY_MIN_PLOTS = 2048
+
+
+def set_engine(name: str) -> None:
+    """Choose the garden_tick engine. ValueError if name is unknown or is
+    "numpy" and numpy is not installed."""
+    global ENGINE
+    if name not in ("auto", "python", "numpy", "buffered"):
+        raise ValueError(f"unknown garden engine: {name}")
+    if name == "numpy" and not gardennp.AVAILABLE:
+        raise ValueError("the numpy garden engine needs numpy installed")
+    ENGINE = name
+
+
+def _use_numpy(g) -> bool:
+    if not gardennp.AVAILABLE or ENGINE in ("python", "buffered"):
+        return False
+    if g.topology.kind != "grid" or len(g) % g.width:
+        return False   # it counts neighbours by shifting whole rows
+    return ENGINE == "numpy" or len(g) >= NUMPY_MIN_PLOTS
+
+
 def garden_tick(gs: GameState) -> str | None:
     """Advance mycorrhizal network state machine, moisture, competing growth.
     Returns a flash message or None."""
-    flash = None
-
-    for i, p in enumerate(gs.garden):
-        state = p["state"]
-        moist = p["moisture"]
-        soil  = p["soil"]
-        x, y  = i % GARDEN_W, i // GARDEN_W
-
-        # ── Moisture update ───────────────────────────────────
-        if gs.weather == "rainy":
-            if state in LIVING_STATES:
-                if random.random() < 0.6:
-                    p["moisture"] = min(5, moist + 1)
-        elif moist > 0:
-            loss = 2 if gs.weather in ("sunny", "windy") else 1
-            p["moisture"] = max(0, moist - loss)
-
-        moist = p["moisture"]  # re-read after weather
-
-        # ── Skip plots that need no further processing ────────
-        if state not in LIVING_STATES and state not in (DECOMP, COMPETING, EMPTY):
+    return GardenTick(gs).finish()
+
+
+# Plots the python engine visits between slices of a GardenTick
+SLICE_PLOTS = 1024
+
+
+class GardenTick:
+    """One garden_tick, worked through in slices so a view can keep drawing
+    and reading keys while a big garden advances. The tick comes out as it
+    would all at once so long as nothing else touches the garden before it
+    is done: finish() is the barrier, working through whatever is left."""
+
+    __slots__ = ("_steps", "done", "flash")
+
+    def __init__(self, gs: GameState) -> None:
+        mark_dirty(gs, "garden")
+        self._steps = _steps(gs)
+        self.done  = False
+        self.flash = None   # garden_tick's message, once done
+
+    def run(self, budget: float) -> bool:
+        """Work for about budget seconds, a slice at a time. Returns done."""
+        deadline = time.perf_counter() + budget
+        while not self.done:
+            try:
+                next(self._steps)
+            except StopIteration as stop:
+                self.done, self.flash = True, stop.value
+            else:
+                if time.perf_counter() >= deadline:
+                    break
+        return self.done
+
+    def finish(self) -> str | None:
+        self.run(float("inf"))
+        return self.flash
+
+
+def _steps(gs: GameState):
+    """The tick on the engine ENGINE picks, yielding between slices and
+    returning the flash message. Numpy ticks are one slice."""
+    if isinstance(gs.garden, SparseGarden):
+        return (yield from gardenbuf.tick_sparse(gs))
+    if ENGINE == "buffered":
+        return (yield from gardenbuf.tick(gs))
+    if _use_numpy(gs.garden):
+        return gardennp.tick(gs)
+    return (yield from _tick_python(gs))
+
+
+# translate() tables over the state column: plots not in an asleep state
+# (see engine/rules.py), plots in each state, and the counters' states
+_ALWAYS_AWAKE  = bytes(c < len(Plot) and c not in rules.ASLEEP for c in range(256))
+_IN_STATE      = [bytes(c == s for c in range(256)) for s in Plot]
+_AGEING_BYTES   = bytes(c < len(Plot) and rules.AGEING[c] for c in range(256))
+_RIPENING_BYTES = bytes(c < len(Plot) and rules.RIPENING[c] for c in range(256))
+
+# Rule guard fields, each read from the garden column of the same name:
+# byte columns, and counter columns
+_BYTE_GUARDS    = ("moisture", "soil", "near_living", "near_fruiting")
+_COUNTER_GUARDS = ("age", "fruit_age")
+
+# A rule guarding nothing: _awake skips fields left at these values
+_FREE_RULE = rules.Transition(Plot.EMPTY, Plot.EMPTY)
+
+# Decomposing plots roll for their neighbours' soil every tick
+_ALWAYS_VISITED = (DECOMP,)
+
+
+@lru_cache(maxsize=None)
+def _within(lo: int, hi: int) -> bytes:
+    """translate() table marking bytes lo..hi."""
+    return bytes(lo <= c <= hi for c in range(256))
+
+
+def _byte_mask(col, lo: int, hi: int = 255) -> int:
+    """Where a byte column is within lo..hi, one byte per plot."""
+    return int.from_bytes(bytes(col).translate(_within(lo, hi)), "little")
+
+
+def _counter_mask(col, least: int) -> int | None:
+    """Where a counter column (array "H" or "I") is at least least, one
+    byte per plot, read a byte lane at a time; None above 255, for
+    which it would take more than that."""
+    if least > 255:
+        return None
+    raw, k = col.tobytes(), col.itemsize
+    low = 0 if sys.byteorder == "little" else k - 1
+    mask = _byte_mask(raw[low::k], least)
+    for b in range(k):
+        if b != low:
+            mask |= _byte_mask(raw[b::k], 1)
+    return mask
+
+
+def _advance(col, mask: bytes) -> None:
+    """Add 1 to a counter column wherever mask, one byte per plot, is 1:
+    the column is read as one big number, each plot's mask byte added at
+    the bottom of its lane."""
+    k, order = col.itemsize, sys.byteorder
+    step = bytearray(len(col) * k)
+    step[(0 if order == "little" else k - 1)::k] = mask
+    total = int.from_bytes(col.tobytes(), order) + int.from_bytes(step, order)
+    col[:] = array(col.typecode, total.to_bytes(len(col) * k, order))
+
+
+def _awake(g, weather: str) -> tuple:
+    """Plots whose visit can change something this tick, as a mask over
+    the garden, and the plots of asleep states whose drawn rule fires, as
+    plot → rule. A plot of another state is visited if one of its rules'
+    guards holds, or may: rules.choose() only rolls a rule's chance once
+    its guard holds, so a plot none of whose guards hold would be visited
+    for nothing. Read after the counters have advanced."""
+    n = len(g)
+    state = g.state
+    columns = {}
+    wake = 0
+    for s, table in enumerate(rules.BY_STATE):
+        if s in rules.ASLEEP or not state.count(s):
             continue
+        if s in _ALWAYS_VISITED:
+            wake |= int.from_bytes(state.translate(_IN_STATE[s]), "little")
+            continue
+        holds = 0
+        for t in table:
+            if t.weather and weather not in t.weather:
+                continue
+            guard = -1   # every plot
+            for name in _BYTE_GUARDS:
+                bound = getattr(t, name)
+                if bound != getattr(_FREE_RULE, name):
+                    lo, hi = bound if isinstance(bound, tuple) else (bound, 255)
+                    key = (name, lo, hi)
+                    if key not in columns:
+                        columns[key] = _byte_mask(getattr(g, name), lo, hi)
+                    guard &= columns[key]
+            for name in _COUNTER_GUARDS:
+                least = getattr(t, name)
+                if least:
+                    key = (name, least)
+                    if key not in columns:
+                        columns[key] = _counter_mask(getattr(g, name), least)
+                    if columns[key] is not None:
+                        guard &= columns[key]
+            holds |= guard
+            if holds == -1:
+                break
+        wake |= int.from_bytes(state.translate(_IN_STATE[s]), "little") & holds
+    wake = bytearray(wake.to_bytes(n, "little"))
+    drawn = {}
+    for s in rules.ASLEEP:
+        rule = rules.DRAWN[s]
+        if rule:
+            plots = list(compress(range(n), state.translate(_IN_STATE[s])))
+            drawn.update((plots[k], rule) for k in hits(len(plots), rule.chance))
+    for i in drawn:
+        wake[i] = 1
+    return wake, drawn
+
+
+def _in_order(plots, later: list):
+    """plots, an ascending iterable, merged with the heap later, which may
+    grow while this runs; each plot once."""
+    last = -1
+    for i in plots:
+        while later and later[0] < i:
+            j = heappop(later)
+            if j > last:
+                last = j
+                yield j
+        if i > last:
+            last = i
+            yield i
+    while later:
+        j = heappop(later)
+        if j > last:
+            last = j
+            yield j
+
+
+def _tick_python(gs: GameState):
+    """The python engine, as a generator yielding every SLICE_PLOTS plots
+    (see GardenTick). Returns a flash message or None."""
+    flash = None
 
-        # ── Age advance (living plots) ────────────────────────
-        if state in LIVING_STATES:
-            p["age"] += 1
-
-        # ── Connectivity (adjacent living plots) ─────────────
-        connectivity = 0
-        for dx, dy in ((0, 1), (0, -1), (1, 0), (-1, 0)):
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < GARDEN_W and 0 <= ny < GARDEN_H:
-                if gs.garden[plot_idx(nx, ny)]["state"] in LIVING_STATES:
-                    connectivity += 1
-
-        # ── State machine transitions ─────────────────────────
-        if state == HYPHA:
-            if p["age"] >= 15 and connectivity >= 1 and moist > 0:
-                p["state"] = NETWORK
-            elif moist == 0 and random.random() < 0.15:
-                p["state"] = DECOMP
-
-        elif state == NETWORK:
-            if connectivity == 0:
-                p["state"] = HYPHA   # isolated — downgrade
-            elif p["age"] >= 50 and connectivity >= 2 and soil >= 2:
-                p["state"] = MATURE
-
-        elif state == MATURE:
-            # Check for adjacent fruiting plot (no adjacent F rule)
-            adjacent_f = False
-            for dx, dy in ((0, 1), (0, -1), (1, 0), (-1, 0)):
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < GARDEN_W and 0 <= ny < GARDEN_H:
-                    if gs.garden[plot_idx(nx, ny)]["state"] == FRUITING:
-                        adjacent_f = True
-                        break
-            if moist >= 3 and soil >= 3 and not adjacent_f:
-                if random.random() < 0.04:
-                    p["state"]    = FRUITING
-                    p["fruit_age"] = 0
-                    # Fruiting resource gain (fires once on entering F)
-                    gs.mycelium += 1
-                    if random.random() < 0.30:
-                        gs.water += 1
-                    if random.random() < 0.10:
-                        gs.power += 1
-                    if not flash:
-                        flash = random.choice(txt.NETWORK_FRUIT)
-
-        elif state == FRUITING:
-            p["fruit_age"] += 1
-            if p["fruit_age"] >= 6:
-                p["state"]    = MATURE
-                p["fruit_age"] = 0
+    # Work on the raw columns; state changes go through set_state
+    g        = gs.garden
+    states   = g.writable("state")   # so set_state never swaps it under us
+    moisture = g.writable("moisture")
+    soils    = g.writable("soil")
+    ages     = g.writable("age")
+    fruit    = g.writable("fruit_age")
+    columns  = {"age": ages, "fruit_age": fruit}
+
+    # Neighbour counts, kept current by set_state as plots change
+    near_living   = g.writable("near_living")
+    near_fruiting = g.writable("near_fruiting")
+
+    # Each plot's neighbours are nbrs[offsets[i]:offsets[i + 1]]
+    offsets, nbrs = g.topology.offsets, g.topology.index
+
+    weather  = gs.weather
+    climate  = moisture_field.WEATHER[weather]
+    roll     = random.random
+    by_state = rules.BY_STATE
+
+    # ── Moisture: weather ─────────────────────────────────────
+    before = bytes(states)   # the states moisture flow reads
+    moisture_field.weather(states, moisture, climate)
+
+    # ── Counters ──────────────────────────────────────────────
+    # For the whole garden at once, by the states the tick began with: a
+    # plot's own state is fixed until its visit
+    counts = g.counts
+    if any(counts[s] for s in range(len(Plot)) if rules.AGEING[s]):
+        _advance(ages, states.translate(_AGEING_BYTES))
+    if any(counts[s] for s in range(len(Plot)) if rules.RIPENING[s]):
+        _advance(fruit, states.translate(_RIPENING_BYTES))
+
+    # Only plots that can change are visited, and whatever is left of the
+    # tick never makes a difference to the rest until a neighbour changes
+    # state or enriches it: those neighbours still to come are visited too,
+    # unless asleep, whose one rule was drawn above.
+    wake, drawn = _awake(g, weather)
+    later: list = []
+
+    for k, i in enumerate(_in_order(compress(range(len(g)), wake), later), 1):
+        state = states[i]
+        moist = moisture[i]
+        nearby = nbrs[offsets[i]:offsets[i + 1]]
 
         # ── Decomposing: enrich adjacent soil ─────────────────
         if state == DECOMP:
-            for dx, dy in ((0, 1), (0, -1), (1, 0), (-1, 0)):
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < GARDEN_W and 0 <= ny < GARDEN_H:
-                    nb = gs.garden[plot_idx(nx, ny)]
-                    if nb["state"] in (HYPHA, NETWORK, MATURE):
-                        if random.random() < 0.15:
-                            nb["soil"] = min(5, nb["soil"] + 1)
-            if random.random() < 0.10:
-                p["state"] = EMPTY
-
-        # ── Moisture flow (N/M share moisture with dry neighbors) ──
-        if state in (NETWORK, MATURE) and moist >= 4:
-            for dx, dy in ((0, 1), (0, -1), (1, 0), (-1, 0)):
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < GARDEN_W and 0 <= ny < GARDEN_H:
-                    nb = gs.garden[plot_idx(nx, ny)]
-                    if nb["state"] in LIVING_STATES and nb["moisture"] <= 1:
-                        p["moisture"] -= 1
-                        nb["moisture"] = min(5, nb["moisture"] + 1)
-                        break  # one transfer per plot per tick
-
-        # ── Spontaneous competing growth on empty plots ────────
-        if state == EMPTY and random.random() < 0.008:
-            p["state"] = COMPETING
+            for n in nearby:
+                if IS_ENRICHABLE[states[n]]:
+                    if roll() < rules.ENRICH_CHANCE:
+                        soils[n] = min(5, soils[n] + 1)
+                        if n > i and not wake[n] and _ALWAYS_AWAKE[states[n]]:
+                            heappush(later, n)
+
+        # ── State machine transitions (engine/rules.py) ───────
+        if _ALWAYS_AWAKE[state]:
+            rule = rules.choose(by_state[state], roll, ages[i], fruit[i],
+                                moist, soils[i], near_living[i],
+                                near_fruiting[i], weather)
+        else:
+            rule = drawn.get(i)
+        if rule:
+            g.set_state(i, rule.target)
+            for n in nearby:
+                if n > i and not wake[n] and _ALWAYS_AWAKE[states[n]]:
+                    heappush(later, n)
+            if rule.reset:
+                columns[rule.reset][i] = 0
+            if rule.harvest:
+                for (name, _), n in zip(rules.HARVEST, rules.reap(roll)):
+                    setattr(gs, name, getattr(gs, name) + n)
+                if not flash:
+                    flash = random.choice(txt.NETWORK_FRUIT)
+
+        if not k % SLICE_PLOTS:
+            yield
+
+    # ── Moisture: flow (N/M share moisture with drier neighbours) ─
+    moisture_field.flow(moisture, moisture_field.givers(before, moisture, climate),
+                        g.neighbours, lambda j: IS_LIVING[before[j]], climate)
 
     return flash
 
@@ -244,15 +562,24 @@ def garden_tick(gs: GameState) -> str | None:
 # ── Network summary ───────────────────────────────────────────
 
 def network_summary(gs: GameState) -> dict:
-    hypha     = sum(1 for p in gs.garden if p["state"] == HYPHA)
-    connected = sum(1 for p in gs.garden if p["state"] in (NETWORK, MATURE, FRUITING))
-    mature    = sum(1 for p in gs.garden if p["state"] in (MATURE, FRUITING))
-    fruiting  = sum(1 for p in gs.garden if p["state"] == FRUITING)
-    competing = sum(1 for p in gs.garden if p["state"] == COMPETING)
+    counts = state_counts(gs, "garden")
+    hypha     = counts[HYPHA]
+    connected = counts[NETWORK] + counts[MATURE] + counts[FRUITING]
+    mature    = counts[MATURE] + counts[FRUITING]
+    fruiting  = counts[FRUITING]
+    competing = counts[COMPETING]
     return {
         "hypha":     hypha,
         "connected": connected,
         "mature":    mature,
         "fruiting":  fruiting,
         "competing": competing,
+        "largest":   largest_network(gs),
     }
+
+
+def largest_network(gs: GameState) -> int:
+    """Living plots in the garden's largest connected network."""
+    if not is_loaded(gs, "garden") and "network" in gs.summaries:
+        return gs.summaries["network"]
+    return gs.garden.network().largest()
@@ -0,0 +1,267 @@
+# engine/gardenbuf.py
+# Double-buffered garden_tick engine (see ENGINE in engine/garden.py). Every
+# plot reads the garden as it stood when the tick began and writes into
+# fresh columns, so the outcome does not depend on the order plots are
+# visited in. That lets the grid be cut into bands of BAND_ROWS rows ticked
+# independently, across a process pool when WORKERS is over 1.
+#
+# Plots change state by the table in engine/rules.py, and moisture by the
+# stages in engine/moisture.py. The two effects that reach other plots are
+# collected from the bands and settled afterwards:
+#   - a decomposing plot's enrichment rolls raise the soil of neighbours
+#     that were H, N or M when the tick began
+#   - moisture flows from N and M plots to drier living neighbours
+#
+# Each band draws from its own random.Random, seeded from the tick's seed
+# and the band's index, so a run repeats whatever the number of workers.
+
+import os
+import random
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+
+from engine.chance import binomial, hits
+from engine import moisture as moisture_field
+from engine import rules
+from engine.codes import Plot, lookup
+from engine.sparsegrid import CHUNK
+from engine.topology import links
+from data import text as txt
+
+# Rows per band. Bands are the unit of work handed to the pool.
+BAND_ROWS = 16
+
+# Processes to tick bands on; 0 or 1 ticks them in this process
+WORKERS = int(os.environ.get("QUIETCURRENT_WORKERS", 0))
+
+_E, _H, _N, _M, _F, _X, _W = (int(p) for p in Plot)
+
+_LIVING     = lookup(Plot, (Plot.HYPHA, Plot.NETWORK, Plot.MATURE, Plot.FRUITING))
+_ENRICHABLE = lookup(Plot, (Plot.HYPHA, Plot.NETWORK, Plot.MATURE))
+
+_pool = None
+
+
+def _map(fn, jobs: list):
+    global _pool
+    if WORKERS <= 1 or len(jobs) < 2:
+        return map(fn, jobs)
+    if _pool is None:
+        _pool = ProcessPoolExecutor(WORKERS)
+    return _pool.map(fn, jobs)
+
+
+def _band(job: tuple) -> tuple:
+    """Tick the plots start..start+len(state) from the tick's starting
+    columns. adjacency is the band's (offsets, nbrs), its plot j next to
+    nbrs[offsets[j]:offsets[j + 1]], or None if no plot in it is
+    decomposing, the only ones that look. Returns the band's new moisture
+    (after the weather), age and fruit_age, its state changes as (plot,
+    state) pairs, and what is left for tick() to settle: soil enrichment
+    targets, the number of harvests and what they yielded (in rules.HARVEST
+    order)."""
+    (start, seed, weather, state, moist, soil, age, fruit,
+     near_living, near_fruiting, adjacency) = job
+    offsets, nbrs = adjacency or ((), ())
+    rng = random.Random(seed)
+    roll = rng.random
+    moist = array("B", moist)
+    age   = array("I", age)
+    fruit = array("H", fruit)
+    columns = {"age": age, "fruit_age": fruit}
+
+    changes, enrich = [], []
+    harvests, gains = 0, [0] * len(rules.HARVEST)
+
+    # ── Moisture: weather ─────────────────────────────────────
+    moisture_field.weather(state, moist, moisture_field.WEATHER[weather], rng)
+
+    for j, s in enumerate(state):
+        i = start + j
+        m = moist[j]
+
+        # ── Counters ──────────────────────────────────────────
+        if rules.AGEING[s]:
+            age[j] += 1
+        if rules.RIPENING[s]:
+            fruit[j] += 1
+
+        # ── Decomposing: enrich adjacent soil (settled in tick) ─
+        if s == _X:
+            for t in nbrs[offsets[j]:offsets[j + 1]]:
+                if roll() < rules.ENRICH_CHANCE:
+                    enrich.append(t)
+
+        # ── State machine transitions (engine/rules.py) ───────
+        rule = rules.choose(rules.BY_STATE[s], roll, age[j], fruit[j], m,
+                            soil[j], near_living[j], near_fruiting[j], weather)
+        if rule:
+            changes.append((i, rule.target))
+            if rule.reset:
+                columns[rule.reset][j] = 0
+            if rule.harvest:
+                harvests += 1
+                gains = [a + b for a, b in zip(gains, rules.reap(roll))]
+
+    return (moist, age, fruit, changes, enrich, harvests, gains)
+
+
+def tick(gs):
+    """garden_tick from a frozen copy of the garden, as a generator
+    yielding after each band (see engine.garden.GardenTick). Returns a
+    flash message or None."""
+    g = gs.garden
+    w = g.width or 1
+    n = len(g)
+    if not n:
+        return None
+    topology = g.topology
+
+    seed    = random.getrandbits(64)
+    climate = moisture_field.WEATHER[gs.weather]
+
+    # The previous buffer: every band reads only this
+    prev = bytes(g.state)
+    step = BAND_ROWS * w
+    jobs = [(start, (seed << 20) | k, gs.weather,
+             prev[start:start + step],
+             g.moisture[start:start + step], g.soil[start:start + step],
+             g.age[start:start + step], g.fruit_age[start:start + step],
+             g.near_living[start:start + step],
+             g.near_fruiting[start:start + step],
+             topology.band(start, min(n, start + step)))
+            for k, start in enumerate(range(0, n, step))]
+
+    # The next buffer, filled band by band
+    moisture = g.writable("moisture")
+    soils    = g.writable("soil")
+    ages     = g.writable("age")
+    fruit    = g.writable("fruit_age")
+    changes, enrich = [], []
+    harvests = 0
+    for job, out in zip(jobs, _map(_band, jobs)):
+        start = job[0]
+        stop  = start + len(out[0])
+        moisture[start:stop] = out[0]
+        ages[start:stop]     = out[1]
+        fruit[start:stop]    = out[2]
+        changes  += out[3]
+        enrich   += out[4]
+        harvests += _reap(gs, out)
+        yield
+
+    # ── Decomposing: enrich adjacent soil ─────────────────────
+    for t in enrich:
+        if _ENRICHABLE[prev[t]]:
+            soils[t] = min(5, soils[t] + 1)
+
+    # ── Moisture: flow (N/M share moisture with drier neighbours) ─
+    moisture_field.flow(moisture, moisture_field.givers(prev, moisture, climate),
+                        g.neighbours, lambda t: _LIVING[prev[t]], climate)
+
+    for i, state in changes:
+        g.set_state(i, state)
+
+    if harvests:
+        return random.choice(txt.NETWORK_FRUIT)
+    return None
+
+
+def _reap(gs, out: tuple) -> int:
+    """Add what a band's harvests yielded to gs; returns how many there
+    were."""
+    for (name, _), n in zip(rules.HARVEST, out[6]):
+        setattr(gs, name, getattr(gs, name) + n)
+    return out[5]
+
+
+# ── Sparse gardens ────────────────────────────────────────────
+
+def tick_sparse(gs):
+    """tick() for an engine.sparsegrid.SparseGarden. Only chunks holding
+    living, decomposing or wet plots are ticked, a chunk row per band; the
+    empty plots elsewhere sprout from draws across all of them at once."""
+    g = gs.garden
+    w = g.width
+    side = CHUNK
+
+    seed    = random.getrandbits(64)
+    climate = moisture_field.WEATHER[gs.weather]
+
+    busy = g.busy()
+    prev = {key: bytes(g.chunks[key].state) for key in busy}
+    jobs, rows = [], []
+    for key in busy:
+        c, origin = g.chunks[key], g.origin(key)
+        for r in range(side):
+            a, b = r * side, (r + 1) * side
+            start, row = origin + r * w, prev[key][a:b]
+            # Neighbours are only walked by decomposing plots
+            adjacency = (links(g.neighbours, start, start + side)
+                         if _X in row else None)
+            jobs.append((start, (seed << 20) | len(jobs),
+                         gs.weather, row,
+                         c.moisture[a:b], c.soil[a:b], c.age[a:b],
+                         c.fruit_age[a:b], c.near_living[a:b],
+                         c.near_fruiting[a:b], adjacency))
+            rows.append((c, a, b))
+
+    changes, enrich = [], []
+    harvests = 0
+    for (c, a, b), out in zip(rows, _map(_band, jobs)):
+        c.writable("moisture")[a:b]  = out[0]
+        c.writable("age")[a:b]       = out[1]
+        c.writable("fruit_age")[a:b] = out[2]
+        changes  += out[3]
+        enrich   += out[4]
+        harvests += _reap(gs, out)
+        yield
+
+    def before(i: int) -> int:
+        # A plot's state as the tick began; ground never allocated is
+        # never living, so reads as empty
+        key, j = g.locate(i)
+        if key in prev:
+            return prev[key][j]
+        return g.chunks[key].state[j] if key in g.chunks else _E
+
+    # ── Decomposing: enrich adjacent soil ─────────────────────
+    for t in enrich:
+        if _ENRICHABLE[before(t)]:
+            key, j = g.locate(t)
+            soil = g.chunks[key].writable("soil")
+            soil[j] = min(5, soil[j] + 1)
+
+    # ── Moisture: flow (N/M share moisture with drier neighbours) ─
+    # Givers and receivers are living, so all are in busy chunks
+    givers, receivers = [], set()
+    for key in busy:
+        c, origin = g.chunks[key], g.origin(key)
+        plot = lambda j: origin + (j // side) * w + j % side
+        givers += map(plot, moisture_field.givers(prev[key], c.moisture, climate))
+        receivers.update(map(plot, moisture_field.receivers(prev[key], c.moisture, climate)))
+    moisture_field.flow(g.moisture, givers, g.neighbours,
+                        receivers.__contains__, climate)
+
+    # ── Spontaneous competing growth on empty plots ────────────
+    # Busy chunks rolled their own; chunks at rest draw together. Ground
+    # never allocated holds only E and W plots, so takes the table's E → W
+    # rule as the only one it has.
+    chance = rules.DRAWN[_E].chance if rules.DRAWN[_E] else 0
+    resting = [key for key in g.chunks if key not in prev]
+    empty = [g.chunks[key].counts[_E] for key in resting]
+    if empty:
+        starts = list(accumulate(empty, initial=0))
+        for h in hits(starts[-1], chance):
+            k = bisect_right(starts, h) - 1
+            changes.append((g.empty_plots(resting[k])[h - starts[k]], _W))
+    g.grow_wild(binomial(g.wild_plots - g.wild_competing, chance))
+
+    for i, state in changes:
+        g.set_state(i, state)
+
+    if harvests:
+        return random.choice(txt.NETWORK_FRUIT)
+    return None
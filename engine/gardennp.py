@@ -0,0 +1,252 @@
+# engine/gardennp.py
+# NumPy garden_tick engine (see ENGINE in engine/garden.py). Runs the same
+# rules as the python engine over whole grids at once: neighbour counts come
+# from shifted copies of the grid, random numbers are drawn in bulk, and each
+# transition is a masked assignment.
+#
+# Every plot reads the states the tick started with, where the python engine
+# lets a plot see the neighbours before it that already changed this tick,
+# so the two engines agree on the rules but not tick for tick.
+#
+# numpy is optional: AVAILABLE is False without it, and garden_tick keeps
+# to the python engine.
+
+import random
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from engine import moisture as moisture_field
+from engine import rules
+from engine.codes import Plot
+from data import text as txt
+
+AVAILABLE = np is not None
+
+# Plot codes as plain ints: numpy compares against an IntEnum member far
+# more slowly than against an int
+_E, _H, _N, _M, _F, _X, _W = (int(p) for p in Plot)
+
+# Neighbour offsets as (dx, dy), in the python engine's order
+_DIRS = ((0, 1), (0, -1), (1, 0), (-1, 0))
+
+
+def _shift(a, dx: int, dy: int):
+    """out[y, x] = a[y + dy, x + dx], zero where that is off the grid."""
+    h, w = a.shape
+    out = np.zeros_like(a)
+    out[max(0, -dy):h - max(0, dy), max(0, -dx):w - max(0, dx)] = \
+        a[max(0, dy):h - max(0, -dy), max(0, dx):w - max(0, -dx)]
+    return out
+
+
+def _count_neighbours(mask):
+    """Number of the four neighbours of each plot where mask is set."""
+    m = mask.view(np.uint8)
+    out = np.zeros_like(m)
+    out[:-1]    += m[1:]
+    out[1:]     += m[:-1]
+    out[:, :-1] += m[:, 1:]
+    out[:, 1:]  += m[:, :-1]
+    return out
+
+
+def _column(g, name: str, shape):
+    """A numpy view of a Garden number column, written through in place."""
+    col = g.writable(name)
+    return np.frombuffer(col, dtype=col.typecode).reshape(shape)
+
+
+def _bytes(a):
+    """A byte buffer over a contiguous uint8 array, for writing into a
+    bytearray column without a copy."""
+    return a.data.cast("B")
+
+
+def _chance(p: float) -> int:
+    """Threshold a uint16 roll falls below with probability p."""
+    return round(p * 65536)
+
+
+def _step(source: int, target: int):
+    """What adding to a source-state byte turns it into target (mod 256)."""
+    return np.uint8((target - source) % 256)
+
+
+def _counts(col, shape):
+    """A read-only numpy view of a neighbour count column."""
+    return np.frombuffer(col, dtype=np.uint8).reshape(shape)
+
+
+def _in(s, table):
+    """Where the states s are members of a lookup() table. A comparison
+    per member beats indexing the table by s."""
+    out = np.zeros(s.shape, dtype=bool)
+    for code, member in enumerate(table):
+        if member:
+            out |= s == code
+    return out
+
+
+# A rule guarding nothing: _guard skips fields left at these values
+_FREE = rules.Transition(Plot.EMPTY, Plot.EMPTY)
+
+# Guard fields: lower bounds, and (low, high) ranges
+_MINIMA = ("age", "fruit_age", "soil")
+_RANGES = ("moisture", "near_living", "near_fruiting")
+
+
+def _guard(t, cols):
+    """Where rule t's guard holds on the plot columns cols, leaving out
+    its chance and weather."""
+    ok = True
+    for name in _MINIMA:
+        if getattr(t, name) != getattr(_FREE, name):
+            ok = ok & (cols[name] >= getattr(t, name))
+    for name in _RANGES:
+        if getattr(t, name) != getattr(_FREE, name):
+            lo, hi = getattr(t, name)
+            ok = ok & (cols[name] >= lo) & (cols[name] <= hi)
+    return ok
+
+
+def _reap(gs, bits, n: int) -> None:
+    """Add what n harvests yield (rules.HARVEST) to gs."""
+    rolled = [chance for _, chance in rules.HARVEST if chance < 1]
+    gains = iter(np.random.Generator(bits).random((len(rolled), n)))
+    for name, chance in rules.HARVEST:
+        if chance < 1:
+            n_got = int(np.count_nonzero(next(gains) < chance))
+        else:
+            n_got = n
+        setattr(gs, name, getattr(gs, name) + n_got)
+
+
+# One generator, reseeded per tick
+_BITS = np.random.PCG64() if AVAILABLE else None
+
+
+# Masked assignment is slow on scattered masks, so transitions are applied
+# by adding mask * _step(...) to the state bytes: each plot is in one state,
+# so at most one transition's mask is set for it.
+
+def tick(gs) -> str | None:
+    """garden_tick over numpy arrays. Returns a flash message or None."""
+    g = gs.garden
+    w = g.width or 1
+    h = len(g) // w
+    if not h:
+        return None
+    shape = (h, w)
+
+    # Reseeded from random each tick, so seeding random (as
+    # engine.fork.preview does) still makes a run repeatable
+    bits = _BITS
+    bits.state = {"bit_generator": "PCG64",
+                  "state": {"state": random.getrandbits(128),
+                            "inc": random.getrandbits(128) | 1},
+                  "has_uint32": 0, "uinteger": 0}
+
+    def rolls():
+        # Four uint16 rolls from each raw 64-bit draw
+        return bits.random_raw(-(-h * w // 4)).view(np.uint16)[:h * w].reshape(shape)
+
+    s     = np.frombuffer(g.state, dtype=np.uint8).reshape(shape).copy()
+    moist = _column(g, "moisture", shape)
+    soil  = _column(g, "soil", shape)
+    age   = _column(g, "age", shape)
+    fruit = _column(g, "fruit_age", shape)
+
+    living  = (s >= _H) & (s <= _F)
+    climate = moisture_field.WEATHER[gs.weather]
+
+    # ── Moisture: weather ─────────────────────────────────────
+    if climate.evaporation:
+        # Floored so the subtraction stops at 0
+        np.maximum(moist, climate.evaporation, out=moist)
+        moist -= climate.evaporation
+    if climate.infiltration:
+        moist += (living & (moist < moisture_field.MAX)
+                  & (rolls() < _chance(climate.infiltration)))
+
+    # ── Counters ──────────────────────────────────────────────
+    age   += _in(s, rules.AGEING)
+    fruit += _in(s, rules.RIPENING)
+
+    # ── State machine transitions (engine/rules.py) ───────────
+    # Each state's rules are tried in table order, a plot taking the first
+    # that holds. A state's first chance rule reads the first roll array,
+    # its second the next, and so on: a plot is in one state, so arrays are
+    # shared across states
+    cols = {"age": age, "fruit_age": fruit, "moisture": moist, "soil": soil,
+            "near_living":   _counts(g.near_living, shape),
+            "near_fruiting": _counts(g.near_fruiting, shape)}
+    draws = []
+    new = s.copy()
+    flash = None
+    for source, table in enumerate(rules.BY_STATE):
+        if not table:
+            continue
+        left = s == source
+        if not left.any():
+            continue
+        rank = 0
+        for t in table:
+            if t.weather and gs.weather not in t.weather:
+                continue
+            fire = left & _guard(t, cols)
+            if t.chance < 1:
+                if rank == len(draws):
+                    draws.append(rolls())
+                fire &= draws[rank] < _chance(t.chance)
+                rank += 1
+            left &= ~fire
+            n_fire = int(np.count_nonzero(fire))
+            if not n_fire:
+                continue
+            new += fire * _step(source, t.target)
+            if t.reset:
+                cols[t.reset] *= ~fire
+            if t.harvest:
+                _reap(gs, bits, n_fire)
+                flash = random.choice(txt.NETWORK_FRUIT)
+
+    # ── Decomposing: enrich adjacent soil ─────────────────────
+    decomposing = np.flatnonzero(s == _X)
+    if decomposing.size:
+        ys, xs = np.divmod(decomposing, w)
+        hits = (np.random.Generator(bits).random((len(_DIRS), decomposing.size))
+                < rules.ENRICH_CHANCE)
+        added = np.zeros(h * w, dtype=np.uint8)
+        for (dx, dy), hit in zip(_DIRS, hits):
+            ny, nx = ys[hit] + dy, xs[hit] + dx
+            inside = (ny >= 0) & (ny < h) & (nx >= 0) & (nx < w)
+            added[ny[inside] * w + nx[inside]] += 1   # one X per target per direction
+        added = added.reshape(shape) * ((s == _H) | (s == _N) | (s == _M))
+        soil += added
+        np.minimum(soil, 5, out=soil)
+
+    # ── Moisture: flow (N/M share moisture with drier neighbours) ─
+    # A direction at a time, in topology order, each plot giving from what
+    # it has left; receivers are read as the weather left them
+    giving = ((s == _N) | (s == _M)) & (moist >= climate.give_at)
+    if giving.any():
+        left  = moist.astype(np.int16)
+        given = np.zeros(shape, dtype=np.uint8)
+        taken = np.zeros(shape, dtype=np.uint8)
+        taking = living & (moist <= climate.take_at)
+        for dx, dy in _DIRS:
+            give = giving & _shift(taking, dx, dy) & (given < climate.spread)
+            left  -= give
+            given += give
+            taken += _shift(give, -dx, -dy)
+        np.minimum(left + taken, moisture_field.MAX, out=left)
+        moist[:] = left
+
+    # Neighbour counts for the new states, cheaper here than in recount()
+    counts = (_count_neighbours((new >= _H) & (new <= _F)),
+              _count_neighbours(new == _F))
+    g.set_states(_bytes(new), tuple(_bytes(c) for c in counts))
+    return flash
@@ -0,0 +1,229 @@
+# engine/history.py
+# Optional run history in SQLite. Every save is recorded: a compressed full
+# snapshot every SNAPSHOT_EVERY actions, the journal's deltas in between.
+# Any recorded action can be rebuilt from one snapshot plus at most
+# MAX_DELTAS deltas, however long the history gets.
+#
+# Off unless QUIETCURRENT_HISTORY is set. Inspect or rewind a run with:
+#   python -m engine.history list
+#   python -m engine.history show ACTION
+#   python -m engine.history export ACTION out.json
+#   python -m engine.history rewind ACTION
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+import zlib
+
+from engine.codec import encode_state, decode_state
+from engine.journal import apply_record
+from engine.state import SAVE_DIR, GameState, _dict_to_state
+
+HISTORY_FILE = os.path.join(SAVE_DIR, "history.sqlite3")
+ENABLED      = bool(os.environ.get("QUIETCURRENT_HISTORY"))
+
+SNAPSHOT_EVERY = 50    # actions between full snapshots
+MAX_DELTAS     = 100   # deltas between full snapshots, whatever the actions
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id        INTEGER PRIMARY KEY,
+    base      INTEGER NOT NULL,     -- id of the snapshot this builds on
+    action    INTEGER NOT NULL,     -- action_count when saved
+    last_seen REAL    NOT NULL,     -- wall clock when saved
+    snapshot  INTEGER NOT NULL,     -- 1: data is a full state, 0: a delta
+    data      BLOB    NOT NULL      -- zlib(codec bytes) or zlib(delta JSON)
+);
+CREATE INDEX IF NOT EXISTS entries_action ON entries(action, id);
+CREATE INDEX IF NOT EXISTS entries_seen   ON entries(last_seen, id);
+"""
+
+
+class History:
+    """Append-only store of saved states, keyed by action and time."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._db: sqlite3.Connection | None = None
+        self._base    = 0   # id of the current snapshot
+        self._base_action = 0
+        self._deltas  = 0   # deltas written since that snapshot
+        self.error: sqlite3.Error | None = None   # last failure, until taken
+        self._lock = threading.Lock()
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            # Written from the autosave thread, read from the CLI
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.executescript(_SCHEMA)
+        return self._db
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    # ── Recording ──
+
+    def record(self, rec: dict, d: dict) -> None:
+        """Record a save: the journal's delta record and the full state it
+        produced. Neither is kept."""
+        try:
+            self._record(rec, d)
+        except sqlite3.Error as e:
+            with self._lock:
+                self.error = e
+
+    def take_error(self) -> sqlite3.Error | None:
+        """The last record failure not yet reported, clearing it."""
+        with self._lock:
+            error, self.error = self.error, None
+        return error
+
+    def _record(self, rec: dict, d: dict) -> None:
+        db = self._conn()
+        action = d.get("action_count", 0)
+        seen   = d.get("last_seen", 0.0)
+
+        if (not self._base
+                or action - self._base_action >= SNAPSHOT_EVERY
+                or self._deltas >= MAX_DELTAS):
+            data = zlib.compress(encode_state(d))
+            with db:
+                cur = db.execute(
+                    "INSERT INTO entries (base, action, last_seen, snapshot, data) "
+                    "VALUES (0, ?, ?, 1, ?)", (action, seen, data))
+                self._base = cur.lastrowid
+                db.execute("UPDATE entries SET base = id WHERE id = ?", (self._base,))
+            self._base_action = action
+            self._deltas = 0
+        else:
+            rec = {k: v for k, v in rec.items() if k != "n"}
+            if not rec:
+                return
+            data = zlib.compress(json.dumps(rec, separators=(",", ":")).encode("utf-8"))
+            with db:
+                db.execute(
+                    "INSERT INTO entries (base, action, last_seen, snapshot, data) "
+                    "VALUES (?, ?, ?, 0, ?)", (self._base, action, seen, data))
+            self._deltas += 1
+
+    # ── Rebuilding ──
+
+    def _rebuild(self, row: tuple | None) -> tuple[int, dict] | None:
+        if row is None:
+            return None
+        entry_id, base = row
+        db = self._conn()
+        (snap,) = db.execute("SELECT data FROM entries WHERE id = ?", (base,)).fetchone()
+        d = decode_state(zlib.decompress(snap))
+        for (data,) in db.execute(
+                "SELECT data FROM entries WHERE base = ? AND id > ? AND id <= ? "
+                "ORDER BY id", (base, base, entry_id)):
+            apply_record(d, json.loads(zlib.decompress(data)))
+        return entry_id, d
+
+    def state_at(self, action: int) -> dict | None:
+        """The last state saved at or before the given action count."""
+        row = self._conn().execute(
+            "SELECT id, base FROM entries WHERE action <= ? "
+            "ORDER BY action DESC, id DESC LIMIT 1", (action,)).fetchone()
+        rebuilt = self._rebuild(row)
+        return rebuilt[1] if rebuilt else None
+
+    def state_at_time(self, when: float) -> dict | None:
+        """The last state saved at or before a wall-clock time."""
+        row = self._conn().execute(
+            "SELECT id, base FROM entries WHERE last_seen <= ? "
+            "ORDER BY last_seen DESC, id DESC LIMIT 1", (when,)).fetchone()
+        rebuilt = self._rebuild(row)
+        return rebuilt[1] if rebuilt else None
+
+    def game_at(self, action: int) -> GameState | None:
+        d = self.state_at(action)
+        return _dict_to_state(d) if d is not None else None
+
+    def truncate_after(self, action: int) -> None:
+        """Forget everything recorded after the given action."""
+        db = self._conn()
+        row = db.execute(
+            "SELECT id FROM entries WHERE action <= ? "
+            "ORDER BY action DESC, id DESC LIMIT 1", (action,)).fetchone()
+        with db:
+            db.execute("DELETE FROM entries WHERE id > ?", (row[0] if row else 0,))
+        self._base = 0   # next record starts a fresh snapshot
+
+    def summary(self) -> list[tuple]:
+        return self._conn().execute(
+            "SELECT snapshot, COUNT(*), MIN(action), MAX(action), "
+            "MIN(last_seen), MAX(last_seen), SUM(LENGTH(data)) "
+            "FROM entries GROUP BY snapshot ORDER BY snapshot DESC").fetchall()
+
+
+HISTORY = History(HISTORY_FILE)
+
+
+# ── Tool ──────────────────────────────────────────────────────
+
+def _need_state(args: list) -> dict:
+    if not args:
+        sys.exit("an action number is needed.")
+    d = HISTORY.state_at(int(args[0]))
+    if d is None:
+        sys.exit(f"nothing recorded at or before action {args[0]}.")
+    return d
+
+
+def _list(args: list) -> None:
+    import time
+    for snapshot, count, lo, hi, t0, t1, size in HISTORY.summary():
+        kind = "snapshots" if snapshot else "deltas"
+        print(f"{count:>6} {kind:<9} actions {lo}–{hi}  "
+              f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(t0))} → "
+              f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(t1))}  "
+              f"{size} bytes")
+
+
+def _show(args: list) -> None:
+    d = _need_state(args)
+    keys = ("action_count", "weather", "panel_state", "panel_efficiency",
+            "power", "water", "spores", "scrap", "mycelium")
+    for k in keys:
+        print(f"{k:<18} {d.get(k)}")
+    states = "".join(p["state"] for p in d.get("garden", []))
+    if states:
+        print(f"{'garden':<18} " + "  ".join(
+            f"{s}:{states.count(s)}" for s in sorted(set(states))))
+    print(f"{'residents':<18} " + ", ".join(r["name"] for r in d.get("residents", [])))
+
+
+def _export(args: list) -> None:
+    text = json.dumps(_need_state(args), indent=2) + "\n"
+    if len(args) > 1:
+        with open(args[1], "w") as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+
+
+def _rewind(args: list) -> None:
+    from engine.journal import JOURNAL
+    d = _need_state(args)
+    JOURNAL.load()
+    JOURNAL.compact(d)
+    HISTORY.truncate_after(d.get("action_count", 0))
+    print(f"rewound to action {d.get('action_count', 0)}.")
+
+
+def main(argv: list) -> None:
+    commands = {"list": _list, "show": _show, "export": _export, "rewind": _rewind}
+    if not argv or argv[0] not in commands:
+        sys.exit("usage: python -m engine.history list|show|export|rewind [ACTION]")
+    commands[argv[0]](argv[1:])
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
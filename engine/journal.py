@@ -0,0 +1,424 @@
+# engine/journal.py
+# Append-only action journal. Each save appends a small delta record;
+# every so often the journal is folded into a sharded binary snapshot.
+#
+# The snapshot is one file per shard (see SHARDS in engine/state.py) plus
+# manifest.json naming the current file of each. Compaction writes only the
+# shards that changed since the last one, under a new generation number,
+# then swaps the manifest in atomically — so a load always sees one
+# consistent set of shards.
+
+import json
+import os
+import re
+import threading
+
+from engine.codec import CodecError, encode_state, decode_state
+from engine.state import (SAVE_DIR, SAVE_FILE, SNAPSHOT_FILE, SHARDS,
+                          SHARD_FIELDS, LAZY_SHARDS, shard_of)
+
+# Fold the journal into a snapshot after this many records or bytes
+COMPACT_RECORDS = 200
+COMPACT_BYTES   = 64 * 1024
+
+MANIFEST_FORMAT = 1
+_SHARD_NAME = re.compile(r"^(%s)\.\d+\.bin$" % "|".join(SHARDS))
+
+_MISSING = object()
+
+
+# ── Deltas ────────────────────────────────────────────────────
+# A record looks like:
+#   {"n": 12, "set": {"power": 4, ...}, "patch": {"garden": {"17": {"state": "N"}}}}
+# "set" replaces top-level values wholesale. "patch" updates elements of
+# equal-length lists in place — field by field for dict elements
+# (garden plots, flowers, residents), whole element otherwise (explore_map).
+# "del" drops core keys a migration renamed away.
+
+def _diff_list(old: list, new: list) -> dict | None:
+    """Element-wise patch turning old into new, or None if the shapes differ."""
+    patch = {}
+    for i, (ov, nv) in enumerate(zip(old, new)):
+        if ov == nv:
+            continue
+        if isinstance(ov, dict) and isinstance(nv, dict):
+            if ov.keys() != nv.keys():
+                return None
+            patch[str(i)] = {k: v for k, v in nv.items() if ov[k] != v}
+        else:
+            patch[str(i)] = nv
+    return patch
+
+
+def diff_state(old: dict, new: dict) -> dict:
+    """Return a delta record (without sequence number) from old to new."""
+    sets: dict = {}
+    patches: dict = {}
+    for k, v in new.items():
+        ov = old.get(k, _MISSING)
+        if ov == v:
+            continue
+        if (isinstance(v, list) and isinstance(ov, list)
+                and len(v) == len(ov)):
+            patch = _diff_list(ov, v)
+            if patch is not None:
+                patches[k] = patch
+                continue
+        sets[k] = v
+    # Saves may leave out clean shards, so only core keys can go missing
+    dels = [k for k in old if k not in new and shard_of(k) == "core"]
+    rec: dict = {}
+    if sets:
+        rec["set"] = sets
+    if patches:
+        rec["patch"] = patches
+    if dels:
+        rec["del"] = dels
+    return rec
+
+
+def apply_record(d: dict, rec: dict) -> None:
+    """Apply a delta record to a state dict in place."""
+    for k, v in rec.get("set", {}).items():
+        d[k] = v
+    for k, patch in rec.get("patch", {}).items():
+        target = d[k]
+        for idx, v in patch.items():
+            i = int(idx)
+            if isinstance(target[i], dict) and isinstance(v, dict):
+                target[i].update(v)
+            else:
+                target[i] = v
+    for k in rec.get("del", ()):
+        d.pop(k, None)
+
+
+def _parse(line: str) -> dict | None:
+    """A journal line as a delta record, or None if it isn't one."""
+    try:
+        rec = json.loads(line)
+    except ValueError:
+        return None
+    if (not isinstance(rec, dict) or type(rec.get("n")) is not int
+            or not isinstance(rec.get("set", {}), dict)
+            or not isinstance(rec.get("patch", {}), dict)
+            or not all(isinstance(p, dict) for p in rec.get("patch", {}).values())
+            or not isinstance(rec.get("del", []), list)):
+        return None
+    return rec
+
+
+# Raised by apply_record for a record that doesn't fit the state
+_MISFIT = (KeyError, IndexError, TypeError, ValueError)
+
+
+# ── Files ─────────────────────────────────────────────────────
+
+def _write_atomic(path: str, data: bytes) -> None:
+    """Write to a temp file, fsync, then rename over path. A crash leaves
+    either the old file or the new one, never a truncated mix."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+# ── Journal ───────────────────────────────────────────────────
+
+class Journal:
+    """Sharded snapshot files plus an append-only log of deltas since they
+    were written.
+
+    The journal keeps a shadow copy of the whole saved state, so a save may
+    pass only the shards that changed and each write only has to cover what
+    changed. Records carry a sequence number; the manifest remembers the last
+    one folded into the snapshot, so a crash between writing the manifest
+    and truncating the log never replays stale records.
+
+    A lazy load leaves the LAZY_SHARDS files unread; their journal records
+    are held back per shard and replayed when a field is first asked for.
+    The game reads those on its own thread while the autosave thread
+    writes, so everything runs under one lock."""
+
+    def __init__(self, directory: str,
+                 legacy_paths: tuple[str, ...] = ()) -> None:
+        self.directory     = directory
+        self.manifest_path = os.path.join(directory, "manifest.json")
+        self.journal_path  = os.path.join(directory, "journal.jsonl")
+        self.legacy_paths  = legacy_paths   # single-file saves, newest first
+        self._shadow: dict | None = None
+        self._shards: dict = {}       # shard → file name, as in the manifest
+        self._unflushed: set = set()  # shards changed since their file was written
+        self._unread: dict = {}       # lazy shard → file name, not decoded yet
+        self._held: dict = {}         # lazy shard → records waiting on it
+        self._lock    = threading.RLock()
+        self._gen     = 0
+        self._seq     = 0
+        self._records = 0
+        self._bytes   = 0
+        self._rewrite = False
+
+    def state(self) -> dict | None:
+        """The full saved state as of the last record. Do not mutate."""
+        with self._lock:
+            for shard in list(self._unread):
+                self._read_shard(shard)
+            return self._shadow
+
+    def lazy_fields(self) -> list:
+        """Fields left on disk by the last load(lazy=True)."""
+        return [f for shard in self._unread for f in SHARD_FIELDS[shard]]
+
+    def field(self, name: str):
+        """A copy of one saved field, reading its shard if need be. None if
+        the save doesn't have it or its shard can't be read."""
+        with self._lock:
+            self._read_shard(shard_of(name))
+            if self._shadow is None or name not in self._shadow:
+                return None
+            return json.loads(json.dumps(self._shadow[name]))
+
+    def _read_shard(self, shard: str) -> None:
+        name = self._unread.pop(shard, None)
+        if name is None:
+            return
+        held = self._held.pop(shard, ())
+        try:
+            with open(os.path.join(self.directory, name), "rb") as f:
+                part = decode_state(f.read())
+        except (OSError, CodecError):
+            return   # unreadable: its fields fall back to their defaults
+        for rec in held:
+            try:
+                apply_record(part, rec)
+            except _MISFIT:
+                self._rewrite = True   # damaged: the rest is dropped, as on load
+                break
+        self._shadow.update(part)
+
+    def _merge(self, d: dict) -> dict:
+        """Fold a (possibly partial) state into the shadow; return the delta."""
+        if self._shadow is None:
+            self._shadow = json.loads(json.dumps(d))
+            self._unflushed = {shard_of(k) for k in d} | {"core"}
+            return {}
+        rec = diff_state(self._shadow, d)
+        # Round-trip so the shadow never aliases live game lists
+        apply_record(self._shadow, json.loads(json.dumps(rec)))
+        self._unflushed |= _touched(rec)
+        return rec
+
+    # ── Writing ──
+
+    def record(self, d: dict) -> dict:
+        """Append the changes between the last save and d. Returns the
+        delta record, empty if nothing changed."""
+        with self._lock:
+            return self._record(d)
+
+    def _record(self, d: dict) -> dict:
+        if self._shadow is None or self._rewrite:
+            return self._compact(d)
+        for k in d:
+            self._read_shard(shard_of(k))
+
+        rec = diff_state(self._shadow, d)
+        if not rec:
+            return rec
+        self._seq += 1
+        rec["n"] = self._seq
+        line = json.dumps(rec, separators=(",", ":")) + "\n"
+
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.journal_path, "a") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+        apply_record(self._shadow, json.loads(line))
+        self._unflushed |= _touched(rec)
+        self._records += 1
+        self._bytes   += len(line)
+
+        if self._records >= COMPACT_RECORDS or self._bytes >= COMPACT_BYTES:
+            self._compact(self._shadow)
+        return rec
+
+    def compact(self, d: dict) -> dict:
+        """Fold d into the snapshot, rewriting only the shards that changed,
+        and empty the journal. Returns the delta from the previous state."""
+        with self._lock:
+            return self._compact(d)
+
+    def _compact(self, d: dict) -> dict:
+        if self._shadow is not None:
+            for k in d:
+                self._read_shard(shard_of(k))
+        rec = self._merge(d)
+        for shard in self._unflushed:
+            self._read_shard(shard)
+        self._gen += 1
+
+        parts: dict = {shard: {} for shard in self._unflushed}
+        for k, v in self._shadow.items():
+            shard = shard_of(k)
+            if shard in parts:
+                parts[shard][k] = v
+        for shard, part in parts.items():
+            name = f"{shard}.{self._gen}.bin"
+            _write_atomic(os.path.join(self.directory, name), encode_state(part))
+            self._shards[shard] = name
+
+        manifest = {"format": MANIFEST_FORMAT, "gen": self._gen,
+                    "journal_seq": self._seq, "shards": self._shards}
+        _write_atomic(self.manifest_path, json.dumps(manifest, indent=1).encode("utf-8"))
+        with open(self.journal_path, "w"):
+            pass
+        self._collect()
+
+        self._unflushed = set()
+        self._records = 0
+        self._bytes   = 0
+        self._rewrite = False
+        return rec
+
+    def _collect(self) -> None:
+        """Remove shard files the manifest no longer names, and single-file
+        saves it supersedes."""
+        live = set(self._shards.values())
+        for name in os.listdir(self.directory):
+            if _SHARD_NAME.match(name) and name not in live:
+                os.remove(os.path.join(self.directory, name))
+        for path in self.legacy_paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+    # ── Reading ──
+
+    def _read_snapshot(self, lazy: bool) -> tuple[dict, bool] | None:
+        """The snapshot state and whether it came from a single-file save.
+        With lazy set, LAZY_SHARDS are noted in _unread rather than read."""
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+            if manifest.get("format", 0) > MANIFEST_FORMAT:
+                raise CodecError("save manifest is newer than this game")
+            d = {"journal_seq": manifest.get("journal_seq", 0)}
+            for shard, name in manifest["shards"].items():
+                path = os.path.join(self.directory, name)
+                if not os.path.exists(path):
+                    raise CodecError(f"save shard {name} is missing")
+                if lazy and shard in LAZY_SHARDS:
+                    self._unread[shard] = name
+                    continue
+                with open(path, "rb") as f:
+                    d.update(decode_state(f.read()))
+            self._gen    = manifest.get("gen", 0)
+            self._shards = dict(manifest["shards"])
+            return d, False
+        for path in self.legacy_paths:
+            if not os.path.exists(path):
+                continue
+            if path.endswith(".json"):
+                with open(path) as f:
+                    return json.load(f), True
+            with open(path, "rb") as f:
+                return decode_state(f.read()), True
+        return None
+
+    def load(self, lazy: bool = False) -> dict | None:
+        """Return the snapshot with every newer journal record replayed.
+        With lazy set, the fields listed by lazy_fields() are left out;
+        fetch them with field()."""
+        with self._lock:
+            return self._load(lazy)
+
+    def _load(self, lazy: bool) -> dict | None:
+        self._unread = {}
+        self._held   = {}
+        found = self._read_snapshot(lazy)
+        if found is None:
+            return None
+        d, legacy = found
+        seq = d.pop("journal_seq", 0)
+
+        records = 0
+        size    = 0
+        torn    = False
+        touched: set = set()
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    # A torn tail from an interrupted append, or damage
+                    # anywhere else: replay stops at the first bad record
+                    rec = _parse(line)
+                    if rec is None:
+                        torn = True
+                        break
+                    records += 1
+                    size    += len(line)
+                    if rec["n"] <= seq:
+                        continue
+                    try:
+                        apply_record(d, self._hold(rec))
+                    except _MISFIT:
+                        torn = True
+                        break
+                    touched |= _touched(rec)
+                    seq = rec["n"]
+
+        self._shadow    = json.loads(json.dumps(d))
+        self._unflushed = set(SHARDS) if legacy else touched
+        self._seq     = seq
+        self._records = records
+        self._bytes   = size
+        self._rewrite = torn or legacy   # next save writes a fresh snapshot
+        return d
+
+    def _hold(self, rec: dict) -> dict:
+        """Set aside the parts of rec aimed at unread shards; return the rest."""
+        if not self._unread:
+            return rec
+        rest: dict = {}
+        for part in ("set", "patch"):
+            for k, v in rec.get(part, {}).items():
+                shard = shard_of(k)
+                if shard in self._unread:
+                    held = self._held.setdefault(shard, [])
+                    held.append({part: {k: v}})
+                else:
+                    rest.setdefault(part, {})[k] = v
+        if "del" in rec:
+            rest["del"] = rec["del"]
+        return rest
+
+    def delete(self) -> None:
+        with self._lock:
+            if os.path.isdir(self.directory):
+                for name in os.listdir(self.directory):
+                    if _SHARD_NAME.match(name):
+                        os.remove(os.path.join(self.directory, name))
+            for path in (self.manifest_path, self.journal_path, *self.legacy_paths):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._shadow    = None
+            self._shards    = {}
+            self._unflushed = set()
+            self._unread    = {}
+            self._held      = {}
+            self._gen     = 0
+            self._seq     = 0
+            self._records = 0
+            self._bytes   = 0
+            self._rewrite = False
+
+
+def _touched(rec: dict) -> set:
+    """Shards a delta record changes."""
+    return {shard_of(k) for part in ("set", "patch", "del") for k in rec.get(part, ())}
+
+
+JOURNAL = Journal(SAVE_DIR, legacy_paths=(SNAPSHOT_FILE, SAVE_FILE))
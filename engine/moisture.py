@@ -0,0 +1,115 @@
+# engine/moisture.py
+# The garden's moisture field, advanced in two stages a tick that every
+# garden_tick engine runs, each over whole columns rather than plot by plot:
+#
+#   weather   before any rule is tried: every plot loses evaporation units,
+#             then each living plot soaks up one more with chance
+#             infiltration. Guards in engine/rules.py read the result.
+#   flow      after the rules: each N or M plot at least give_at units wet
+#             gives one unit to each of its living neighbours (in topology
+#             order) at most take_at units wet, up to spread of them. Every
+#             plot reads the states the tick began with and the moisture the
+#             weather left, so no plot's flow depends on another's; a plot
+#             given to by several takes each.
+#
+# Moisture stays within 0-5 throughout. How hard each stage works is set per
+# weather in WEATHER, one entry for each of engine.panel.WEATHER_STATES.
+
+import random
+from array import array
+from dataclasses import dataclass
+from itertools import compress
+
+from engine.chance import hits
+from engine.codes import Plot, lookup
+from engine.panel import WEATHER_STATES
+
+
+@dataclass(slots=True, frozen=True)
+class Climate:
+    infiltration: float = 0.0   # chance a living plot soaks up one unit
+    evaporation:  int   = 1     # units every plot loses
+    give_at:      int   = 4     # least an N or M plot must hold to give
+    take_at:      int   = 1     # most a living neighbour may hold to take
+    spread:       int   = 1     # most neighbours an N or M plot gives to
+
+
+WEATHER = {
+    "sunny":  Climate(evaporation=2),
+    "cloudy": Climate(evaporation=1),
+    "rainy":  Climate(infiltration=0.6, evaporation=0),
+    "windy":  Climate(evaporation=2),
+}
+
+if set(WEATHER) != set(WEATHER_STATES):
+    raise ValueError("moisture WEATHER must cover engine.panel.WEATHER_STATES")
+
+MAX = 5
+
+_LIVING  = lookup(Plot, (Plot.HYPHA, Plot.NETWORK, Plot.MATURE, Plot.FRUITING))
+_SHARING = lookup(Plot, (Plot.NETWORK, Plot.MATURE))
+
+# translate() tables over the state column
+_LIVING_BYTES  = bytes(c < len(_LIVING) and _LIVING[c] for c in range(256))
+_SHARING_BYTES = bytes(c < len(_SHARING) and _SHARING[c] for c in range(256))
+
+# translate() tables over the moisture column: _DRIED[k] takes k off, down
+# to 0, and _AT_LEAST[k] and _AT_MOST[k] mark plots at k or more, k or less
+_DRIED    = [bytes(max(0, c - k) for c in range(256)) for k in range(MAX + 1)]
+_AT_LEAST = [bytes(c >= k for c in range(256)) for k in range(MAX + 1)]
+_AT_MOST  = [bytes(c <= k for c in range(256)) for k in range(MAX + 1)]
+
+
+def weather(state, moisture: array, c: Climate, rng=random) -> None:
+    """The weather stage over moisture, in place, for the plots in state
+    (a byte column of the same length). Draws from rng."""
+    if c.evaporation:
+        moisture[:] = array("B", bytes(moisture).translate(_DRIED[c.evaporation]))
+    if c.infiltration:
+        living = list(compress(range(len(state)), state.translate(_LIVING_BYTES)))
+        for k in hits(len(living), c.infiltration, rng):
+            i = living[k]
+            moisture[i] = min(MAX, moisture[i] + 1)
+
+
+def givers(state, moisture, c: Climate) -> list:
+    """Plots of a state and moisture column that can give this tick: N or
+    M, and at least c.give_at units wet."""
+    return _both(state.translate(_SHARING_BYTES),
+                 bytes(moisture).translate(_AT_LEAST[c.give_at]))
+
+
+def receivers(state, moisture, c: Climate) -> list:
+    """Plots of a state and moisture column that can be given to this
+    tick: living, and at most c.take_at units wet."""
+    return _both(state.translate(_LIVING_BYTES),
+                 bytes(moisture).translate(_AT_MOST[c.take_at]))
+
+
+def _both(a: bytes, b: bytes) -> list:
+    # Indices where two 0/1 byte masks are both set
+    mask = int.from_bytes(a, "little") & int.from_bytes(b, "little")
+    if not mask:
+        return []
+    return list(compress(range(len(a)), mask.to_bytes(len(a), "little")))
+
+
+def flow(moisture, plots, neighbours, receives, c: Climate) -> None:
+    """The flow stage, in place, from the given plots (see givers()) to
+    their neighbours(i) for which receives(j), whether j was living when
+    the tick began, holds. Every transfer is worked out before any is made."""
+    given, taken = [], []
+    for i in plots:
+        have = left = moisture[i]
+        for j in neighbours(i):
+            if receives(j) and moisture[j] <= c.take_at:
+                taken.append(j)
+                left -= 1
+                if have - left == c.spread:
+                    break
+        if left != have:
+            given.append((i, left))
+    for i, left in given:
+        moisture[i] = left
+    for j in taken:
+        moisture[j] = min(MAX, moisture[j] + 1)
@@ -0,0 +1,134 @@
+# engine/network.py
+# Connected networks of living plots (H N M F, joined through their four
+# neighbours), kept as a disjoint-set forest. A Garden builds one the first
+# time it is asked (Garden.network()) and keeps it current from set_state:
+# a plot coming alive joins its neighbours' networks in near-constant time,
+# and a plot dying takes the network it was part of out of the forest, to
+# be rebuilt from its remaining plots at the next query. However many plots
+# die between queries, each network is rebuilt at most once. A bulk state
+# change (set_states, recount) drops the whole forest, to be rebuilt on the
+# next query.
+
+from dataclasses import dataclass
+
+from engine.codes import Plot, lookup
+
+_LIVING   = lookup(Plot, (Plot.HYPHA, Plot.NETWORK, Plot.MATURE, Plot.FRUITING))
+_MATURE   = lookup(Plot, (Plot.MATURE, Plot.FRUITING))
+_FRUITING = lookup(Plot, (Plot.FRUITING,))
+
+
+@dataclass(slots=True, frozen=True)
+class Component:
+    """One connected network. id is the index of one of its plots, and
+    stays the same only until the network next changes."""
+    id:       int
+    size:     int
+    mature:   int   # mature or fruiting, as network_summary counts them
+    fruiting: int
+
+
+class Network:
+    """The connected networks of one Garden."""
+
+    __slots__ = ("_garden", "_parent", "_members", "_mature", "_fruiting",
+                 "_broken")
+
+    def __init__(self, garden) -> None:
+        self._garden   = garden
+        self._parent: dict   = {}   # living plot → parent plot
+        self._members: dict  = {}   # root → its plots
+        self._mature: dict   = {}   # root → mature count
+        self._fruiting: dict = {}   # root → fruiting count
+        self._broken: set    = set()   # living plots awaiting _settle()
+        for i, state in garden.living():
+            self._join(i, state)
+
+    # ── Forest ──
+
+    def _find(self, i: int) -> int:
+        parent = self._parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]   # path halving
+            i = parent[i]
+        return i
+
+    def _union(self, a: int, b: int) -> None:
+        a, b = self._find(a), self._find(b)
+        if a == b:
+            return
+        if len(self._members[a]) < len(self._members[b]):
+            a, b = b, a
+        self._parent[b] = a
+        self._members[a] += self._members.pop(b)
+        self._mature[a]   += self._mature.pop(b)
+        self._fruiting[a] += self._fruiting.pop(b)
+
+    def _join(self, i: int, state: int) -> None:
+        """Add living plot i as its own network, then merge in its
+        living neighbours'."""
+        self._parent[i]   = i
+        self._members[i]  = [i]
+        self._mature[i]   = int(_MATURE[state])
+        self._fruiting[i] = int(_FRUITING[state])
+        parent = self._parent
+        for n in self._garden.neighbours(i):
+            if n in parent:
+                self._union(i, n)
+
+    def _split(self, i: int) -> None:
+        """Plot i has died: take the network it was in out of the forest,
+        leaving its other plots for _settle()."""
+        root = self._find(i)
+        plots = self._members.pop(root)
+        del self._mature[root], self._fruiting[root]
+        for p in plots:
+            del self._parent[p]
+        self._broken.update(plots)
+        self._broken.discard(i)
+
+    def _settle(self) -> None:
+        """Put the plots of split networks back, as whatever networks they
+        now form."""
+        states = self._garden.state
+        for p in sorted(self._broken):
+            self._join(p, states[p])
+        self._broken.clear()
+
+    def update(self, i: int, old: int, new: int) -> None:
+        """Plot i has changed from state old to new."""
+        if i in self._broken:
+            if not _LIVING[new]:
+                self._broken.discard(i)   # _settle() reads the rest afresh
+        elif _LIVING[old] and _LIVING[new]:
+            root = self._find(i)
+            self._mature[root]   += _MATURE[new] - _MATURE[old]
+            self._fruiting[root] += _FRUITING[new] - _FRUITING[old]
+        elif _LIVING[new]:
+            self._join(i, new)
+        elif _LIVING[old]:
+            self._split(i)
+
+    # ── Queries ──
+
+    def _component(self, root: int) -> Component:
+        return Component(root, len(self._members[root]),
+                         self._mature[root], self._fruiting[root])
+
+    def component(self, i: int) -> Component | None:
+        """The network plot i belongs to, or None if it is not living."""
+        self._settle()
+        if i not in self._parent:
+            return None
+        return self._component(self._find(i))
+
+    def components(self) -> list:
+        """Every network, largest first."""
+        self._settle()
+        return sorted((self._component(r) for r in self._members),
+                      key=lambda c: c.size, reverse=True)
+
+    def largest(self) -> int:
+        """Plots in the largest network; 0 if nothing is living."""
+        self._settle()
+        return max(map(len, self._members.values()), default=0)
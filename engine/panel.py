@@ -2,7 +2,8 @@
 # Panel efficiency, weather, maintenance, passive generation.
 
 import random
-from engine.state import GameState
+from engine.state import (GameState, PANEL_DUST, PANEL_WIRE, PANEL_DEBRIS,
+                          PANEL_CONNECTOR)
 from data import text
 
 
@@ -18,6 +19,14 @@ DEGRADE_PROBS = {
 
 CONDITIONS = ["dust", "wire", "debris", "connector"]
 
+# Bit of each condition in gs.panel_conditions
+CONDITION_BITS = {
+    "dust":      PANEL_DUST,
+    "wire":      PANEL_WIRE,
+    "debris":    PANEL_DEBRIS,
+    "connector": PANEL_CONNECTOR,
+}
+
 MAINTENANCE_COSTS = {
     "dust":      0,
     "wire":      1,
@@ -26,27 +35,60 @@ MAINTENANCE_COSTS = {
 }
 
 
+# ── Condition tables ──────────────────────────────────────────
+# Everything that depends only on which conditions are present, indexed by
+# the 4-bit gs.panel_conditions mask.
+
+def _efficiency(mask: int) -> int:
+    return max(0, 100 - 25 * bin(mask).count("1"))
+
+
+def _power_interval(eff: int) -> int:
+    interval = 5
+    if eff < 75: interval = 7
+    if eff < 50: interval = 10
+    if eff < 25: interval = 15
+    return interval
+
+
+def _description_key(eff: int) -> int:
+    for threshold in (75, 50, 25, 0):
+        if eff >= threshold:
+            return threshold
+    return 0
+
+
+_MASKS = range(1 << len(CONDITIONS))
+
+EFFICIENCY      = tuple(_efficiency(m) for m in _MASKS)
+POWER_INTERVAL  = tuple(_power_interval(EFFICIENCY[m]) for m in _MASKS)
+DESCRIPTION_KEY = tuple(_description_key(EFFICIENCY[m]) for m in _MASKS)
+# Maintenance menu: (condition, scrap cost) for each condition present
+MAINTENANCE_MENU = tuple(
+    tuple((c, MAINTENANCE_COSTS[c]) for c in CONDITIONS if m & CONDITION_BITS[c])
+    for m in _MASKS
+)
+
+# Degradation checks in order: (condition, bit, weather, chance)
+_DEGRADE = tuple((c, CONDITION_BITS[c], cfg["weather"], cfg["chance"])
+                 for c, cfg in DEGRADE_PROBS.items())
+
+
 def recalc_efficiency(gs: GameState) -> None:
-    eff = 100
-    if gs.panel_dust:      eff -= 25
-    if gs.panel_wire:      eff -= 25
-    if gs.panel_debris:    eff -= 25
-    if gs.panel_connector: eff -= 25
-    gs.panel_efficiency = max(0, eff)
+    gs.panel_efficiency = EFFICIENCY[gs.panel_conditions]
 
 
 def needs_maintenance(gs: GameState) -> bool:
-    return any([gs.panel_dust, gs.panel_wire,
-                gs.panel_debris, gs.panel_connector])
+    return gs.panel_conditions != 0
 
 
 def active_conditions(gs: GameState) -> list:
-    out = []
-    if gs.panel_dust:      out.append("dust")
-    if gs.panel_wire:      out.append("wire")
-    if gs.panel_debris:    out.append("debris")
-    if gs.panel_connector: out.append("connector")
-    return out
+    return [c for c, _ in MAINTENANCE_MENU[gs.panel_conditions]]
+
+
+def clear_condition(gs: GameState, condition: str) -> None:
+    gs.panel_conditions &= ~CONDITION_BITS[condition]
+    recalc_efficiency(gs)
 
 
 def panel_connected(gs: GameState) -> bool:
@@ -66,15 +108,15 @@ def degrade_panel(gs: GameState, pale_present: bool = False) -> str | None:
         return None
 
     flash = None
+    mask  = gs.panel_conditions
 
-    for cond, cfg in DEGRADE_PROBS.items():
+    for cond, bit, weather, chance in _DEGRADE:
         # Skip if already degraded
-        if getattr(gs, f"panel_{cond}"):
+        if mask & bit:
             continue
         # Weather match (connector degrades in any weather)
-        if cfg["weather"] and gs.weather != cfg["weather"]:
+        if weather and gs.weather != weather:
             continue
-        chance = cfg["chance"]
         if cond == "connector" and pale_present:
             chance *= 0.5
         if cond == "connector" and gs.has_braced_connector:
@@ -82,7 +124,7 @@ def degrade_panel(gs: GameState, pale_present: bool = False) -> str | None:
         if cond == "debris" and gs.has_reinforced_mounting:
             chance *= 0.5
         if random.random() < chance:
-            setattr(gs, f"panel_{cond}", True)
+            gs.panel_conditions = mask | bit
             recalc_efficiency(gs)
             flash = text.PANEL_FLASH[cond]
             break   # one degradation per tick
@@ -95,15 +137,10 @@ def generate_power(gs: GameState, junction_bonus: bool = False) -> bool:
     if not panel_connected(gs):
         return False
 
-    eff = gs.panel_efficiency
-    interval = 5
-    if eff < 75: interval = 7
-    if eff < 50: interval = 10
-    if eff < 25: interval = 15
-
-    if gs.action_count % interval == 0:
+    mask = gs.panel_conditions
+    if gs.action_count % POWER_INTERVAL[mask] == 0:
         gs.power += 1
-        if junction_bonus and eff >= 75:
+        if junction_bonus and EFFICIENCY[mask] >= 75:
             gs.power += 1
         return True
     return False
@@ -116,8 +153,7 @@ def do_maintain(gs: GameState, condition: str) -> str:
         return text.PANEL_MAINTENANCE_RESULTS[f"{condition}_no_scrap"]
     if cost > 0:
         gs.scrap -= cost
-    setattr(gs, f"panel_{condition}", False)
-    recalc_efficiency(gs)
+    clear_condition(gs, condition)
     return text.PANEL_MAINTENANCE_RESULTS[condition]
 
 
@@ -126,11 +162,7 @@ def panel_description(gs: GameState) -> str:
         return text.PANEL_DESCRIPTIONS["neglected"]
     if gs.panel_state == "cleaned":
         return text.PANEL_DESCRIPTIONS["cleaned"]
-    eff = gs.panel_efficiency
-    for threshold in (75, 50, 25, 0):
-        if eff >= threshold:
-            return text.PANEL_DESCRIPTIONS[threshold]
-    return text.PANEL_DESCRIPTIONS[0]
+    return text.PANEL_DESCRIPTIONS[DESCRIPTION_KEY[gs.panel_conditions]]
 
 
 def apply_decay(gs: GameState, days: int) -> str | None:
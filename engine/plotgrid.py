@@ -0,0 +1,344 @@
+# engine/plotgrid.py
+# Column-backed garden. Each plot field lives in its own packed array, so a
+# plot costs 9 bytes instead of a dict. Code that wants dicts indexes the
+# garden and gets a PlotView, which reads and writes through to the columns;
+# hot loops take the columns directly.
+#
+# Forks share columns and copy one only when it is first written, so code
+# writing a column directly must fetch it with writable().
+#
+# Which plots are next to which comes from the garden's topology (see
+# engine/topology.py), a bounded grid unless the garden is built with another.
+#
+# The garden also keeps, per plot, how many of its neighbours are living
+# and how many are fruiting, and how many plots are in each state, and once
+# asked for, which plots those are (engine/stateindex.py). set_state and
+# set_states keep these up to date, which is why every state change has to
+# go through them. With QUIETCURRENT_DEBUG set, tally() checks them
+# against a recount.
+
+import os
+from array import array
+from itertools import compress
+from collections.abc import MutableMapping
+from dataclasses import dataclass
+
+from engine.codes import Plot, PLOTS, PLOT_CODES, PLOT_LETTERS, lookup
+from engine.network import Network
+from engine.stateindex import StateIndex
+from engine import topology as topo
+
+PLOT_FIELDS = ("state", "soil", "moisture", "age", "fruit_age")
+
+# Check the derived counts on every tally() (see Garden.check)
+CHECKED = bool(os.environ.get("QUIETCURRENT_DEBUG"))
+
+# Neighbour counts, derived from state and never saved
+COUNT_FIELDS = ("near_living", "near_fruiting")
+
+_COLUMNS = PLOT_FIELDS + COUNT_FIELDS
+
+# engine.garden.LIVING_STATES, which cannot be imported from here
+_LIVING   = lookup(Plot, (Plot.HYPHA, Plot.NETWORK, Plot.MATURE, Plot.FRUITING))
+_FRUITING = lookup(Plot, (Plot.FRUITING,))
+
+# _LIVING as a translate() table over the state column
+_LIVING_BYTES = bytes(c < len(_LIVING) and _LIVING[c] for c in range(256))
+
+# Column types: state is a Plot code, one byte each
+_TYPECODES = {"soil": "B", "moisture": "B", "age": "I", "fruit_age": "H"}
+
+
+@dataclass(slots=True)
+class PlotState:
+    """One plot as a record. Converts between saved plot dicts, whose
+    states are letters, and the values held in the Garden columns."""
+    state:     int = Plot.EMPTY
+    soil:      int = 1     # 1-5 substrate richness
+    moisture:  int = 0     # 0-5
+    age:       int = 0     # ticks since inoculated
+    fruit_age: int = 0     # ticks spent in F state
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "PlotState":
+        """Missing fields take their defaults and unknown ones (growth, crop
+        from old saves) are dropped; an unknown state letter reads as empty."""
+        return cls(PLOT_CODES.get(d.get("state"), Plot.EMPTY), d.get("soil", 1),
+                   d.get("moisture", 0), d.get("age", 0), d.get("fruit_age", 0))
+
+    def to_dict(self) -> dict:
+        return {"state": PLOT_LETTERS[self.state], "soil": self.soil,
+                "moisture": self.moisture, "age": self.age,
+                "fruit_age": self.fruit_age}
+
+
+class Garden:
+    """GARDEN_SIZE plots as parallel columns, indexed like a list of dicts.
+    Plots run row by row, width to a row, on a bounded grid unless a
+    topology is given, which then sets the size and width."""
+
+    __slots__ = ("state", "soil", "moisture", "age", "fruit_age",
+                 "near_living", "near_fruiting", "counts", "width", "topology",
+                 "_shared", "_network", "_index")
+
+    def __init__(self, size: int = 0, width: int = 0, topology=None) -> None:
+        if topology is None:
+            width = width or size or 1
+            topology = topo.grid(width, -(-size // width), size)
+        size = len(topology)
+        self.topology  = topology
+        self.width     = topology.width
+        self.state     = bytearray(size)   # all Plot.EMPTY
+        self.soil      = array("B", bytes(size))
+        self.moisture  = array("B", bytes(size))
+        self.age       = array("I", bytes(4 * size))
+        self.fruit_age = array("H", bytes(2 * size))
+        self.near_living   = bytearray(size)   # living neighbours
+        self.near_fruiting = bytearray(size)   # fruiting neighbours
+        self.counts = [size] + [0] * (len(Plot) - 1)   # plots per state code
+        self._shared: set = set()   # columns another Garden may also hold
+        self._network = None        # built by network() when first asked
+        self._index   = None        # built by by_state() when first asked
+
+    @classmethod
+    def from_dicts(cls, plots: list, width: int = 0) -> "Garden":
+        """Build from saved plot dicts (see PlotState.from_dict)."""
+        recs = [PlotState.from_dict(p) for p in plots]
+        g = cls(len(recs), width)
+        g.state     = bytearray(r.state for r in recs)
+        g.soil      = array("B", [r.soil for r in recs])
+        g.moisture  = array("B", [r.moisture for r in recs])
+        g.age       = array("I", [r.age for r in recs])
+        g.fruit_age = array("H", [r.fruit_age for r in recs])
+        g.recount()
+        return g
+
+    def to_dicts(self) -> list:
+        """Saved plot dicts, with states as letters."""
+        return [PlotState(*row).to_dict()
+                for row in zip(self.state, self.soil, self.moisture,
+                               self.age, self.fruit_age)]
+
+    def record(self, i: int) -> PlotState:
+        """A copy of plot i as a PlotState."""
+        return PlotState(self.state[i], self.soil[i], self.moisture[i],
+                         self.age[i], self.fruit_age[i])
+
+    # ── Columns ──
+
+    def writable(self, name: str):
+        """The named column, copied first if another Garden shares it."""
+        if name == "moisture" and self._index is not None:
+            self._index.moisture_written()
+        return self._own(name)
+
+    def _own(self, name: str):
+        # writable() without telling the state index
+        col = getattr(self, name)
+        if name in self._shared:
+            col = col[:]
+            setattr(self, name, col)
+            self._shared.discard(name)
+        return col
+
+    def set_state(self, i: int, state: int) -> None:
+        """Every plot state change goes through here."""
+        states = self._own("state")
+        old = states[i]
+        states[i] = state
+        self.counts[old]   -= 1
+        self.counts[state] += 1
+        if self._network is not None:
+            self._network.update(i, old, state)
+        if self._index is not None:
+            self._index.update(i, old, state)
+        living   = _LIVING[state] - _LIVING[old]
+        fruiting = _FRUITING[state] - _FRUITING[old]
+        if living:
+            near = self._own("near_living")
+            for n in self.neighbours(i):
+                near[n] += living
+        if fruiting:
+            near = self._own("near_fruiting")
+            for n in self.neighbours(i):
+                near[n] += fruiting
+
+    def set_moisture(self, i: int, moisture: int) -> None:
+        """One plot's moisture, for code outside the engines: it keeps the
+        state index's moisture order instead of dropping it."""
+        self._own("moisture")[i] = moisture
+        if self._index is not None:
+            self._index.moisture_set(i)
+
+    def set_states(self, states, near=None) -> None:
+        """Replace every plot state at once: the bulk form of set_state.
+        states is any buffer of len(self) codes. near, if given, is the
+        (near_living, near_fruiting) pair for the new states, from a caller
+        that can count them faster than recount()."""
+        self.writable("state")[:] = states
+        self._network = None
+        self._index   = None
+        if near is None:
+            self.recount()
+        else:
+            self.writable("near_living")[:]   = near[0]
+            self.writable("near_fruiting")[:] = near[1]
+            self.counts = self._count_states()
+
+    # ── Neighbours ──
+
+    def neighbours(self, i: int):
+        """Indices of the plots next to plot i, in the topology's order:
+        (0, 1), (0, -1), (1, 0), (-1, 0) as (dx, dy) on a grid."""
+        return self.topology.neighbours(i)
+
+    def _count_states(self) -> list:
+        return [self.state.count(c) for c in range(len(Plot))]
+
+    def living(self):
+        """(plot, state) for each living plot, in plot order."""
+        states = self.state
+        for i in compress(range(len(states)), states.translate(_LIVING_BYTES)):
+            yield i, states[i]
+
+    def recount(self) -> None:
+        """Rebuild the neighbour count columns and the state counts from
+        the states."""
+        n = len(self.state)
+        living   = bytearray(n)
+        fruiting = bytearray(n)
+        offsets, index = self.topology.offsets, self.topology.index
+        for i, s in enumerate(self.state):
+            if _LIVING[s]:
+                nbrs = index[offsets[i]:offsets[i + 1]]
+                for j in nbrs:
+                    living[j] += 1
+                if _FRUITING[s]:
+                    for j in nbrs:
+                        fruiting[j] += 1
+        self.near_living, self.near_fruiting = living, fruiting
+        self._shared.difference_update(COUNT_FIELDS)
+        self.counts = self._count_states()
+        self._network = None
+        self._index   = None
+
+    def network(self) -> Network:
+        """The connected networks of living plots (see engine/network.py)."""
+        if self._network is None:
+            self._network = Network(self)
+        return self._network
+
+    def by_state(self) -> StateIndex:
+        """Which plots are in each state (see engine/stateindex.py)."""
+        if self._index is None:
+            self._index = StateIndex(self)
+        return self._index
+
+    def check(self) -> None:
+        """AssertionError if the derived counts disagree with the states."""
+        g = Garden(topology=self.topology)
+        g.state = self.state
+        g.recount()
+        for name in ("counts",) + COUNT_FIELDS:
+            if getattr(self, name) != getattr(g, name):
+                raise AssertionError(f"garden {name} out of step with its states")
+        if self._network is not None:
+            if (sorted(map(_sizes, self._network.components()))
+                    != sorted(map(_sizes, g.network().components()))):
+                raise AssertionError("garden networks out of step with its states")
+        if self._index is not None:
+            if ([sorted(self._index.plots(s)) for s in Plot]
+                    != [sorted(g.by_state().plots(s)) for s in Plot]):
+                raise AssertionError("garden state index out of step with its states")
+
+    def fork(self) -> "Garden":
+        """A Garden sharing every column with this one until written."""
+        g = Garden.__new__(Garden)
+        g.width    = self.width
+        g.topology = self.topology
+        g.counts   = list(self.counts)
+        g._network = None
+        g._index   = None
+        for name in _COLUMNS:
+            setattr(g, name, getattr(self, name))
+        g._shared    = set(_COLUMNS)
+        self._shared = set(_COLUMNS)
+        return g
+
+    def tally(self) -> list:
+        """Number of plots in each state, indexed by Plot code."""
+        if CHECKED:
+            self.check()
+        return list(self.counts)
+
+    # ── List protocol ──
+
+    def __len__(self) -> int:
+        return len(self.state)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [PlotView(self, j) for j in range(*i.indices(len(self)))]
+        n = len(self.state)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("garden index out of range")
+        return PlotView(self, i)
+
+    def __iter__(self):
+        for i in range(len(self.state)):
+            yield PlotView(self, i)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Garden):
+            return all(getattr(self, f) == getattr(other, f) for f in PLOT_FIELDS)
+        if isinstance(other, list):
+            return self.to_dicts() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"Garden({len(self)} plots)"
+
+
+def _sizes(c) -> tuple:
+    return c.size, c.mature, c.fruiting
+
+
+class PlotView(MutableMapping):
+    """One plot of a Garden, behaving like its old dict."""
+
+    __slots__ = ("_garden", "_i")
+
+    def __init__(self, garden: Garden, i: int) -> None:
+        self._garden = garden
+        self._i      = i
+
+    def __getitem__(self, key: str):
+        if key == "state":
+            return PLOTS[self._garden.state[self._i]]
+        if key not in _TYPECODES:
+            raise KeyError(key)
+        return getattr(self._garden, key)[self._i]
+
+    def __setitem__(self, key: str, value) -> None:
+        if key == "state":
+            self._garden.set_state(self._i, value)
+        elif key == "moisture":
+            self._garden.set_moisture(self._i, value)
+        elif key in _TYPECODES:
+            self._garden.writable(key)[self._i] = value
+        else:
+            raise KeyError(key)
+
+    def __delitem__(self, key: str) -> None:
+        raise KeyError(key)   # plots have a fixed set of fields
+
+    def __iter__(self):
+        return iter(PLOT_FIELDS)
+
+    def __len__(self) -> int:
+        return len(PLOT_FIELDS)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
@@ -2,7 +2,8 @@
 # Resident system. Mood, conditions, effects, interactions.
 
 import random
-from engine.state import GameState, RESIDENT_MAX
+from engine.state import GameState, Resident, RESIDENT_MAX, mark_dirty
+from engine.garden import EMPTY, LIVING_STATES
 from data import text as txt
 
 RESIDENT_DATA = txt.RESIDENTS
@@ -13,12 +14,12 @@ MOOD_LABELS   = txt.MOOD_LABELS
 # ── Resident list helpers ─────────────────────────────────────
 
 def resident_names(gs: GameState) -> list[str]:
-    return [r["name"] for r in gs.residents]
+    return [r.name for r in gs.residents]
 
 
-def get_resident(gs: GameState, name: str) -> dict | None:
+def get_resident(gs: GameState, name: str) -> Resident | None:
     for r in gs.residents:
-        if r["name"] == name:
+        if r.name == name:
             return r
     return None
 
@@ -28,12 +29,14 @@ def add_resident(gs: GameState, name: str) -> bool:
         return False
     if name in resident_names(gs):
         return False
-    gs.residents.append({"name": name, "mood": 2, "days": 0})
+    gs.residents.append(Resident(name))
+    mark_dirty(gs, "residents")
     return True
 
 
 def remove_resident(gs: GameState, name: str) -> None:
-    gs.residents = [r for r in gs.residents if r["name"] != name]
+    gs.residents = [r for r in gs.residents if r.name != name]
+    mark_dirty(gs, "residents")
 
 
 def pale_present(gs: GameState) -> bool:
@@ -103,10 +106,14 @@ def _apply_effect(name: str, gs: GameState) -> str | None:
                 return "the ground near the rain catcher holds more than usual."
         case "soil_improve":
             if roll < 0.15 and gs.garden_initialized and gs.garden:
+                # Lands on an empty plot as often as a draw over the whole
+                # garden would, and on each as often as any other
                 idx = random.randrange(len(gs.garden))
-                p = gs.garden[idx]
-                if p["state"] == "E":
+                empty = gs.garden.by_state().plots(EMPTY)
+                if idx < len(empty):
+                    p = gs.garden[empty[idx]]
                     p["soil"] = min(5, p["soil"] + 1)
+                    mark_dirty(gs, "garden")
                     return "a corner of the garden looks different. the soil there is richer."
         case "weather_nudge":
             if roll < 0.25 and gs.weather_duration > 2:
@@ -134,25 +141,26 @@ def tick_residents(gs: GameState) -> str | None:
     """Process all residents. Returns flash text or None."""
     if not gs.residents:
         return None
+    mark_dirty(gs, "residents")
 
     flash = None
     departing = []
 
     for r in gs.residents:
-        name = r["name"]
+        name = r.name
         if name not in RESIDENT_DATA:
             continue
 
-        r["days"] += 1
+        r.days += 1
         primary = _primary_met(name, gs)
         delta   = _secondary_delta(name, gs)
 
         if primary:
-            r["mood"] = min(3, r["mood"] + 1 + (1 if delta > 0 else 0))
+            r.mood = min(3, r.mood + 1 + (1 if delta > 0 else 0))
         else:
-            r["mood"] = max(0, r["mood"] - 1 + (delta if delta < 0 else 0))
+            r.mood = max(0, r.mood - 1 + (delta if delta < 0 else 0))
 
-        if r["mood"] == 0:
+        if r.mood == 0:
             departing.append(name)
             if not flash:
                 flash = RESIDENT_DATA[name]["farewell"]
@@ -181,23 +189,23 @@ def _apply_interaction_effect(pair: frozenset, gs: GameState) -> None:
             gs.mycelium += 1
         case ("Fen", "Reed"):
             if gs.garden_initialized and gs.garden:
-                living = [p for p in gs.garden if p.get("state") in ("H", "N", "M", "F")]
-                if living:
-                    p = random.choice(living)
+                i = gs.garden.by_state().pick(LIVING_STATES)
+                if i is not None:
+                    p = gs.garden[i]
                     p["soil"] = min(5, p["soil"] + 1)
+                    mark_dirty(gs, "garden")
         case ("Pale", "Weft"):
-            conditions = [c for c in ("panel_dust", "panel_wire", "panel_debris", "panel_connector")
-                          if getattr(gs, c, False)]
+            from engine.panel import active_conditions, clear_condition
+            conditions = active_conditions(gs)
             if conditions:
-                setattr(gs, random.choice(conditions), False)
-                from engine.panel import recalc_efficiency
-                recalc_efficiency(gs)
+                clear_condition(gs, random.choice(conditions))
         case ("Reed", "Tuck"):
             if gs.garden_initialized and gs.garden:
-                living = [p for p in gs.garden if p.get("state") in ("H", "N", "M", "F")]
-                if living:
-                    driest = min(living, key=lambda p: p.get("moisture", 0))
-                    driest["moisture"] = min(5, driest.get("moisture", 0) + 1)
+                i = gs.garden.by_state().driest(LIVING_STATES)
+                if i is not None:
+                    driest = gs.garden[i]
+                    driest["moisture"] = min(5, driest["moisture"] + 1)
+                    mark_dirty(gs, "garden")
         case ("Drift", "Sable"):
             gs.weather_duration = max(0, gs.weather_duration - 2)
 
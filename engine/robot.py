@@ -2,13 +2,11 @@
 # Tending frame — passive garden automation. No UI here.
 
 import random
-from engine.state import GameState, GARDEN_W, GARDEN_H
+from engine.state import GameState
 from engine.garden import (
     action_inoculate, action_clear, action_water,
-    EMPTY, COMPETING, HYPHA, NETWORK, MATURE, FRUITING,
-    ACTIVE_STATES,
+    COMPETING, WATERABLE_STATES,
 )
-from engine.state import plot_idx
 from data import text as txt
 
 
@@ -26,41 +24,45 @@ def apply_frame(gs: GameState) -> str | None:
     if not gs.garden_initialized or not gs.garden:
         return None
 
+    # Each task takes the first plot, in plot order, it can be done to
     for task in TASK_ORDER:
         if task not in gs.frame_rules:
             continue
-        for i, p in enumerate(gs.garden):
-            x, y = i % GARDEN_W, i // GARDEN_W
-            result = _try_task(gs, task, p, x, y)
-            if result:
-                return result
+        i = _find_task(gs, task)
+        if i is not None:
+            y, x = divmod(i, gs.garden.width)
+            return _do_task(gs, task, x, y)
 
     return None
 
 
-def _try_task(gs: GameState, task: str, p: dict, x: int, y: int) -> str | None:
-    if task == "inoculate" and p["state"] == EMPTY and gs.spores > 0:
+def _find_task(gs: GameState, task: str) -> int | None:
+    g = gs.garden
+    plots = g.by_state()
+    if task == "inoculate" and gs.spores > 0:
         # Only inoculate if adjacent to an active plot
-        has_neighbor = False
-        for dx, dy in ((0, 1), (0, -1), (1, 0), (-1, 0)):
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < GARDEN_W and 0 <= ny < GARDEN_H:
-                if gs.garden[plot_idx(nx, ny)]["state"] in ACTIVE_STATES + (HYPHA,):
-                    has_neighbor = True
-                    break
-        if has_neighbor:
-            action_inoculate(gs, x, y)
-            return random.choice(txt.FRAME_INOCULATE)
-
-    if task == "clear" and p["state"] == COMPETING:
-        action_clear(gs, x, y)
-        return random.choice(txt.FRAME_CLEAR)
+        return plots.frontier()
+
+    if task == "clear":
+        return plots.first((COMPETING,))
 
-    if (task == "water"
-            and p["state"] in (HYPHA, NETWORK, MATURE, FRUITING)
-            and p["moisture"] == 0
-            and gs.water > 0):
-        action_water(gs, x, y)
-        return random.choice(txt.FRAME_WATER)
+    if task == "water" and gs.water > 0:
+        # The driest is the first dry plot, if there is one
+        i = plots.driest(WATERABLE_STATES)
+        if i is not None and g.moisture[i] == 0:
+            return i
 
     return None
+
+
+def _do_task(gs: GameState, task: str, x: int, y: int) -> str:
+    if task == "inoculate":
+        action_inoculate(gs, x, y)
+        return random.choice(txt.FRAME_INOCULATE)
+
+    if task == "clear":
+        action_clear(gs, x, y)
+        return random.choice(txt.FRAME_CLEAR)
+
+    action_water(gs, x, y)
+    return random.choice(txt.FRAME_WATER)
@@ -0,0 +1,113 @@
+# engine/rules.py
+# The garden's plot state machine as data. TRANSITIONS lists every rule by
+# which a plot changes state; at import they are grouped by source state
+# into BY_STATE, which every garden_tick engine dispatches on. A balance
+# change is an edit to the table, and reaches all the engines at once.
+#
+# Each tick, after the weather has changed its moisture and its counters
+# (AGEING, RIPENING) have advanced, a plot takes the first of its state's
+# rules whose guard holds and whose chance comes up. A chance of 1 is not
+# rolled for. Guards read the plot as it stands at that point in the tick,
+# its moisture after the weather, and its neighbour counts.
+#
+# Plots in an ASLEEP state are not visited: the engines draw which of them
+# fire instead, so their rules may have no guard, only a chance.
+
+from dataclasses import dataclass
+
+from engine.codes import Plot, lookup
+
+
+@dataclass(slots=True, frozen=True)
+class Transition:
+    source: Plot
+    target: Plot
+    chance:        float = 1.0
+    age:           int   = 0          # at least this many ticks inoculated
+    fruit_age:     int   = 0          # at least this many ticks in F
+    moisture:      tuple = (0, 5)     # within, inclusive
+    soil:          int   = 0          # at least
+    near_living:   tuple = (0, 8)     # living neighbours, within
+    near_fruiting: tuple = (0, 8)     # fruiting neighbours, within
+    weather:       tuple = ()         # any weather if empty
+    reset:         str   = ""         # plot column zeroed on the way in
+    harvest:       bool  = False      # yields HARVEST
+
+    def guarded(self) -> bool:
+        """Whether anything but its chance decides if the rule fires."""
+        return self != Transition(self.source, self.target, self.chance,
+                                  reset=self.reset, harvest=self.harvest)
+
+
+TRANSITIONS = (
+    # Hyphae join a network once established, or dry out and die
+    Transition(Plot.HYPHA, Plot.NETWORK, age=15, moisture=(1, 5),
+               near_living=(1, 8)),
+    Transition(Plot.HYPHA, Plot.DECOMP, chance=0.15, moisture=(0, 0)),
+    # An isolated network strand falls back to hypha
+    Transition(Plot.NETWORK, Plot.HYPHA, near_living=(0, 0)),
+    Transition(Plot.NETWORK, Plot.MATURE, age=50, soil=2, near_living=(2, 8)),
+    # No adjacent F rule
+    Transition(Plot.MATURE, Plot.FRUITING, chance=0.04, moisture=(3, 5),
+               soil=3, near_fruiting=(0, 0), reset="fruit_age", harvest=True),
+    Transition(Plot.FRUITING, Plot.MATURE, fruit_age=6, reset="fruit_age"),
+    Transition(Plot.DECOMP, Plot.EMPTY, chance=0.10),
+    # Spontaneous competing growth
+    Transition(Plot.EMPTY, Plot.COMPETING, chance=0.008),
+)
+
+# What a harvest transition yields: (GameState field, chance of one more)
+HARVEST = (("mycelium", 1.0), ("water", 0.30), ("power", 0.10))
+
+# Counters advanced every tick, before any rule is tried
+AGEING   = lookup(Plot, (Plot.HYPHA, Plot.NETWORK, Plot.MATURE, Plot.FRUITING))
+RIPENING = lookup(Plot, (Plot.FRUITING,))
+
+# Decomposing plots enrich the soil of each H, N or M neighbour with this
+# chance a tick, by one up to 5, before trying their own rules
+ENRICH_CHANCE = 0.15
+
+ASLEEP = (Plot.EMPTY, Plot.COMPETING)
+
+
+# ── Compiled ──────────────────────────────────────────────────
+
+def _compile(table) -> tuple:
+    by_state = [[] for _ in Plot]
+    for t in table:
+        by_state[t.source].append(t)
+    for s in ASLEEP:
+        if any(t.guarded() for t in by_state[s]):
+            raise ValueError(f"{Plot(s).name} plots are not visited, so "
+                             "their rules can only have a chance")
+        if len(by_state[s]) > 1:
+            raise ValueError(f"{Plot(s).name} plots can have only one rule")
+    return tuple(map(tuple, by_state))
+
+
+# BY_STATE[state]: that state's rules, in table order
+BY_STATE = _compile(TRANSITIONS)
+
+# DRAWN[state]: the one rule of an ASLEEP state, or None
+DRAWN = tuple(rules[0] if s in ASLEEP and rules else None
+              for s, rules in enumerate(BY_STATE))
+
+
+def choose(rules, roll, age: int, fruit_age: int, moisture: int, soil: int,
+           near_living: int, near_fruiting: int, weather: str):
+    """The first of rules (one state's BY_STATE entry) whose guard holds
+    and whose chance comes up on roll(), or None."""
+    for t in rules:
+        if (age >= t.age and fruit_age >= t.fruit_age and soil >= t.soil
+                and t.moisture[0] <= moisture <= t.moisture[1]
+                and t.near_living[0] <= near_living <= t.near_living[1]
+                and t.near_fruiting[0] <= near_fruiting <= t.near_fruiting[1]
+                and (not t.weather or weather in t.weather)
+                and (t.chance >= 1 or roll() < t.chance)):
+            return t
+    return None
+
+
+def reap(roll) -> list:
+    """What one harvest yields, in HARVEST order."""
+    return [1 if chance >= 1 else int(roll() < chance) for _, chance in HARVEST]
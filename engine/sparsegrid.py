@@ -0,0 +1,357 @@
+# engine/sparsegrid.py
+# Sparse garden for grids far larger than the game's. The grid is cut into
+# CHUNK x CHUNK chunks, each a small Garden, allocated the first time one
+# of its plots is read or changed. Ground never touched is not stored at
+# all: it is empty or competing growth, all dry, so the only thing that
+# ever happens to it is empty plots sprouting. SparseGarden keeps one count
+# of the competing plots somewhere in it, and places them when a chunk is
+# first allocated.
+#
+# Plots are indexed row by row across the whole grid, as in Garden, and
+# garden_tick runs engine.gardenbuf.tick_sparse on these (every plot reads
+# the garden as the tick began). Memory and tick time go with the number of
+# chunks in use, not with width x height.
+#
+# SparseGarden is for simulating large networks; saves only hold Gardens.
+
+import random
+from itertools import compress
+
+from engine.codes import Plot, lookup
+from engine.network import Network
+from engine.plotgrid import CHECKED, Garden, PlotView
+
+# Chunk side, in plots
+CHUNK = 16
+
+_LIVING   = lookup(Plot, (Plot.HYPHA, Plot.NETWORK, Plot.MATURE, Plot.FRUITING))
+_FRUITING = lookup(Plot, (Plot.FRUITING,))
+_BUSY     = lookup(Plot, (Plot.HYPHA, Plot.NETWORK, Plot.MATURE, Plot.FRUITING,
+                          Plot.DECOMP))
+
+# Empty plots as a translate() table over a state column
+_EMPTY_BYTES = bytes(c == Plot.EMPTY for c in range(256))
+
+# translate() tables over the moisture column, one per level 0-5, and
+# marking non-zero neighbour counts
+_AT_LEVEL = [bytes(c == m for c in range(256)) for m in range(6)]
+_SOME     = bytes(c > 0 for c in range(256))
+
+
+class _Column:
+    """One plot field across a SparseGarden, indexed like a Garden column.
+    Each access allocates the plot's chunk if need be."""
+
+    __slots__ = ("_garden", "_name")
+
+    def __init__(self, garden, name: str) -> None:
+        self._garden = garden
+        self._name   = name
+
+    def __len__(self) -> int:
+        return len(self._garden)
+
+    def __getitem__(self, i: int):
+        key, j = self._garden.locate(i)
+        return getattr(self._garden.chunk(key), self._name)[j]
+
+    def __setitem__(self, i: int, value) -> None:
+        if self._name == "state":
+            self._garden.set_state(i, value)
+            return
+        key, j = self._garden.locate(i)
+        self._garden.chunk(key).writable(self._name)[j] = value
+
+
+class SparseGarden:
+    """A width x height garden stored as chunks allocated on first use.
+    width and height must be multiples of CHUNK."""
+
+    __slots__ = ("width", "height", "chunks", "counts",
+                 "wild_plots", "wild_competing", "_network")
+
+    def __init__(self, width: int, height: int) -> None:
+        if width % CHUNK or height % CHUNK:
+            raise ValueError(f"sparse garden sides must be multiples of {CHUNK}")
+        self.width  = width
+        self.height = height
+        self.chunks: dict = {}   # chunk number → Garden
+        self.counts = [width * height] + [0] * (len(Plot) - 1)
+        # Plots in chunks not yet allocated, and how many of those are
+        # competing growth
+        self.wild_plots     = width * height
+        self.wild_competing = 0
+        self._network = None
+
+    # ── Chunks ──
+
+    def locate(self, i: int) -> tuple:
+        """(chunk number, index within the chunk) of plot i."""
+        y, x = divmod(i, self.width)
+        return ((y // CHUNK) * (self.width // CHUNK) + x // CHUNK,
+                (y % CHUNK) * CHUNK + x % CHUNK)
+
+    def origin(self, key: int) -> int:
+        """The plot at the top left of chunk key."""
+        cy, cx = divmod(key, self.width // CHUNK)
+        return cy * CHUNK * self.width + cx * CHUNK
+
+    def chunk(self, key: int) -> Garden:
+        """Chunk key, allocated if this is its first use."""
+        c = self.chunks.get(key)
+        if c is None:
+            c = self.chunks[key] = self._allocate(key)
+        return c
+
+    def _allocate(self, key: int) -> Garden:
+        size = CHUNK * CHUNK
+        c = Garden(size, CHUNK)
+        for j in range(size):
+            c.soil[j] = random.randint(1, 2)   # as init_garden
+        # Which of the chunk's plots are among the wild competing growth:
+        # any wild plot is as likely as any other to be one
+        n, k = self.wild_plots, self.wild_competing
+        states = bytearray(size)
+        for j in range(size):
+            if random.random() * n < k:
+                states[j] = Plot.COMPETING
+                k -= 1
+            n -= 1
+        self.wild_plots, self.wild_competing = n, k
+        c.set_states(states)
+        # Neighbour counts across the chunk's edges
+        origin = self.origin(key)
+        for j in _edge(CHUNK):
+            i = origin + (j // CHUNK) * self.width + j % CHUNK
+            for t in self.neighbours(i):
+                other, jn = self.locate(t)
+                if other != key and other in self.chunks:
+                    s = self.chunks[other].state[jn]
+                    c.near_living[j]   += _LIVING[s]
+                    c.near_fruiting[j] += _FRUITING[s]
+        return c
+
+    def busy(self) -> list:
+        """Chunk numbers with plots a tick can change (living, decomposing
+        or wet), in order."""
+        out = []
+        for key in sorted(self.chunks):
+            c = self.chunks[key]
+            if (any(c.counts[s] for s in range(len(Plot)) if _BUSY[s])
+                    or c.moisture.count(0) < len(c)):
+                out.append(key)
+        return out
+
+    def empty_plots(self, key: int) -> list:
+        """Plots of chunk key that are empty."""
+        c, origin = self.chunks[key], self.origin(key)
+        return [origin + (j // CHUNK) * self.width + j % CHUNK
+                for j in compress(range(len(c)), c.state.translate(_EMPTY_BYTES))]
+
+    def grow_wild(self, n: int) -> None:
+        """n more plots of the ground not yet allocated have sprouted."""
+        n = min(n, self.wild_plots - self.wild_competing)
+        self.wild_competing += n
+        self.counts[Plot.EMPTY]     -= n
+        self.counts[Plot.COMPETING] += n
+
+    # ── As a Garden ──
+
+    def neighbours(self, i: int) -> list:
+        """As Garden.neighbours on a bounded grid, across the whole grid.
+        Worked out on each call: tables for every plot (engine/topology.py)
+        would cost the memory the chunks save."""
+        w = self.width
+        x = i % w
+        out = []
+        if i + w < len(self):
+            out.append(i + w)
+        if i >= w:
+            out.append(i - w)
+        if x + 1 < w:
+            out.append(i + 1)
+        if x:
+            out.append(i - 1)
+        return out
+
+    def __len__(self) -> int:
+        return self.width * self.height
+
+    def __getitem__(self, i: int) -> PlotView:
+        if not 0 <= i < len(self):
+            raise IndexError("garden index out of range")
+        return PlotView(self, i)
+
+    def __getattr__(self, name: str):
+        # Plot fields read as whole-grid columns
+        if name in ("state", "soil", "moisture", "age", "fruit_age",
+                    "near_living", "near_fruiting"):
+            return _Column(self, name)
+        raise AttributeError(name)
+
+    def writable(self, name: str) -> _Column:
+        return _Column(self, name)
+
+    def set_moisture(self, i: int, moisture: int) -> None:
+        self.writable("moisture")[i] = moisture
+
+    def record(self, i: int):
+        key, j = self.locate(i)
+        return self.chunk(key).record(j)
+
+    def set_state(self, i: int, state: int) -> None:
+        key, j = self.locate(i)
+        c = self.chunk(key)
+        old = c.state[j]
+        c.set_state(j, state)   # the chunk's own counts and neighbours
+        self.counts[old]   -= 1
+        self.counts[state] += 1
+        living   = _LIVING[state] - _LIVING[old]
+        fruiting = _FRUITING[state] - _FRUITING[old]
+        if living or fruiting:
+            for n in self.neighbours(i):
+                other, jn = self.locate(n)
+                if other != key and other in self.chunks:
+                    near = self.chunks[other]
+                    near.writable("near_living")[jn]   += living
+                    near.writable("near_fruiting")[jn] += fruiting
+        if self._network is not None:
+            self._network.update(i, old, state)
+
+    def living(self):
+        """(plot, state) for each living plot, chunk by chunk."""
+        for key in sorted(self.chunks):
+            origin = self.origin(key)
+            for j, s in self.chunks[key].living():
+                yield origin + (j // CHUNK) * self.width + j % CHUNK, s
+
+    def by_state(self) -> "ChunkScan":
+        """As Garden.by_state, answered by scanning the chunks in use."""
+        return ChunkScan(self)
+
+    def network(self) -> Network:
+        if self._network is None:
+            self._network = Network(self)
+        return self._network
+
+    def fork(self) -> "SparseGarden":
+        """A SparseGarden sharing every chunk's columns until written."""
+        g = SparseGarden.__new__(SparseGarden)
+        g.width, g.height = self.width, self.height
+        g.chunks = {key: c.fork() for key, c in self.chunks.items()}
+        g.counts = list(self.counts)
+        g.wild_plots, g.wild_competing = self.wild_plots, self.wild_competing
+        g._network = None
+        return g
+
+    def tally(self) -> list:
+        """Number of plots in each state, indexed by Plot code."""
+        if CHECKED:
+            self.check()
+        return list(self.counts)
+
+    def check(self) -> None:
+        """AssertionError if the counts kept disagree with the chunks."""
+        counts = [0] * len(Plot)
+        counts[Plot.EMPTY]     = self.wild_plots - self.wild_competing
+        counts[Plot.COMPETING] = self.wild_competing
+        for key, c in self.chunks.items():
+            if c.counts != c._count_states():
+                raise AssertionError("sparse garden chunk counts out of step")
+            for s, n in enumerate(c.counts):
+                counts[s] += n
+            origin = self.origin(key)
+            for j in range(len(c)):
+                i = origin + (j // CHUNK) * self.width + j % CHUNK
+                living = fruiting = 0
+                for n in self.neighbours(i):
+                    other, jn = self.locate(n)
+                    if other in self.chunks:
+                        s = self.chunks[other].state[jn]
+                        living   += _LIVING[s]
+                        fruiting += _FRUITING[s]
+                if (c.near_living[j], c.near_fruiting[j]) != (living, fruiting):
+                    raise AssertionError("sparse garden neighbour counts out of step")
+        if counts != self.counts:
+            raise AssertionError("sparse garden counts out of step with its chunks")
+
+    def __repr__(self) -> str:
+        return (f"SparseGarden({self.width}x{self.height}, "
+                f"{len(self.chunks)} chunks in use)")
+
+
+class ChunkScan:
+    """The queries of engine.stateindex.StateIndex over a SparseGarden,
+    each a scan of the chunks in use a column at a time. Ground never
+    touched is left out: it has no plots anything can be done to but
+    empty or competing ones, and those are only placed once their chunk
+    is allocated."""
+
+    __slots__ = ("_garden",)
+
+    def __init__(self, garden: SparseGarden) -> None:
+        self._garden = garden
+
+    def plots(self, state: int) -> list:
+        """The plots in state, chunk by chunk."""
+        g = self._garden
+        table = _marks((state,))
+        return [g.origin(key) + (j // CHUNK) * g.width + j % CHUNK
+                for key in sorted(g.chunks)
+                for j in compress(range(CHUNK * CHUNK),
+                                  g.chunks[key].state.translate(table))]
+
+    def pick(self, states, rng=random) -> int | None:
+        """A plot in any of states, each as likely as any other, or None."""
+        plots = [i for s in states for i in self.plots(s)]
+        return plots[rng.randrange(len(plots))] if plots else None
+
+    def first(self, states) -> int | None:
+        """The lowest numbered plot in any of states, or None."""
+        table = _marks(states)
+        return self._lowest(lambda c: c.state.translate(table))
+
+    def frontier(self) -> int | None:
+        """The lowest numbered empty plot next to a living one, or None."""
+        return self._lowest(lambda c: _both(c.state.translate(_EMPTY_BYTES),
+                                            c.near_living.translate(_SOME)))
+
+    def driest(self, states) -> int | None:
+        """The plot in any of states with the least moisture, the lowest
+        numbered of them on a tie, or None."""
+        table = _marks(states)
+        for level in _AT_LEVEL:
+            i = self._lowest(lambda c: _both(c.state.translate(table),
+                                             bytes(c.moisture).translate(level)))
+            if i is not None:
+                return i
+        return None
+
+    def _lowest(self, marked) -> int | None:
+        # The lowest numbered plot set in marked(chunk), a 0/1 byte mask
+        g, found = self._garden, None
+        for key, c in g.chunks.items():
+            j = marked(c).find(1)
+            if j >= 0:
+                i = g.origin(key) + (j // CHUNK) * g.width + j % CHUNK
+                if found is None or i < found:
+                    found = i
+        return found
+
+
+def _marks(states) -> bytes:
+    """translate() table marking the given states."""
+    return bytes(c in states for c in range(256))
+
+
+def _both(a: bytes, b: bytes) -> bytes:
+    """Where two 0/1 byte masks are both set."""
+    n = len(a)
+    return (int.from_bytes(a, "little") & int.from_bytes(b, "little")).to_bytes(n, "little")
+
+
+def _edge(side: int) -> list:
+    """Indices of the plots on the edge of a side x side chunk."""
+    return [j for j in range(side * side)
+            if j < side or j >= side * (side - 1)
+            or j % side in (0, side - 1)]
@@ -1,16 +1,27 @@
 # engine/state.py
-# Game state — single source of truth. Save/load via JSON.
+# Game state — single source of truth. Save/load via binary snapshot + journal.
 
 import json
 import os
 import time
 import random
-from dataclasses import dataclass, field
+from collections.abc import MutableSequence
+from dataclasses import dataclass, field, replace
 from typing import Optional
 
-SAVE_DIR  = os.path.expanduser("~/.quietcurrent")
-SAVE_FILE = os.path.join(SAVE_DIR, "save.json")
-VERSION   = "0.2.0"
+from engine.codec import CodecError
+from engine.codes import Plot, Bloom, PLOT_LETTERS, BLOOM_LETTERS, BLOOM_CODES
+from engine.plotgrid import Garden
+from engine.sparsegrid import SparseGarden
+
+SAVE_DIR      = os.path.expanduser("~/.quietcurrent")
+SNAPSHOT_FILE = os.path.join(SAVE_DIR, "save.bin")    # single-file binary saves
+SAVE_FILE     = os.path.join(SAVE_DIR, "save.json")   # pre-binary saves
+VERSION   = "0.3.0"
+
+# Journaled saves append a small delta per action (see engine/journal.py).
+# When off, every save rewrites the full snapshot.
+JOURNALED = True
 
 GARDEN_W = 12
 GARDEN_H = 8
@@ -18,24 +29,63 @@ GARDEN_SIZE = GARDEN_W * GARDEN_H
 
 RESIDENT_MAX = 8
 
+# Save shards. Each is written only when something in it changed; "core"
+# holds every field not listed here and is written on every save.
+SHARDS = ("core", "garden", "flowers", "residents", "exploration")
+SHARD_FIELDS = {
+    "garden":      ("garden",),
+    "flowers":     ("flowers",),
+    "residents":   ("residents",),
+    "exploration": ("explore_map", "explore_visited"),
+}
+_FIELD_SHARD = {f: shard for shard, fields in SHARD_FIELDS.items() for f in fields}
+
+# Shards left on disk at load until the game first touches one of their
+# fields. The splash screen and passive ticks read the counts cached in
+# GameState.summaries instead.
+LAZY_SHARDS = ("garden", "flowers", "exploration")
+
+# Runtime-only GameState fields, never saved
+_TRANSIENT = ("dirty", "lazy")
 
-@dataclass
-class PlotState:
-    state:     str = "E"   # E H N M F X W
-    soil:      int = 1     # 1-5 substrate richness
-    moisture:  int = 0     # 0-5
-    age:       int = 0     # ticks since inoculated
-    fruit_age: int = 0     # ticks spent in F state
 
+# Plots are PlotState records in engine/plotgrid.py, stored by column
 
-@dataclass
+
+@dataclass(slots=True)
 class Resident:
     name:  str
     mood:  int = 2    # 3=thriving 2=stable 1=uneasy 0=departing
     days:  int = 0
 
+    @classmethod
+    def from_dict(cls, d: dict) -> "Resident":
+        return cls(d["name"], d.get("mood", 2), d.get("days", 0))
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "mood": self.mood, "days": self.days}
+
+
+# Panel condition bits in GameState.panel_conditions
+PANEL_DUST      = 1
+PANEL_WIRE      = 2
+PANEL_DEBRIS    = 4
+PANEL_CONNECTOR = 8
 
-@dataclass
+
+def _panel_flag(bit: int) -> property:
+    def get(self) -> bool:
+        return bool(self.panel_conditions & bit)
+
+    def set(self, on: bool) -> None:
+        if on:
+            self.panel_conditions |= bit
+        else:
+            self.panel_conditions &= ~bit
+    return property(get, set)
+
+
+@dataclass(slots=True)
 class GameState:
     # Identity
     settlement_name:     str   = "unnamed"
@@ -44,10 +94,13 @@ class GameState:
     # Panel
     panel_state:         str   = "neglected"   # neglected cleaned connected
     panel_efficiency:    int   = 100
-    panel_dust:          bool  = False
-    panel_wire:          bool  = False
-    panel_debris:        bool  = False
-    panel_connector:     bool  = False
+    panel_conditions:    int   = 0     # PANEL_* bits; see engine/panel.py
+
+    # The conditions one at a time; older saves stored these as fields
+    panel_dust      = _panel_flag(PANEL_DUST)
+    panel_wire      = _panel_flag(PANEL_WIRE)
+    panel_debris    = _panel_flag(PANEL_DEBRIS)
+    panel_connector = _panel_flag(PANEL_CONNECTOR)
 
     # Resources
     power:    int = 0
@@ -85,11 +138,11 @@ class GameState:
     wanderer_count:      int   = 0
 
     # Residents
-    residents: list = field(default_factory=list)   # list of Resident dicts
+    residents: list = field(default_factory=list)   # list of Resident
 
     # Garden
     garden_initialized:  bool  = False
-    garden:              list  = field(default_factory=list)   # GARDEN_SIZE PlotState dicts
+    garden:              Garden = field(default_factory=Garden)   # GARDEN_SIZE plots
 
     # Flower garden
     has_flower_garden:           bool  = False
@@ -105,96 +158,279 @@ class GameState:
     explore_map:         list  = field(default_factory=list)   # flat MAP_W*MAP_H chars
     explore_visited:     list  = field(default_factory=list)   # [[x,y], ...]
 
+    # State counts of the garden and flowers as last saved (see state_counts)
+    summaries:           dict  = field(default_factory=dict)
+
     # Timestamps
     last_seen:           float = field(default_factory=time.time)
 
+    # Shards changed since the last save (see mark_dirty)
+    dirty: set = field(default_factory=lambda: set(SHARDS),
+                       repr=False, compare=False)
+    # Loaders for fields still on disk, keyed by field name
+    lazy:  dict = field(default_factory=dict, repr=False, compare=False)
+
+    def __getattr__(self, name: str):
+        # Only reached for slots not set yet: lazily loaded fields
+        if name == "lazy":
+            raise AttributeError(name)
+        loader = self.lazy.pop(name, None)
+        if loader is None:
+            raise AttributeError(name)
+        value = loader()
+        setattr(self, name, value)
+        return value
+
     def resident_count(self) -> int:
         return len(self.residents)
 
     def active_garden_plots(self) -> int:
-        return sum(
-            1 for p in self.garden
-            if p.get("state") in ("N", "M", "F")
-        )
+        counts = state_counts(self, "garden")
+        return counts[Plot.NETWORK] + counts[Plot.MATURE] + counts[Plot.FRUITING]
 
     def weedy_plots(self) -> int:
-        return sum(1 for p in self.garden if p.get("state") == "W")
+        return state_counts(self, "garden")[Plot.COMPETING]
 
 
 # ── Serialization ────────────────────────────────────────────
 
+def shard_of(key: str) -> str:
+    return _FIELD_SHARD.get(key, "core")
+
+
+def mark_dirty(gs: GameState, *shards: str) -> None:
+    """Flag shards for the next save. Engine code that mutates the garden,
+    flowers, residents or exploration map calls this."""
+    gs.dirty.update(shards)
+
+
+def is_loaded(gs: GameState, name: str) -> bool:
+    return name not in gs.lazy
+
+
+# Every GameState field, in declaration order
+STATE_FIELDS = tuple(GameState.__dataclass_fields__)
+
+# Properties that older saves stored as fields
+_SAVED_FLAGS = ("panel_dust", "panel_wire", "panel_debris", "panel_connector")
+
+
+def loaded_items(gs: GameState):
+    """(name, value) for each field in memory, skipping those still on disk.
+    GameState is slotted, so this stands in for gs.__dict__.items()."""
+    lazy = gs.lazy
+    return [(k, getattr(gs, k)) for k in STATE_FIELDS if k not in lazy]
+
+
+# State letters of each tallied field, indexed by code
+_LETTERS = {"garden": PLOT_LETTERS, "flowers": BLOOM_LETTERS}
+
+
+def _tally(items) -> list:
+    if hasattr(items, "tally"):   # a Garden or SparseGarden
+        return items.tally()
+    counts = [0] * len(Bloom)
+    for item in items:
+        counts[item["state"]] += 1
+    return counts
+
+
+def state_counts(gs: GameState, name: str) -> list:
+    """Number of garden plots or flower slots in each state, indexed by
+    code. Served from the saved summary while the field is still on disk."""
+    if not is_loaded(gs, name) and name in gs.summaries:
+        saved = gs.summaries[name]
+        return [saved.get(letter, 0) for letter in _LETTERS[name]]
+    return _tally(getattr(gs, name))
+
+
+def _summarize(gs: GameState, load: bool = False) -> None:
+    """Refresh the summaries of whichever of garden/flowers are loaded, or
+    of both if load is set. Summaries are saved, so they key by letter."""
+    for name in ("garden", "flowers"):
+        if load or is_loaded(gs, name):
+            counts = _tally(getattr(gs, name))
+            gs.summaries[name] = {letter: n for letter, n
+                                  in zip(_LETTERS[name], counts) if n}
+    if load or is_loaded(gs, "garden"):
+        gs.summaries["network"] = gs.garden.network().largest()
+    if load or is_loaded(gs, "flowers"):
+        gs.summaries["blooming"] = [s["flower"] for s in gs.flowers
+                                    if s["state"] == Bloom.FLOWERING]
+
+
+# Plot and flower states are codes in memory and letters on disk
+
+def _to_saved(k: str, v):
+    if isinstance(v, Garden):
+        return v.to_dicts()
+    if k == "flowers":
+        return [{**s, "state": BLOOM_LETTERS[s["state"]]} for s in v]
+    if k == "residents":
+        return [r.to_dict() for r in v]
+    return v
+
+
+def _from_saved(k: str, v):
+    if k == "garden" and isinstance(v, list):
+        return Garden.from_dicts(v, GARDEN_W)
+    if k == "flowers" and isinstance(v, list):
+        return [{**s, "state": BLOOM_CODES.get(s.get("state"), Bloom.EMPTY)}
+                for s in v]
+    if k == "residents" and isinstance(v, list):
+        return [Resident.from_dict(r) for r in v]
+    return v
+
+
 def _state_to_dict(gs: GameState) -> dict:
-    d = {k: v for k, v in gs.__dict__.items()}
+    for name in list(gs.lazy):
+        getattr(gs, name)
+    d = {k: _to_saved(k, v) for k, v in loaded_items(gs) if k not in _TRANSIENT}
     return d
 
 
 def _dict_to_state(d: dict) -> GameState:
     gs = GameState()
     for k, v in d.items():
-        if hasattr(gs, k):
+        if k in STATE_FIELDS and k not in _TRANSIENT:
+            setattr(gs, k, _from_saved(k, v))
+        elif k in _SAVED_FLAGS:
             setattr(gs, k, v)
     return gs
 
 
 # ── Save / Load ──────────────────────────────────────────────
 
-def save_game(gs: GameState) -> None:
-    os.makedirs(SAVE_DIR, exist_ok=True)
+def _detach(v):
+    if isinstance(v, Garden):
+        return v.fork()   # columns are copied on write, so this shares nothing
+    if isinstance(v, Resident):
+        return replace(v)
+    if isinstance(v, MutableSequence):   # lists, and engine.fork.CowList
+        return [_detach(x) for x in v]
+    if isinstance(v, dict):
+        return {k: _detach(x) for k, x in v.items()}
+    return v
+
+
+def snapshot_state(gs: GameState) -> dict:
+    """Stamp last_seen and return a saveable copy sharing nothing with gs.
+    Holds the core fields plus the fields of dirty shards only, and clears
+    the dirty set. Safe to hand to another thread. ValueError for a
+    SparseGarden, which saves do not hold."""
+    if is_loaded(gs, "garden") and isinstance(gs.garden, SparseGarden):
+        raise ValueError("a sparse garden cannot be saved")
     gs.last_seen = time.time()
-    with open(SAVE_FILE, "w") as f:
-        json.dump(_state_to_dict(gs), f, indent=2)
+    if gs.dirty & {"garden", "flowers"}:
+        _summarize(gs)
+    clean = {f for shard, fields in SHARD_FIELDS.items()
+             if shard not in gs.dirty for f in fields}
+    gs.dirty.clear()
+    # Fields still on disk are unchanged, so loaded_items never has them here
+    return {k: _detach(v) for k, v in loaded_items(gs)
+            if k not in clean and k not in _TRANSIENT}
+
+
+def write_state(d: dict) -> None:
+    """Persist a snapshot_state() dict. Does the disk I/O."""
+    from engine.journal import JOURNAL
+    from engine import history
+    d = {k: _to_saved(k, v) for k, v in d.items()}
+    if JOURNALED:
+        rec = JOURNAL.record(d)
+    else:
+        rec = JOURNAL.compact(d)
+    if history.ENABLED:
+        history.HISTORY.record(rec, JOURNAL.state())
 
 
-_OLD_STATE_MAP = {"D": "E", "P": "E", "G": "H", "R": "M"}
+def save_game(gs: GameState) -> None:
+    """Synchronous save. The game loop goes through engine.autosave."""
+    write_state(snapshot_state(gs))
 
 
-def load_game() -> Optional[GameState]:
-    if not os.path.exists(SAVE_FILE):
-        return None
+# ── Migrations ───────────────────────────────────────────────
+# Each migration takes the loaded GameState and the raw saved core dict and
+# brings the save up to its version. load_game runs the ones newer than the
+# version stamped on the save, oldest first, then stamps VERSION. Saves from
+# before 0.3.0 were fixed up on every launch instead, whatever their stamp,
+# so all of those fixups sit under 0.3.0.
+
+def _migrate_renames(gs: GameState, raw: dict) -> None:
+    # Rename seeds → spores in saved data
+    if "seeds" in raw and "spores" not in raw:
+        gs.spores = raw["seeds"]
+
+    # Old garden plot states (D P G R) were read as their current codes by
+    # Garden.from_dicts (see engine.codes.PLOT_CODES), which also dropped
+    # growth (age restarts at 0 — growth% doesn't map to ticks) and crop.
+    # Rewrite the garden so the old letters leave the save.
+    if gs.garden:
+        mark_dirty(gs, "garden")
+
+
+def _migrate_summaries(gs: GameState, raw: dict) -> None:
+    # Summaries let later launches skip loading the garden and flowers
+    _summarize(gs, load=True)
+
+
+MIGRATIONS = [
+    ("0.3.0", _migrate_renames),
+    ("0.3.0", _migrate_summaries),
+]
+
+
+def _version_key(v: str) -> tuple:
     try:
-        with open(SAVE_FILE) as f:
-            d = json.load(f)
+        return tuple(int(x) for x in v.split("."))
+    except ValueError:
+        return (0,)
+
+
+def _lazy_loader(name: str):
+    from engine.journal import JOURNAL
+    default = GameState.__dataclass_fields__[name].default_factory
+
+    def load():
+        value = JOURNAL.field(name)
+        return default() if value is None else _from_saved(name, value)
+    return load
 
-        # Rename seeds → spores in saved data
-        if "seeds" in d and "spores" not in d:
-            d["spores"] = d.pop("seeds")
+
+def load_game() -> Optional[GameState]:
+    from engine.journal import JOURNAL
+    try:
+        d = JOURNAL.load(lazy=True)
+        if d is None:
+            return None
 
         gs = _dict_to_state(d)
+        gs.dirty = set()   # matches what is on disk, bar the migrations below
+        for name in JOURNAL.lazy_fields():
+            delattr(gs, name)
+            gs.lazy[name] = _lazy_loader(name)
 
-        # Migrate old saves — fill missing fields with defaults
+        # Fill missing fields with defaults
         default = GameState()
-        for k, v in default.__dict__.items():
-            if not hasattr(gs, k) or getattr(gs, k) is None:
+        for k, v in loaded_items(default):
+            if is_loaded(gs, k) and getattr(gs, k) is None:
                 setattr(gs, k, v)
+                mark_dirty(gs, shard_of(k))
 
-        # Migrate old garden plot states
-        if gs.garden:
-            for p in gs.garden:
-                old_state = p.get("state", "E")
-                if old_state in _OLD_STATE_MAP:
-                    p["state"] = _OLD_STATE_MAP[old_state]
-                # Rename growth → age if present
-                if "growth" in p and "age" not in p:
-                    p["age"] = 0   # reset — growth% doesn't map to ticks
-                    del p["growth"]
-                elif "growth" in p:
-                    del p["growth"]
-                # Remove crop field
-                p.pop("crop", None)
-                # Ensure new fields exist
-                if "age" not in p:
-                    p["age"] = 0
-                if "fruit_age" not in p:
-                    p["fruit_age"] = 0
+        saved = _version_key(d.get("version", "0.0.0"))
+        for version, migrate in MIGRATIONS:
+            if saved < _version_key(version):
+                migrate(gs, d)
+        gs.version = VERSION
 
         return gs
-    except (json.JSONDecodeError, KeyError):
+    except (json.JSONDecodeError, CodecError, KeyError):
         return None
 
 
 def delete_save() -> None:
-    if os.path.exists(SAVE_FILE):
-        os.remove(SAVE_FILE)
+    from engine.journal import JOURNAL
+    JOURNAL.delete()
 
 
 # ── Time ─────────────────────────────────────────────────────
@@ -206,17 +442,14 @@ def days_since_last_seen(gs: GameState) -> int:
 
 # ── Garden helpers ───────────────────────────────────────────
 
-def init_garden() -> list:
-    plots = []
-    for _ in range(GARDEN_SIZE):
-        plots.append({
-            "state":     "E",
-            "soil":      random.randint(1, 2),
-            "moisture":  0,
-            "age":       0,
-            "fruit_age": 0,
-        })
-    return plots
+def init_garden(size: int = GARDEN_SIZE, width: int = GARDEN_W,
+                topology=None) -> Garden:
+    """A fresh garden: size plots width to a row, or the plots of topology
+    (see engine/topology.py) if given."""
+    garden = Garden(size, width, topology)
+    for i in range(len(garden)):
+        garden.soil[i] = random.randint(1, 2)
+    return garden
 
 
 def plot_idx(x: int, y: int) -> int:
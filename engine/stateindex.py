@@ -0,0 +1,187 @@
+# engine/stateindex.py
+# Which plots are in each state, for code that wants "a random living plot"
+# or "the first empty plot next to the network" without walking the whole
+# garden. A Garden builds one the first time it is asked (Garden.by_state())
+# and keeps it current from set_state; a bulk state change (set_states,
+# recount) drops it, to be rebuilt on the next query.
+#
+# Each state's plots are held in a list, in no particular order, and every
+# plot's position in its list in one array, so a plot moves between states
+# in constant time (swapped out with its list's last plot) and a random
+# pick is one draw.
+#
+# Queries in plot order read min-heaps of plot numbers, built the first
+# time each is asked for: per state, per state and moisture level, and of
+# the frontier (empty plots next to a living one). Entries are pushed as
+# plots change and never removed, so a heap's top is checked against the
+# columns and popped if it no longer belongs; a query costs O(log n) over
+# the plots that have moved since. Moisture is written straight into its
+# column by the engines, so the moisture heaps are dropped whenever the
+# column is fetched for writing (Garden.writable) and rebuilt in bulk when
+# next asked; single plot writes (Garden.set_moisture) push instead.
+
+import random
+from array import array
+from heapq import heappop, heappush
+from itertools import compress
+
+from engine.codes import Plot, lookup
+
+# translate() tables over the state column, one per state
+_IN_STATE = [bytes(c == s for c in range(256)) for s in Plot]
+
+# Moisture levels, 0-5 as in engine/moisture.py, and a translate() table
+# over the moisture column for each
+LEVELS    = range(6)
+_AT_LEVEL = [bytes(c == m for c in range(256)) for m in LEVELS]
+
+# translate() table marking non-zero bytes, for the neighbour counts
+_SOME = bytes(c > 0 for c in range(256))
+
+_LIVING = lookup(Plot, (Plot.HYPHA, Plot.NETWORK, Plot.MATURE, Plot.FRUITING))
+
+# A heap may hold this many entries past the plots it can still return
+# before it is rebuilt
+_SLACK = 64
+
+
+class StateIndex:
+    """The plots of one Garden, by state."""
+
+    __slots__ = ("_garden", "_plots", "_pos", "_order", "_wet", "_frontier")
+
+    def __init__(self, garden) -> None:
+        self._garden = garden
+        states = garden.state
+        self._plots = [list(compress(range(len(states)),
+                                     states.translate(_IN_STATE[s])))
+                       for s in Plot]
+        self._pos = array("I", bytes(4 * len(states)))   # plot → place in its list
+        for plots in self._plots:
+            for k, i in enumerate(plots):
+                self._pos[i] = k
+        self._order: list = [None] * len(Plot)   # state → heap of its plots
+        self._wet:   list = [None] * len(Plot)   # state → heap per level
+        self._frontier = None
+
+    def update(self, i: int, old: int, new: int) -> None:
+        """Plot i has changed from state old to new."""
+        if old == new:
+            return
+        plots, k = self._plots[old], self._pos[i]
+        last = plots.pop()
+        if last != i:
+            plots[k] = last
+            self._pos[last] = k
+        self._pos[i] = len(self._plots[new])
+        self._plots[new].append(i)
+
+        g = self._garden
+        if self._order[new] is not None:
+            heappush(self._order[new], i)
+        self._wetted(i, new)
+        if self._frontier is not None:
+            if new == Plot.EMPTY and g.near_living[i]:
+                heappush(self._frontier, i)
+            elif _LIVING[new] and not _LIVING[old]:
+                states = g.state
+                for n in g.neighbours(i):
+                    if states[n] == Plot.EMPTY:
+                        heappush(self._frontier, n)
+
+    def moisture_set(self, i: int) -> None:
+        """Plot i's moisture has been written on its own."""
+        self._wetted(i, self._garden.state[i])
+
+    def moisture_written(self) -> None:
+        """The moisture column is about to be written in bulk."""
+        self._wet = [None] * len(Plot)
+
+    # ── Queries ──
+
+    def plots(self, state: int) -> list:
+        """The plots in state, in no particular order. Not to be changed."""
+        return self._plots[state]
+
+    def pick(self, states, rng=random) -> int | None:
+        """A plot in any of states, each as likely as any other, or None."""
+        k = rng.randrange(sum(len(self._plots[s]) for s in states) or 1)
+        for s in states:
+            if k < len(self._plots[s]):
+                return self._plots[s][k]
+            k -= len(self._plots[s])
+        return None
+
+    def first(self, states) -> int | None:
+        """The lowest numbered plot in any of states, or None; the one a
+        scan in plot order would find."""
+        found = [i for s in states
+                 if (i := self._top(self._ordered(s), s)) is not None]
+        return min(found, default=None)
+
+    def frontier(self) -> int | None:
+        """The lowest numbered empty plot next to a living one, or None."""
+        g = self._garden
+        if (self._frontier is None or len(self._frontier)
+                > len(self._plots[Plot.EMPTY]) + _SLACK):
+            mask = (int.from_bytes(g.state.translate(_IN_STATE[Plot.EMPTY]), "little")
+                    & int.from_bytes(g.near_living.translate(_SOME), "little"))
+            self._frontier = _ascending(mask, len(g.state))
+        heap, states, near = self._frontier, g.state, g.near_living
+        while heap and (states[heap[0]] != Plot.EMPTY or not near[heap[0]]):
+            heappop(heap)
+        return heap[0] if heap else None
+
+    def driest(self, states) -> int | None:
+        """The plot in any of states with the least moisture, the lowest
+        numbered of them on a tie, or None."""
+        wet = [self._levels(s) for s in states]
+        for m in LEVELS:
+            found = [i for s, heaps in zip(states, wet)
+                     if (i := self._top(heaps[m], s, m)) is not None]
+            if found:
+                return min(found)
+        return None
+
+    # ── Heaps ──
+
+    def _ordered(self, s: int) -> list:
+        heap = self._order[s]
+        if heap is None or len(heap) > len(self._plots[s]) + _SLACK:
+            heap = self._order[s] = sorted(self._plots[s])
+        return heap
+
+    def _levels(self, s: int) -> list:
+        wet = self._wet[s]
+        if wet is None or sum(map(len, wet)) > len(self._plots[s]) + _SLACK:
+            g = self._garden
+            n = len(g.state)
+            ours = int.from_bytes(g.state.translate(_IN_STATE[s]), "little")
+            moisture = bytes(g.moisture)
+            wet = self._wet[s] = [
+                _ascending(ours & int.from_bytes(moisture.translate(_AT_LEVEL[m]),
+                                                 "little"), n)
+                for m in LEVELS]
+        return wet
+
+    def _wetted(self, i: int, s: int) -> None:
+        # Plot i, in state s, may be at a new moisture level
+        wet, m = self._wet[s], self._garden.moisture[i]
+        if wet is not None and m in LEVELS:
+            heappush(wet[m], i)
+
+    def _top(self, heap: list, s: int, m: int | None = None) -> int | None:
+        # The heap's lowest plot still in state s (and at moisture m),
+        # popping those that have left
+        states, moisture = self._garden.state, self._garden.moisture
+        while heap and (states[heap[0]] != s
+                        or m is not None and moisture[heap[0]] != m):
+            heappop(heap)
+        return heap[0] if heap else None
+
+
+def _ascending(mask: int, n: int) -> list:
+    """The plots set in a mask of one byte per plot, in order: a heap."""
+    if not mask:
+        return []
+    return list(compress(range(n), mask.to_bytes(n, "little")))
@@ -0,0 +1,151 @@
+# engine/topology.py
+# Which slots are next to which, worked out once per shape. A Topology holds
+# every slot's neighbours in two flat arrays, CSR fashion: the neighbours of
+# slot i are index[offsets[i]:offsets[i + 1]]. Engines walk those instead of
+# stepping through (dx, dy) offsets and checking bounds, so a new layout is
+# a new builder here and nothing else.
+#
+# Builders:
+#   grid(w, h)       bounded rectangle, four neighbours
+#   torus(w, h)      rectangle whose edges wrap round
+#   hex(w, h)        rows of hexagons, odd rows shifted half a slot right
+#   lattice(...)     slots at given positions, joined by given steps
+#   graph(adj)       any symmetric neighbour lists
+#
+# Neighbour counts (Garden.near_living and the like) are only right if
+# adjacency is symmetric, so graph() refuses lists that are not.
+
+from array import array
+from functools import lru_cache
+
+
+class Topology:
+    """Neighbour lists for len(offsets) - 1 slots. width is the row length
+    for grid-like shapes (slot i is at x = i % width, y = i // width) and
+    the slot count for a general graph."""
+
+    __slots__ = ("kind", "width", "offsets", "index")
+
+    def __init__(self, kind: str, width: int, offsets: array, index: array) -> None:
+        self.kind    = kind
+        self.width   = width
+        self.offsets = offsets
+        self.index   = index
+
+    def neighbours(self, i: int) -> array:
+        return self.index[self.offsets[i]:self.offsets[i + 1]]
+
+    __getitem__ = neighbours
+
+    def degree(self, i: int) -> int:
+        return self.offsets[i + 1] - self.offsets[i]
+
+    def band(self, start: int, stop: int) -> tuple:
+        """(offsets, index) for slots start..stop alone, offsets counted
+        from 0 and index still holding whole-topology slot numbers."""
+        a, b = self.offsets[start], self.offsets[stop]
+        return (array("I", (o - a for o in self.offsets[start:stop + 1])),
+                self.index[a:b])
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __repr__(self) -> str:
+        return f"Topology({self.kind}, {len(self)} slots)"
+
+
+def _pack(kind: str, width: int, adjacency) -> Topology:
+    offsets = array("I", [0])
+    index   = array("I")
+    for nbrs in adjacency:
+        index.extend(nbrs)
+        offsets.append(len(index))
+    return Topology(kind, width, offsets, index)
+
+
+def links(neighbours, start: int, stop: int) -> tuple:
+    """Topology.band for a shape with no tables, from its neighbours(i)."""
+    t = _pack("", 0, map(neighbours, range(start, stop)))
+    return t.offsets, t.index
+
+
+# ── Builders ──────────────────────────────────────────────────
+
+def _unique(i: int, nbrs) -> list:
+    # Small wrapped shapes reach the same slot, or themselves, more than
+    # once; each neighbour counts once
+    out = []
+    for n in nbrs:
+        if n != i and n not in out:
+            out.append(n)
+    return out
+
+
+@lru_cache(maxsize=None)
+def grid(w: int, h: int, n: int | None = None) -> Topology:
+    """A bounded w x h rectangle, or its first n slots if its last row is
+    short. Neighbours come in the order (0, 1), (0, -1), (1, 0), (-1, 0)
+    as (dx, dy), the garden engines'."""
+    if n is None:
+        n = w * h
+    def adjacent(i):
+        out = []
+        if i + w < n:
+            out.append(i + w)
+        if i >= w:
+            out.append(i - w)
+        if (i + 1) % w and i + 1 < n:
+            out.append(i + 1)
+        if i % w:
+            out.append(i - 1)
+        return out
+    return _pack("grid", w, map(adjacent, range(n)))
+
+
+@lru_cache(maxsize=None)
+def torus(w: int, h: int) -> Topology:
+    """grid(w, h) with each edge joined to the one opposite."""
+    def adjacent(i):
+        x, y = i % w, i // w
+        return _unique(i, (((y + 1) % h) * w + x, ((y - 1) % h) * w + x,
+                           y * w + (x + 1) % w, y * w + (x - 1) % w))
+    return _pack("torus", w, map(adjacent, range(w * h)))
+
+
+# Hex steps as (dx, dy) for even and odd rows ("odd-r" offset rows)
+_HEX_STEPS = (((1, 0), (-1, 0), (0, -1), (-1, -1), (0, 1), (-1, 1)),
+              ((1, 0), (-1, 0), (1, -1), (0, -1), (1, 1), (0, 1)))
+
+
+@lru_cache(maxsize=None)
+def hex(w: int, h: int) -> Topology:
+    """w x h hexagons, six neighbours each, odd rows shifted half a slot
+    to the right."""
+    def adjacent(i):
+        x, y = i % w, i // w
+        return [(y + dy) * w + x + dx for dx, dy in _HEX_STEPS[y & 1]
+                if 0 <= x + dx < w and 0 <= y + dy < h]
+    return _pack("hex", w, map(adjacent, range(w * h)))
+
+
+def lattice(positions, steps) -> Topology:
+    """Slots at the given (row, col) positions, each next to whichever
+    slots lie one of steps (row delta, col delta) away, in steps order."""
+    where = {pos: i for i, pos in enumerate(positions)}
+    return graph([[where[(r + dr, c + dc)] for dr, dc in steps
+                   if (r + dr, c + dc) in where]
+                  for r, c in positions])
+
+
+def graph(adjacency) -> Topology:
+    """Slots 0..len(adjacency)-1, slot i next to each of adjacency[i].
+    ValueError if a neighbour is out of range or not listed back."""
+    adjacency = [_unique(i, nbrs) for i, nbrs in enumerate(adjacency)]
+    n = len(adjacency)
+    for i, nbrs in enumerate(adjacency):
+        for j in nbrs:
+            if not 0 <= j < n:
+                raise ValueError(f"slot {i} has neighbour {j}, out of range")
+            if i not in adjacency[j]:
+                raise ValueError(f"slot {j} does not list its neighbour {i}")
+    return _pack("graph", n, adjacency)
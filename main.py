@@ -6,7 +6,9 @@ import sys
 import random
 import time
 
-from engine.state import GameState, save_game, load_game, days_since_last_seen
+from engine.state import GameState, load_game, days_since_last_seen
+from engine import autosave
+from engine import history
 from engine import panel as pan
 from engine import garden as gdn
 from engine import residents as res
@@ -101,9 +103,9 @@ def game_loop(stdscr: curses.window, gs: GameState) -> None:
         if gs.residents:
             row += 1
             for r in gs.residents:
-                mood_pair = scr.MOOD_COLORS.get(r["mood"], scr.C_NORMAL)
-                mood_label = txt.MOOD_LABELS.get(r["mood"], "")
-                scr.addstr(stdscr, row, 2, f"{r['name']:<10}", scr.C_NORMAL)
+                mood_pair = scr.MOOD_COLORS.get(r.mood, scr.C_NORMAL)
+                mood_label = txt.MOOD_LABELS.get(r.mood, "")
+                scr.addstr(stdscr, row, 2, f"{r.name:<10}", scr.C_NORMAL)
                 scr.addstr(stdscr, row, 12, mood_label, mood_pair)
                 row += 1
 
@@ -123,6 +125,15 @@ def game_loop(stdscr: curses.window, gs: GameState) -> None:
             col += 10
         row += 3
 
+        # A save the writer could not make, or the run history could not
+        # record
+        error = autosave.take_error()
+        if error is not None:
+            flashes.append(txt.SAVE_FAILED.format(error=error))
+        error = history.HISTORY.take_error()
+        if error is not None:
+            flashes.append(txt.HISTORY_FAILED.format(error=error))
+
         # Flash messages
         for flash in flashes:
             scr.addstr(stdscr, row, 2, flash, scr.C_DIM)
@@ -173,13 +184,17 @@ def game_loop(stdscr: curses.window, gs: GameState) -> None:
                     cheat_pos = 0
                     gs.power = gs.water = gs.scrap = gs.spores = gs.mycelium = 50
                     flashes.append("something stirs. resources replenished.")
-                    save_game(gs)
+                    autosave.request(gs)
                 continue
             else:
                 cheat_pos = 0
 
         if key == "q":
-            save_game(gs)
+            autosave.request(gs)
+            try:
+                autosave.flush()
+            except Exception as error:
+                _save_failed(stdscr, error)
             break
 
         elif key == "1":
@@ -188,14 +203,14 @@ def game_loop(stdscr: curses.window, gs: GameState) -> None:
             _collect_flashes(flashes, result, ancestral,
                              tick.panel_flash, tick.resident_flash,
                              tick.passive_flash)
-            save_game(gs)
+            autosave.request(gs)
 
         elif key == "2":
             if gs.panel_state != "neglected" or gs.tend_count > 0:
                 result = _run_explore_prep(stdscr, gs)
                 if result:
                     flashes.append(result)
-                save_game(gs)
+                autosave.request(gs)
 
         elif key == "3":
             if _can_build(gs):
@@ -205,24 +220,24 @@ def game_loop(stdscr: curses.window, gs: GameState) -> None:
                 tick = world.tick_all(gs)
                 _collect_flashes(flashes, tick.panel_flash,
                                  tick.resident_flash, tick.passive_flash)
-                save_game(gs)
+                autosave.request(gs)
 
         elif key == "g" and gs.has_garden_bed:
             from ui.garden_view import run_garden
             run_garden(stdscr, gs)
-            save_game(gs)
+            autosave.request(gs)
 
         elif key == "t" and gs.has_tending_frame:
             run_frame_menu(stdscr, gs)
             tick = world.tick_all(gs)
             _collect_flashes(flashes, tick.panel_flash,
                              tick.resident_flash, tick.passive_flash)
-            save_game(gs)
+            autosave.request(gs)
 
         elif key == "f" and gs.has_flower_garden:
             from ui.flower_view import run_flower_garden
             run_flower_garden(stdscr, gs)
-            save_game(gs)
+            autosave.request(gs)
 
         elif key == "4" and current_wanderer:
             results = run_wanderer_menu(stdscr, gs, current_wanderer)
@@ -231,7 +246,7 @@ def game_loop(stdscr: curses.window, gs: GameState) -> None:
             tick = world.tick_all(gs)
             _collect_flashes(flashes, tick.panel_flash,
                              tick.resident_flash, tick.passive_flash)
-            save_game(gs)
+            autosave.request(gs)
 
         # Check wanderer arrival each action
         if not current_wanderer and key in ("1", "2", "3", "g", "t", "f"):
@@ -281,7 +296,7 @@ def do_tend(gs: GameState, stdscr) -> tuple[str, str | None]:
 
 
 def run_maintenance_menu(stdscr: curses.window, gs: GameState) -> str:
-    conditions = pan.active_conditions(gs)
+    conditions = pan.MAINTENANCE_MENU[gs.panel_conditions]
     if not conditions:
         return random.choice(txt.PANEL_MAINTAIN_OK)
 
@@ -292,10 +307,9 @@ def run_maintenance_menu(stdscr: curses.window, gs: GameState) -> str:
         scr.addstr(stdscr, 2, 2, "something needs attention.", scr.C_DIM)
 
         row = 4
-        for i, cond in enumerate(conditions):
+        for i, (cond, cost) in enumerate(conditions):
             prefix = "> " if i == selected else "  "
             label = txt.PANEL_CONDITION_LABELS[cond]
-            cost = pan.MAINTENANCE_COSTS.get(cond, 0)
             cost_str = f"(1 scrap)" if cost > 0 else "(free)"
             can_afford = gs.scrap >= cost
             pair = scr.C_NORMAL if can_afford else scr.C_DIM
@@ -316,8 +330,8 @@ def run_maintenance_menu(stdscr: curses.window, gs: GameState) -> str:
         elif key == "DOWN":
             selected = min(len(conditions) - 1, selected + 1)
         elif key in ("\n", "\r", " "):
-            cond = conditions[selected]
-            if gs.scrap < pan.MAINTENANCE_COSTS.get(cond, 0):
+            cond, cost = conditions[selected]
+            if gs.scrap < cost:
                 continue
             return pan.do_maintain(gs, cond)
         elif key in ("q", "Q", "ESC"):
@@ -539,18 +553,34 @@ def main(stdscr: curses.window) -> None:
     stdscr.keypad(True)
 
     gs = load_game()
+    autosave.start()
+
+    try:
+        if gs:
+            days = days_since_last_seen(gs)
+            gs.days_founded += max(0, days)
+            decay_msg = pan.apply_decay(gs, days)
+            show_splash(stdscr, gs, days, decay_msg)
+        else:
+            gs = title_screen(stdscr)
+            autosave.request(gs)
+            show_splash(stdscr, gs)
 
-    if gs:
-        days = days_since_last_seen(gs)
-        gs.days_founded += max(0, days)
-        decay_msg = pan.apply_decay(gs, days)
-        show_splash(stdscr, gs, days, decay_msg)
-    else:
-        gs = title_screen(stdscr)
-        save_game(gs)
-        show_splash(stdscr, gs)
-
-    game_loop(stdscr, gs)
+        game_loop(stdscr, gs)
+    finally:
+        try:
+            autosave.stop()
+        except Exception as error:
+            _save_failed(stdscr, error)
+
+
+def _save_failed(stdscr: curses.window, error: Exception) -> None:
+    """Show a save that failed on the way out, while curses still owns the
+    screen, rather than a traceback after it lets go."""
+    stdscr.erase()
+    scr.addstr(stdscr, 3, 2, txt.SAVE_FAILED.format(error=error), scr.C_DIM)
+    stdscr.refresh()
+    curses.napms(1500)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,5 @@
+# Saves go under a temporary HOME, never the player's
+import os
+import tempfile
+
+os.environ["HOME"] = tempfile.mkdtemp(prefix="quietcurrent-tests-")
@@ -0,0 +1,48 @@
+# Damaged binary saves read as CodecError, never as a crash
+
+import pytest
+
+from engine import flowers, garden
+from engine.codec import CodecError, decode_state, encode_state
+from engine.journal import Journal
+from engine.state import GameState, _state_to_dict
+
+
+def _state() -> dict:
+    gs = GameState(has_garden_bed=True)
+    garden.ensure_garden(gs)
+    flowers.ensure_flower_garden(gs)
+    gs.explore_map = ["."] * 504
+    gs.explore_visited = [[1, 2], [3, 4]]
+    return _state_to_dict(gs)
+
+
+def _saved() -> bytes:
+    return encode_state(_state())
+
+
+@pytest.mark.parametrize("flip", [0x01, 0x80, 0xFF])
+def test_flipped_bytes_decode_or_raise_codec_error(flip):
+    data = _saved()
+    for k in range(len(data)):
+        damaged = bytearray(data)
+        damaged[k] ^= flip
+        try:
+            decode_state(bytes(damaged))
+        except CodecError:
+            pass
+
+
+def test_damaged_lazy_shard_loads_without_crashing(tmp_path):
+    Journal(str(tmp_path)).compact(_state())
+    shard = next(tmp_path.glob("garden.*.bin"))
+    data = shard.read_bytes()
+    # The headers, the plot count and the first states: where damage
+    # shows up as something other than different numbers
+    for k in range(64):
+        damaged = bytearray(data)
+        damaged[k] ^= 0xFF
+        shard.write_bytes(bytes(damaged))
+        journal = Journal(str(tmp_path))
+        assert journal.load(lazy=True) is not None
+        assert journal.field("garden") is None or isinstance(journal.field("garden"), list)
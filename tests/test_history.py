@@ -0,0 +1,14 @@
+# Run history failures are kept for the UI to report
+
+import sqlite3
+
+from engine.history import History
+
+
+def test_record_failure_is_reported_once(tmp_path):
+    target = tmp_path / "history.sqlite3"
+    target.mkdir()   # a directory where the database should be
+    h = History(str(target))
+    h.record({}, {"action_count": 1, "last_seen": 0.0})
+    assert isinstance(h.take_error(), sqlite3.Error)
+    assert h.take_error() is None
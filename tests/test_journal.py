@@ -0,0 +1,45 @@
+# Journal replay stops at damage anywhere in the log, not only a torn tail
+
+import pytest
+
+from engine import garden
+from engine.journal import Journal
+from engine.state import GameState, _state_to_dict
+
+
+def _state(power: int) -> dict:
+    gs = GameState(power=power, has_garden_bed=True)
+    garden.ensure_garden(gs)
+    return _state_to_dict(gs)
+
+
+def _journal(tmp_path) -> list:
+    j = Journal(str(tmp_path))
+    j.compact(_state(0))
+    for power in (1, 2, 3):
+        j.record(_state(power))
+    return (tmp_path / "journal.jsonl").read_bytes().splitlines(keepends=True)
+
+
+@pytest.mark.parametrize("bad", [
+    b'{"n": 2, "set": {"pow\n',            # cut short
+    b"\xff\xfe\n",                          # not text
+    b"42\n",                                # not a record
+    b'{"n": "2", "set": {}}\n',
+    b'{"n": 2, "set": 5}\n',
+    b'{"n": 2, "patch": {"nowhere": {"0": 1}}}\n',
+])
+def test_damaged_line_stops_replay(tmp_path, bad):
+    lines = _journal(tmp_path)
+    lines[1] = bad
+    (tmp_path / "journal.jsonl").write_bytes(b"".join(lines))
+    assert Journal(str(tmp_path)).load()["power"] == 1
+
+
+def test_damaged_record_for_a_lazy_shard(tmp_path):
+    lines = _journal(tmp_path)
+    lines.insert(1, b'{"n": 2, "patch": {"garden": {"x": {"soil": 5}}}}\n')
+    (tmp_path / "journal.jsonl").write_bytes(b"".join(lines))
+    journal = Journal(str(tmp_path))
+    journal.load(lazy=True)
+    assert len(journal.field("garden")) == len(_state(0)["garden"])
@@ -0,0 +1,42 @@
+# The moisture stages against the rules they replaced: a network or mature
+# plot at 4 or more gives one unit to its first living neighbour at 1 or less
+
+import pytest
+
+from engine import garden as gdn, gardennp
+from engine.codes import Plot
+from engine.state import GameState, init_garden
+
+W = 5
+
+ENGINES = ["python", "buffered"] + (["numpy"] if gardennp.AVAILABLE else [])
+
+
+@pytest.fixture
+def engine():
+    before = gdn.ENGINE
+    yield
+    gdn.ENGINE = before
+
+
+@pytest.mark.parametrize("name", ENGINES)
+def test_one_cloudy_tick(engine, name):
+    gdn.set_engine(name)
+    gs = GameState(weather="cloudy")
+    gs.garden = init_garden(W * 3, W)
+    gs.garden_initialized = True
+    plots = {   # (x, y): (state, moisture)
+        (1, 1): (Plot.NETWORK, 5),   # 4 after evaporation: gives
+        (1, 2): (Plot.HYPHA, 3),     # its first neighbour, too wet to take
+        (1, 0): (Plot.HYPHA, 1),     # takes
+        (0, 1): (Plot.HYPHA, 0),     # would take, but one unit is all it gives
+        (3, 1): (Plot.MATURE, 4),    # 3 after evaporation: keeps it
+        (3, 2): (Plot.HYPHA, 0),
+    }
+    for (x, y), (state, moisture) in plots.items():
+        gs.garden.set_state(y * W + x, state)
+        gs.garden.moisture[y * W + x] = moisture
+    gdn.garden_tick(gs)
+    after = {(x, y): gs.garden.moisture[y * W + x] for x, y in plots}
+    assert after == {(1, 1): 3, (1, 2): 2, (1, 0): 1, (0, 1): 0,
+                     (3, 1): 3, (3, 2): 0}
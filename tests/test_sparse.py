@@ -0,0 +1,70 @@
+# SparseGarden standing in for a Garden wherever game code takes one
+
+import random
+
+from engine import garden as gdn, residents, robot
+from engine.codes import Plot
+from engine.residents import RESIDENT_DATA
+from engine.sparsegrid import CHUNK, SparseGarden
+from engine.state import GameState, Resident
+
+
+def _sparse_state() -> GameState:
+    gs = GameState()
+    gs.garden = SparseGarden(64, 64)
+    gs.garden_initialized = True
+    gs.water = 10
+    return gs
+
+
+def test_water_a_sparse_plot():
+    gs = _sparse_state()
+    gs.garden.set_state(70, Plot.HYPHA)
+    gdn.action_water(gs, 70 % 64, 70 // 64)
+    assert gs.garden.moisture[70] > 0
+
+
+def _grown() -> GameState:
+    random.seed(4)
+    gs = _sparse_state()
+    for i in random.sample(range(len(gs.garden)), 60):
+        gs.garden.set_state(i, random.choice((Plot.HYPHA, Plot.NETWORK,
+                                              Plot.COMPETING, Plot.DECOMP)))
+        gs.garden.moisture[i] = random.randint(0, 5)
+    for _ in range(3):
+        gdn.garden_tick(gs)
+    return gs
+
+
+def _in_use(g) -> list:
+    return [g.origin(key) + (j // CHUNK) * g.width + j % CHUNK
+            for key in sorted(g.chunks) for j in range(CHUNK * CHUNK)]
+
+
+def test_by_state_matches_a_scan():
+    g = _grown().garden
+    plots, index = sorted(_in_use(g)), g.by_state()
+    living = [i for i in plots if g.state[i] in gdn.LIVING_STATES]
+    assert index.first((Plot.COMPETING,)) == next(
+        (i for i in plots if g.state[i] == Plot.COMPETING), None)
+    assert index.frontier() == next(
+        (i for i in plots if g.state[i] == Plot.EMPTY and g.near_living[i]), None)
+    assert index.driest(gdn.LIVING_STATES) == min(
+        living, key=lambda i: (g.moisture[i], i), default=None)
+    assert sorted(index.plots(Plot.HYPHA)) == [
+        i for i in plots if g.state[i] == Plot.HYPHA]
+    assert index.pick(gdn.LIVING_STATES) in living
+
+
+def test_frame_and_residents_on_a_sparse_garden():
+    gs = _grown()
+    gs.spores = 10
+    gs.has_tending_frame = True
+    gs.frame_rules = list(robot.TASK_ORDER)
+    gs.residents = [Resident(name) for name in RESIDENT_DATA]
+    for _ in range(30):
+        robot.apply_frame(gs)
+        residents.tick_residents(gs)
+    for pair in (("Fen", "Reed"), ("Reed", "Tuck")):
+        residents._apply_interaction_effect(frozenset(pair), gs)
+    gs.garden.check()
@@ -3,8 +3,8 @@
 
 import curses
 import random
-from engine.state import GameState
-from engine import world
+from engine.state import GameState, mark_dirty
+from engine import autosave, world
 from ui import screen as scr
 from data import text as txt
 
@@ -44,6 +44,13 @@ def _load_grid(flat: list) -> list[list[str]]:
 
 def _save_grid(gs: GameState, grid: list[list[str]]) -> None:
     gs.explore_map = [grid[y][x] for y in range(MAP_H) for x in range(MAP_W)]
+    mark_dirty(gs, "exploration")
+
+
+def _save_progress(gs: GameState, grid: list[list[str]],
+                   visited: set[tuple[int, int]]) -> None:
+    _save_grid(gs, grid)
+    gs.explore_visited = [[x, y] for x, y in visited]
 
 
 def run_explore(stdscr: curses.window, gs: GameState,
@@ -53,6 +60,11 @@ def run_explore(stdscr: curses.window, gs: GameState,
     else:
         grid = _gen_map()
 
+    # The map as the trip began. The pack is only delivered on the way
+    # home, so until then checkpoints save this, leaving loot picked up on
+    # the trip on the map to be found again if the game stops mid-trip.
+    departed = [row[:] for row in grid]
+
     visited: set[tuple[int, int]] = {(v[0], v[1]) for v in gs.explore_visited}
     visited.add((0, 0))
 
@@ -100,6 +112,7 @@ def run_explore(stdscr: curses.window, gs: GameState,
                 px, py = nx, ny
                 visited.add((px, py))
                 msg, hp = _handle_cell(grid, px, py, hp, pack)
+                autosave.checkpoint(gs, lambda: _save_progress(gs, departed, visited))
 
         if hp <= 0:
             running = False
@@ -115,9 +128,9 @@ def run_explore(stdscr: curses.window, gs: GameState,
             curses.napms(3000)
             result_msg = None
 
-    # Persist map state and visited knowledge regardless of exit path
-    _save_grid(gs, grid)
-    gs.explore_visited = [[x, y] for x, y in visited]
+    # The trip is settled: persist map state and visited knowledge
+    # regardless of exit path
+    _save_progress(gs, grid, visited)
 
     return result_msg
 
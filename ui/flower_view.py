@@ -3,8 +3,10 @@
 
 import curses
 from engine.state import GameState
+from engine import autosave
 from engine.flowers import (
     FLOWERS, FLOWER_SLOTS, SLOT_NEIGHBORS,
+    EMPTY, BUDDING, FLOWERING, WILTING,
     ensure_flower_garden, action_plant_flower, flower_tick,
 )
 from ui import screen as scr
@@ -74,7 +76,7 @@ def run_flower_garden(stdscr: curses.window, gs: GameState) -> None:
 
         elif key in ("p", "P"):
             slot = gs.flowers[cidx]
-            if slot["state"] == "E":
+            if slot["state"] == EMPTY:
                 stdscr.nodelay(False)
                 variety = _pick_flower(stdscr)
                 stdscr.nodelay(True)
@@ -90,6 +92,9 @@ def run_flower_garden(stdscr: curses.window, gs: GameState) -> None:
             running = False
             stdscr.nodelay(False)
             _flash_msg(stdscr, txt.FLOWER_LEAVE)
+            continue
+
+        autosave.checkpoint(gs)
 
     stdscr.nodelay(False)
 
@@ -151,7 +156,7 @@ def _draw_flower_garden(stdscr: curses.window, gs: GameState,
 
         sway = _sway_offset(frame, i, gs.weather)
 
-        if state == "E":
+        if state == EMPTY:
             if is_cursor:
                 scr.addstr(stdscr, sr, sc - 1, "[", scr.C_NORMAL, bold=True)
                 scr.addstr(stdscr, sr, sc,     ".", scr.C_DIM)
@@ -161,15 +166,15 @@ def _draw_flower_garden(stdscr: curses.window, gs: GameState,
             continue
 
         # Resolve bloom appearance per state
-        if state == "B":
+        if state == BUDDING:
             bloom_sym  = "."
             bloom_pair = _bud_pair(i, frame, spec.get("color", scr.C_GREEN))
             bloom_bold = False
-        elif state == "F":
+        elif state == FLOWERING:
             bloom_sym  = spec.get("bloom_sym", "*")
             bloom_pair = spec.get("color", scr.C_BRIGHT_YELLOW)
             bloom_bold = True
-        elif state == "W":
+        elif state == WILTING:
             sway       = -1 if i % 2 == 0 else 1   # fixed droop direction per slot
             bloom_sym  = "x" if (frame + i * 3) % 12 < 8 else "."
             bloom_pair = scr.C_DIM
@@ -211,19 +216,19 @@ def _draw_flower_garden(stdscr: curses.window, gs: GameState,
 
     info_row = CENTER_ROW + 3
 
-    state_labels = {
-        "E": "empty",
-        "B": f"budding  {int(slot['age'])}%",
-        "F": f"flowering  {slot['age']} ticks",
-        "W": f"wilting  {int(slot['age'])}%",
-    }
-    state_str = state_labels.get(state, state)
+    state_labels = (                        # indexed by state code
+        "empty",
+        f"budding  {int(slot['age'])}%",
+        f"flowering  {slot['age']} ticks",
+        f"wilting  {int(slot['age'])}%",
+    )
+    state_str = state_labels[state]
 
     if variety != "none":
         pair = spec.get("color", scr.C_NORMAL)
         scr.addstr(stdscr, info_row, 2,
                    f"{spec.get('label', variety)}  —  {state_str}",
-                   pair, bold=(state == "F"))
+                   pair, bold=(state == FLOWERING))
         scr.addstr(stdscr, info_row + 1, 2, spec.get("desc", ""), scr.C_DIM)
     else:
         scr.addstr(stdscr, info_row, 2, state_str, scr.C_DIM)
@@ -235,7 +240,7 @@ def _draw_flower_garden(stdscr: curses.window, gs: GameState,
 
     # --- Hints ---
     hints = ["arrows:move"]
-    if slot["state"] == "E":
+    if slot["state"] == EMPTY:
         hints.append("p:plant")
     hints.append("q:leave")
     scr.addstr(stdscr, msg_row + 2, 2, "  ".join(hints), scr.C_DIM)
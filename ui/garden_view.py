@@ -2,27 +2,46 @@
 # Curses rendering for the mycorrhizal network garden grid.
 
 import curses
+from collections import deque
 from engine.state import GameState, GARDEN_W, GARDEN_H, GARDEN_SIZE, plot_idx
 from engine.garden import (
-    garden_tick, action_inoculate, action_water,
+    GardenTick, action_inoculate, action_water,
     action_clear, action_enrich, action_add_compost, ensure_garden,
-    action_feed, action_extend, action_suppress,
-    EMPTY, HYPHA, NETWORK, MATURE, FRUITING, DECOMP, COMPETING,
+    action_feed, action_extend, action_suppress, network_summary,
+    batch_action, region_flood, region_rect,
+    EMPTY, COMPETING, IS_ACTIVE, IS_WATERABLE,
 )
+from engine.fork import fork, restore, preview
+from engine import autosave
 from ui import screen as scr
 from data import text as txt
 
-# Plot symbols by state
-PLOT_SYMBOLS = {
-    "E": ".",
-    "H": "o",
-    "N": "+",
-    "M": "#",
-    "F": "*",
-    "X": "%",
-    "W": "w",
+# Plot symbols, indexed by state code (E H N M F X W)
+PLOT_SYMBOLS = (".", "o", "+", "#", "*", "%", "w")
+
+# States drawn bold
+_BOLD = (False, False, False, True, True, False, False)
+
+# Garden actions that can be taken back with u
+UNDO_DEPTH = 20
+_UNDOABLE = ("i", "I", "w", "W", "c", "C", "k", "K", "m", "M", "+", "=")
+
+# Keys for plot actions, which tend the selection when there is one
+_PLOT_KEYS = ("i", "I", "w", "W", "c", "C", "k", "K", "m", "M")
+
+# Plot actions by name, for the cursor plot alone (see _tend)
+_ACTIONS = {
+    "inoculate": action_inoculate, "water": action_water,
+    "clear": action_clear, "enrich": action_enrich, "feed": action_feed,
+    "extend": action_extend, "suppress": action_suppress,
 }
 
+# Seconds of garden tick worked through per frame while one is under way
+TICK_BUDGET = 0.03
+
+# Keys handled while a tick is under way; any other waits for it to finish
+_WHILE_SETTLING = ("", "UP", "DOWN", "LEFT", "RIGHT", "v", "V")
+
 
 def run_garden(stdscr: curses.window, gs: GameState) -> None:
     ensure_garden(gs)
@@ -30,15 +49,43 @@ def run_garden(stdscr: curses.window, gs: GameState) -> None:
     cx, cy = 0, 0
     msg = txt.GARDEN_ENTER
     running = True
+    undo: deque = deque(maxlen=UNDO_DEPTH)
+
+    # Selection: a rectangle from anchor to the cursor (v), or the plots
+    # alike joined to the cursor (f). Plot actions then tend all of it.
+    anchor = None
+    flood: list = []
+
+    # The tick after a plot action, worked through a slice per frame so a
+    # big garden does not hold up the keys (see engine.garden.GardenTick)
+    pending = None
 
-    stdscr.nodelay(False)
     stdscr.keypad(True)
 
     while running:
-        _draw_garden(stdscr, gs, cx, cy, msg)
+        if pending and pending.run(TICK_BUDGET):
+            pending = None
+            autosave.checkpoint(gs)
+
+        if anchor:
+            selection = region_rect(gs, *anchor, cx, cy)
+        else:
+            selection = flood
+        _draw_garden(stdscr, gs, cx, cy, msg, can_undo=bool(undo),
+                     selected=set(selection), settling=bool(pending))
         msg = ""
 
+        # Poll while a tick is under way, otherwise wait for a key
+        stdscr.nodelay(bool(pending))
         key = scr.get_key(stdscr)
+        if pending and key not in _WHILE_SETTLING:
+            pending.finish()
+            pending = None
+            autosave.checkpoint(gs)
+        if not key:
+            continue
+        if key in _UNDOABLE:
+            undo.append(fork(gs))
 
         # Movement — drain held keys
         if key in ("UP", "DOWN", "LEFT", "RIGHT"):
@@ -49,44 +96,83 @@ def run_garden(stdscr: curses.window, gs: GameState) -> None:
             elif key == "RIGHT": cx = min(GARDEN_W - 1, cx + 1)
             continue
 
+        elif key in ("v", "V"):
+            if anchor or flood:
+                anchor, flood = None, []
+            else:
+                anchor = (cx, cy)
+            continue
+
+        elif key in ("f", "F"):
+            anchor, flood = None, region_flood(gs, cx, cy)
+            continue
+
+        elif key == "ESC" and (anchor or flood):
+            anchor, flood = None, []
+            continue
+
         elif key in ("i", "I"):
-            msg = action_inoculate(gs, cx, cy)
-            garden_tick(gs)
+            msg, pending = _tend(gs, "inoculate", cx, cy, selection)
 
         elif key in ("w", "W"):
-            msg = action_water(gs, cx, cy)
-            garden_tick(gs)
+            msg, pending = _tend(gs, "water", cx, cy, selection)
 
         elif key in ("c", "C"):
-            msg = action_clear(gs, cx, cy)
-            garden_tick(gs)
+            msg, pending = _tend(gs, "clear", cx, cy, selection)
 
         elif key in ("k", "K"):
-            msg = action_enrich(gs, cx, cy)
-            garden_tick(gs)
+            msg, pending = _tend(gs, "enrich", cx, cy, selection)
 
         elif key in ("m", "M"):
+            # What m does follows the cursor plot, across a selection too
             state = gs.garden[plot_idx(cx, cy)]["state"]
-            if state in (NETWORK, MATURE, FRUITING):
-                msg = action_feed(gs, cx, cy)
-                garden_tick(gs)
+            if IS_ACTIVE[state]:
+                msg, pending = _tend(gs, "feed", cx, cy, selection)
             elif state == EMPTY:
-                msg = action_extend(gs, cx, cy)
-                garden_tick(gs)
+                msg, pending = _tend(gs, "extend", cx, cy, selection)
             elif state == COMPETING:
-                msg = action_suppress(gs, cx, cy)
-                garden_tick(gs)
+                msg, pending = _tend(gs, "suppress", cx, cy, selection)
 
         elif key in ("+", "="):
             msg = action_add_compost(gs)
 
+        elif key in ("u", "U"):
+            if undo:
+                restore(gs, undo.pop())
+                msg = txt.GARDEN_UNDO_OK
+            else:
+                msg = txt.GARDEN_UNDO_NONE
+
+        elif key in ("p", "P"):
+            msg = txt.GARDEN_PREVIEW.format(**network_summary(preview(gs)))
+
         elif key in ("q", "Q", "ESC"):
             running = False
             _flash_msg(stdscr, txt.GARDEN_LEAVE)
+            continue
+
+        if key in _PLOT_KEYS:
+            anchor, flood = None, []   # a selection is used up by one action
+
+        if not pending:
+            autosave.checkpoint(gs)
+
+
+def _tend(gs: GameState, action: str, cx: int, cy: int,
+          selection: list) -> tuple:
+    """A plot action on the selection if there is one, else on the cursor
+    plot, then one garden tick either way. Returns the action's message and
+    the tick, begun but left for run_garden to work through."""
+    if selection:
+        msg = batch_action(gs, action, selection)
+    else:
+        msg = _ACTIONS[action](gs, cx, cy)
+    return msg, GardenTick(gs)
 
 
 def _draw_garden(stdscr: curses.window, gs: GameState,
-                 cx: int, cy: int, msg: str) -> None:
+                 cx: int, cy: int, msg: str, can_undo: bool = False,
+                 selected: set = frozenset(), settling: bool = False) -> None:
     stdscr.erase()
     height, width = stdscr.getmaxyx()
 
@@ -107,14 +193,15 @@ def _draw_garden(stdscr: curses.window, gs: GameState,
     row += 1
 
     # Grid rows
+    states = gs.garden.state
     for y in range(GARDEN_H):
         row_label = chr(ord("A") + y)
         scr.addstr(stdscr, row, 2, row_label, scr.C_DIM)
         scr.addstr(stdscr, row, 4, "|", scr.C_DIM)
 
         for x in range(GARDEN_W):
-            p = gs.garden[plot_idx(x, y)]
-            state = p["state"]
+            i = plot_idx(x, y)
+            state = states[i]
             is_cursor = (x == cx and y == cy)
 
             col = col_start + x * 2
@@ -122,10 +209,9 @@ def _draw_garden(stdscr: curses.window, gs: GameState,
             if is_cursor:
                 scr.addstr(stdscr, row, col - 1, "[", scr.C_NORMAL, bold=True)
 
-            sym  = PLOT_SYMBOLS.get(state, ".")
-            pair = scr.PLOT_COLORS.get(state, scr.C_NORMAL)
-            bold = state in ("M", "F")
-            scr.addstr(stdscr, row, col, sym, pair, bold=bold)
+            scr.addstr(stdscr, row, col, PLOT_SYMBOLS[state],
+                       scr.PLOT_COLORS[state], bold=_BOLD[state],
+                       reverse=i in selected)
 
             if is_cursor:
                 scr.addstr(stdscr, row, col + 1, "]", scr.C_NORMAL, bold=True)
@@ -134,29 +220,32 @@ def _draw_garden(stdscr: curses.window, gs: GameState,
 
         # Right panel: show selected plot info
         if y == cy:
-            p = gs.garden[plot_idx(cx, cy)]
-            state_name = txt.NETWORK_STATE_NAMES.get(p["state"], p["state"])
-            soil_pair  = scr.SOIL_COLORS[min(5, max(1, p["soil"]))]
-            moist_pair = scr.MOIST_COLORS[min(5, max(0, p["moisture"]))]
-
-            # Count active neighbors
-            conn = 0
-            for dx, dy in ((0, 1), (0, -1), (1, 0), (-1, 0)):
-                nx, ny = cx + dx, cy + dy
-                if 0 <= nx < GARDEN_W and 0 <= ny < GARDEN_H:
-                    ns = gs.garden[plot_idx(nx, ny)]["state"]
-                    if ns in (HYPHA, NETWORK, MATURE, FRUITING):
-                        conn += 1
+            p = gs.garden.record(plot_idx(cx, cy))
+            state_name = txt.NETWORK_STATE_NAMES[p.state]
+            soil_pair  = scr.SOIL_COLORS[min(5, max(1, p.soil))]
+            moist_pair = scr.MOIST_COLORS[min(5, max(0, p.moisture))]
+
+            # Active neighbours
+            conn = gs.garden.near_living[plot_idx(cx, cy)]
 
             info_col = col_start + GARDEN_W * 2 + 3
             scr.addstr(stdscr, row, info_col,
                        f"{state_name:<18}", scr.C_DIM)
             scr.addstr(stdscr, row, info_col + 19, "soil:", scr.C_DIM)
-            scr.addstr(stdscr, row, info_col + 24, str(p["soil"]), soil_pair)
+            scr.addstr(stdscr, row, info_col + 24, str(p.soil), soil_pair)
             scr.addstr(stdscr, row, info_col + 26, "moist:", scr.C_DIM)
-            scr.addstr(stdscr, row, info_col + 32, str(p["moisture"]), moist_pair)
+            scr.addstr(stdscr, row, info_col + 32, str(p.moisture), moist_pair)
             scr.addstr(stdscr, row, info_col + 34, f"conn:{conn}", scr.C_DIM)
 
+            # The network this plot is part of, on the line below
+            net = gs.garden.network().component(plot_idx(cx, cy))
+            if net:
+                scr.addstr(stdscr, row + 1, info_col,
+                           txt.GARDEN_NETWORK_INFO.format(size=net.size,
+                                                          mature=net.mature,
+                                                          fruiting=net.fruiting),
+                           scr.C_DIM)
+
         row += 1
 
     # Bottom border
@@ -167,20 +256,30 @@ def _draw_garden(stdscr: curses.window, gs: GameState,
     if msg:
         scr.addstr(stdscr, row, 2, msg, scr.C_NORMAL)
         row += 1
+    elif settling:
+        scr.addstr(stdscr, row, 2, txt.GARDEN_SETTLING, scr.C_DIM)
+        row += 1
+    elif selected:
+        scr.addstr(stdscr, row, 2, txt.GARDEN_SELECT_INFO.format(n=len(selected)),
+                   scr.C_DIM)
+        row += 1
     row += 1
 
     # Context hints
-    p = gs.garden[plot_idx(cx, cy)]
-    state = p["state"]
+    state = states[plot_idx(cx, cy)]
     hints = ["arrows:move"]
-    if state == "E":                                   hints.append("i:inoculate")
-    if state in ("H", "N", "M", "F"):                 hints.append("w:water")
-    if state == "W":                                   hints.append("c:clear")
-    if gs.has_compost_pile and state == "E":           hints.append("k:enrich")
+    if state == EMPTY:                                 hints.append("i:inoculate")
+    if IS_WATERABLE[state]:                            hints.append("w:water")
+    if state == COMPETING:                             hints.append("c:clear")
+    if gs.has_compost_pile and state == EMPTY:         hints.append("k:enrich")
     if gs.has_compost_pile:                            hints.append("+:compost")
-    if state in ("N", "M", "F"):                       hints.append("m:feed")
-    if state == "E":                                   hints.append("m:extend")
-    if state == "W":                                   hints.append("m:suppress")
+    if IS_ACTIVE[state]:                               hints.append("m:feed")
+    if state == EMPTY:                                 hints.append("m:extend")
+    if state == COMPETING:                             hints.append("m:suppress")
+    if selected:                                       hints.append("v:drop selection")
+    else:                                              hints.append("v/f:select")
+    if can_undo:                                       hints.append("u:undo")
+    hints.append("p:look ahead")
     hints.append("q:leave")
 
     scr.addstr(stdscr, row, 2, "  ".join(hints), scr.C_DIM)
@@ -19,16 +19,16 @@ C_BRIGHT_YELLOW = 11
 C_BRIGHT_CYAN   = 12
 C_BRIGHT_WHITE  = 13
 
-# Plot state → color pair
-PLOT_COLORS = {
-    "E": C_DIM,
-    "H": C_DIM,
-    "N": C_GREEN,
-    "M": C_BRIGHT_GREEN,
-    "F": C_BRIGHT_YELLOW,
-    "X": C_DIM,
-    "W": C_RED,
-}
+# Plot color pairs, indexed by state code (E H N M F X W)
+PLOT_COLORS = (
+    C_DIM,              # E empty
+    C_DIM,              # H hypha
+    C_GREEN,            # N network
+    C_BRIGHT_GREEN,     # M mature
+    C_BRIGHT_YELLOW,    # F fruiting
+    C_DIM,              # X decomposing
+    C_RED,              # W competing
+)
 
 # Soil quality → color pair
 SOIL_COLORS = [None, C_RED, C_RED, C_YELLOW, C_GREEN, C_BRIGHT_GREEN]
@@ -64,18 +64,21 @@ def init_colors() -> None:
     curses.init_pair(C_BRIGHT_WHITE, curses.COLOR_WHITE,   -1)
 
 
-def attr(pair_id: int, bold: bool = False, dim: bool = False) -> int:
+def attr(pair_id: int, bold: bool = False, dim: bool = False,
+         reverse: bool = False) -> int:
     a = curses.color_pair(pair_id)
     if bold: a |= curses.A_BOLD
     if dim or pair_id == C_DIM: a |= curses.A_DIM
+    if reverse: a |= curses.A_REVERSE
     return a
 
 
 def addstr(win, y: int, x: int, text: str,
-           pair: int = C_NORMAL, bold: bool = False, dim: bool = False) -> None:
+           pair: int = C_NORMAL, bold: bool = False, dim: bool = False,
+           reverse: bool = False) -> None:
     """Safe addstr — silently ignores out-of-bounds writes."""
     try:
-        win.addstr(y, x, text, attr(pair, bold=bold, dim=dim))
+        win.addstr(y, x, text, attr(pair, bold=bold, dim=dim, reverse=reverse))
     except curses.error:
         pass
 
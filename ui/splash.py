@@ -146,16 +146,16 @@ def _build_scene(gs: GameState) -> list:
 
     # Flower garden
     if gs.has_flower_garden and gs.flower_garden_init:
-        from engine.flowers import FLOWERS
-        blooming = [s for s in gs.flowers if s["state"] == "F"]
+        from engine.flowers import FLOWERS, blooming_flowers
+        blooming = blooming_flowers(gs)
 
         if not blooming:
             flower_seg = [("  ", scr.C_NORMAL, False),
                           (". . .", scr.C_DIM, False)]
         else:
             flower_seg = [("  ", scr.C_NORMAL, False)]
-            for slot in blooming[:5]:
-                spec = FLOWERS.get(slot["flower"], {})
+            for flower in blooming[:5]:
+                spec = FLOWERS.get(flower, {})
                 flower_seg.append((spec.get("bloom_sym", "*"),
                                    spec.get("color", scr.C_BRIGHT_YELLOW), True))
                 flower_seg.append((" ", scr.C_NORMAL, False))
@@ -204,7 +204,7 @@ def _build_status(gs: GameState, days: int, decay_msg: str | None) -> list:
     lines[3] = []
     lines[4] = [("garden", scr.C_NORMAL, True)]
 
-    if gs.garden_initialized and gs.garden:
+    if gs.garden_initialized:
         summ = network_summary(gs)
         connected = summ["connected"]
         mature    = summ["mature"]
@@ -214,7 +214,9 @@ def _build_status(gs: GameState, days: int, decay_msg: str | None) -> list:
         if connected + hypha > 0:
             lines[5] = [("network: ", scr.C_NORMAL, False),
                         (str(connected), scr.C_BRIGHT_GREEN, False),
-                        (" nodes", scr.C_DIM, False)]
+                        (" nodes", scr.C_DIM, False),
+                        ("  largest ", scr.C_DIM, False),
+                        (str(summ["largest"]), scr.C_NORMAL, False)]
             lines[6] = [("mature ", scr.C_BRIGHT_GREEN, False),
                         (str(mature), scr.C_NORMAL, False),
                         ("  fruiting ", scr.C_BRIGHT_YELLOW, False),